@@ -1,19 +1,27 @@
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
 import json
 import os
 import re
-import requests
 import time
 from datetime import datetime
 from urllib.parse import urlparse, quote
 import sys
 
+from deps import sync_playwright, BeautifulSoup, http_get
+from fact_extractor import extract_facts, ACRES_FACT_LABELS
+from snapshots import snapshots_enabled, save_snapshot, existing_images
+from page_loading import block_resources, wait_for_any, scroll_to_bottom
+from freshness import listing_fingerprint, listing_changed, mark_checked, is_due
+from metrics import timer, timed
+from serialization import dump, load
+
 # ------------------ Helper Class ------------------ #
 class PropertyDataExtractor:
-    def __init__(self, html_content, property_id):
+    @timed("extract.parse")
+    def __init__(self, html_content, property_id, download_images=True):
         self.soup = BeautifulSoup(html_content, "html.parser")
         self.property_id = property_id
+        # Replay from snapshots reuses the images already on disk instead of downloading
+        self.download_images = download_images
         self.images_dir = f"scraped_data/images/{property_id}"
         os.makedirs(self.images_dir, exist_ok=True)
         
@@ -35,9 +43,11 @@ class PropertyDataExtractor:
             "dynamic_facts": {}
         }
         
-        # Full text for regex fallback
+        # Full text for regex fallback, scanned once for all text facts
         self.full_text = self.soup.get_text(" ", strip=True)
+        self.text_facts = extract_facts(self.full_text, ACRES_FACT_LABELS + ["Price"])
 
+    @timed("extract.json_ld")
     def extract_json_ld(self):
         """Extracts JSON-LD structured data."""
         scripts = self.soup.find_all("script", type="application/ld+json")
@@ -69,6 +79,7 @@ class PropertyDataExtractor:
             except:
                 pass
 
+    @timed("extract.meta_tags")
     def extract_meta_tags(self):
         """Extracts meta tags for fallback data."""
         metas = self.soup.find_all("meta")
@@ -89,38 +100,21 @@ class PropertyDataExtractor:
                 if name == "og:url" and not self.data["url"]:
                     self.data["url"] = content
 
+    @timed("extract.facts")
     def extract_dynamic_facts(self):
         """Robust fact extraction using multiple strategies."""
         
-        # Strategy 1: Specific Fact Containers (99acres specific)
-        # Look for elements like <div class="factLabel">...</div> <div class="factValue">...</div>
-        # Or generic key-value pairs in tables/grids
-        
-        # Common patterns for facts in property sites
-        fact_patterns = [
-            {"label": "Super Area", "regex": r"Super Area[:\s]*([\d,]+\s*sq\.?ft\.?)", "type": "area"},
-            {"label": "Carpet Area", "regex": r"Carpet Area[:\s]*([\d,]+\s*sq\.?ft\.?)", "type": "area"},
-            {"label": "Floor", "regex": r"Floor[:\s]*([0-9A-Za-z\s]+)(?:out of|$)", "type": "fact"},
-            {"label": "Transaction Type", "regex": r"Transaction Type[:\s]*([A-Za-z\s]+)", "type": "fact"},
-            {"label": "Status", "regex": r"Status[:\s]*([A-Za-z\s]+)", "type": "fact"},
-            {"label": "Facing", "regex": r"Facing[:\s]*([A-Za-z\s]+)", "type": "fact"},
-            {"label": "Society", "regex": r"(?:in|at)\s+([A-Za-z0-9\s]+(?:Apartments|Heights|Enclave|Residency|Tower|City|Park|Villas))", "type": "society"},
-            {"label": "Bathrooms", "regex": r"(\d+)\s*Bath(?:room)?s?", "type": "fact"},
-            {"label": "Balcony", "regex": r"(\d+)\s*Balcon(?:y|ies)", "type": "fact"},
-        ]
-
-        # 1. Regex over full text (Fallback & Powerful)
-        for pattern in fact_patterns:
-            match = re.search(pattern["regex"], self.full_text, re.IGNORECASE)
-            if match:
-                val = match.group(1).strip()
-                self.data["dynamic_facts"][pattern["label"]] = val
-                
-                # Map to core fields
-                if pattern["type"] == "area" and not self.data.get("area"):
-                    self.data["area"] = val
-                if pattern["type"] == "society":
-                    self.data["dynamic_facts"]["Society"] = val
+        # Strategy 1: Facts found in the full page text (Fallback & Powerful)
+        # Keyword-anchored scan done once in __init__, see fact_extractor.py
+        for label in ACRES_FACT_LABELS:
+            val = self.text_facts.get(label)
+            if not val:
+                continue
+            self.data["dynamic_facts"][label] = val
+
+            # Map to core fields
+            if label in ("Super Area", "Carpet Area") and not self.data.get("area"):
+                self.data["area"] = val
 
         # 2. Parse specific Fact Sections in HTML
         # Look for lists or grids
@@ -135,6 +129,7 @@ class PropertyDataExtractor:
                     if len(k) < 30 and len(v) < 50:
                         self.data["dynamic_facts"][k] = v
 
+    @timed("extract.name")
     def extract_property_name(self):
         # Expanded selectors for property name
         selectors = [
@@ -156,9 +151,10 @@ class PropertyDataExtractor:
         if meta_title:
             self.data["property_name"] = meta_title.get("content")
 
+    @timed("image.download")
     def download_image(self, url):
         try:
-            response = requests.get(url, timeout=10)
+            response = http_get(url, timeout=10)
             if response.status_code == 200:
                 parsed = urlparse(url)
                 filename = os.path.basename(parsed.path)
@@ -173,6 +169,7 @@ class PropertyDataExtractor:
             print(f"Error downloading {url}: {e}")
         return None
 
+    @timed("extract.images")
     def extract_images(self):
         image_urls = []
         # Strategy 1: Look for img tags with specific domains
@@ -183,19 +180,29 @@ class PropertyDataExtractor:
                     image_urls.append(src)
         
         self.data["image_urls"] = image_urls
-        
+
+        if not self.download_images:
+            self.data["local_images"] = existing_images(self.property_id)
+            return
+        self.fetch_images()
+
+    def fetch_images(self):
         # Download images (Limit to 5 to save time/bandwidth)
+        image_urls = self.data["image_urls"]
+        self.data["local_images"] = []
         print(f"   Downloading {min(len(image_urls), 5)} images...")
         for img_url in image_urls[:5]:
             local_path = self.download_image(img_url)
             if local_path:
                 self.data["local_images"].append(local_path)
 
+    @timed("extract.youtube")
     def extract_youtube_video(self):
         iframe = self.soup.find("iframe", src=re.compile(r"(youtube\.com|youtu\.be)"))
         if iframe:
             self.data["youtube_video"] = iframe.get("src")
 
+    @timed("extract.features")
     def extract_features(self):
         # Look for features in lists
         blocks = self.soup.find_all(["div", "ul"], class_=re.compile(r"(feature|amenity|highlight)", re.I))
@@ -210,12 +217,14 @@ class PropertyDataExtractor:
                         if text not in self.data["features"]["property"]:
                             self.data["features"]["property"].append(text)
 
+    @timed("extract.nearby")
     def extract_nearby_places(self):
         for tag in self.soup.find_all("span", class_="NearByLocation__infoText"):
             text = tag.get_text(strip=True)
             if text:
                 self.data["nearby_places"].append(text)
 
+    @timed("extract.reviews")
     def extract_reviews(self):
         for block in self.soup.find_all("div", class_="cb___Wrap"):
             text = block.get_text(strip=True)
@@ -223,6 +232,7 @@ class PropertyDataExtractor:
             rating = rating_tag.get_text(strip=True) if rating_tag else None
             self.data["reviews"].append({"text": text, "rating": rating})
 
+    @timed("extract.bhk_price")
     def extract_bhk_and_price(self, url):
         """Extract BHK and price from URL and page content."""
         # Extract BHK from URL (e.g., "3-bhk-bedroom")
@@ -230,11 +240,9 @@ class PropertyDataExtractor:
         if bhk_match:
             self.data["bhk"] = int(bhk_match.group(1))
         
-        # Try to find price in page content
-        # Look for currency symbol
-        price_match = re.search(r"₹\s*([\d,]+\s*(?:Cr|Lac|Lakh|Crore)?)", self.full_text, re.IGNORECASE)
-        if price_match:
-             self.data["price"] = price_match.group(1)
+        # Try to find price in page content (first amount after a currency symbol)
+        if self.text_facts.get("Price"):
+            self.data["price"] = self.text_facts["Price"]
 
     def extract_all(self, url):
         self.data["url"] = url
@@ -262,8 +270,7 @@ def update_property_index(property_id, url):
     os.makedirs("scraped_data", exist_ok=True)
 
     if os.path.exists(index_file):
-        with open(index_file, "r", encoding="utf-8") as f:
-            index_data = json.load(f)
+        index_data = load(index_file)
     else:
         index_data = []
 
@@ -276,12 +283,22 @@ def update_property_index(property_id, url):
         "saved_at": datetime.now().isoformat()
     })
 
-    with open(index_file, "w", encoding="utf-8") as f:
-        json.dump(index_data, f, ensure_ascii=False, indent=4)
+    dump(index_data, index_file)
 
     print(f"📌 Saved {property_id} to index")
 
 
+@timed("json.write")
+def save_property_data(data, url):
+    filename = f"scraped_data/{data['property_id']}.json"
+
+    dump(data, filename)
+
+    update_property_index(data["property_id"], url)
+    print(f"💾 Saved: {filename}\n")
+    return filename
+
+
 # ------------------ Scrape Property Details ------------------ #
 def scrape_property(url: str) -> dict:
     with sync_playwright() as p:
@@ -289,33 +306,55 @@ def scrape_property(url: str) -> dict:
         context = browser.new_context(
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         )
+        block_resources(context)
         page = context.new_page()
     
         print(f"🕐 Opening property: {url}")
-        try:
-            page.goto(url, wait_until="domcontentloaded", timeout=45000)
-        except Exception as e:
-            print(f"⚠ Error loading page: {e}")
-            return None
+        with timer("page.load", url=url):
+            try:
+                page.goto(url, wait_until="domcontentloaded", timeout=45000)
+            except Exception as e:
+                print(f"⚠ Error loading page: {e}")
+                return None
 
-        try:
-            # Handle common popups
-            page.click("text=OK", timeout=2000)
-            page.click("div[data-label='FRAUD_ALERT_UNDERSTOOD']", timeout=2000)
-        except:
-            pass
+            try:
+                # Handle common popups
+                page.click("text=OK", timeout=2000)
+                page.click("div[data-label='FRAUD_ALERT_UNDERSTOOD']", timeout=2000)
+            except:
+                pass
 
-        # Scroll to trigger lazy loading
-        for _ in range(5):
-             page.mouse.wheel(0, 1000)
-             page.wait_for_timeout(1000)
+            # Wait for the property header, then scroll until lazy sections stop loading
+            wait_for_any(page, ["h1", "script[type='application/ld+json']"], timeout=10000)
+            scroll_to_bottom(page)
 
         html = page.content()
         browser.close()
 
     prop_id = PropertyDataExtractor.extract_property_id(url)
-    extractor = PropertyDataExtractor(html, prop_id)
-    return extractor.extract_all(url)
+    if snapshots_enabled():
+        save_snapshot("99Acers", prop_id, url, html)
+    extractor = PropertyDataExtractor(html, prop_id, download_images=False)
+    data = extractor.extract_all(url)
+
+    # Only spend bandwidth on images when the listing changed since the last check
+    data["fingerprint"] = listing_fingerprint(data)
+    if listing_changed("99Acers", prop_id, data["fingerprint"]) or not data["local_images"]:
+        extractor.fetch_images()
+    return data
+
+
+def save_if_changed(data, url):
+    """Write the property JSON only if its fingerprint changed (or the file is gone)."""
+    prop_id = data["property_id"]
+    on_disk = [p for p in (f"scraped_data/{prop_id}.json", f"scraped_data/properties/{prop_id}.json")
+               if os.path.exists(p)]
+    if mark_checked("99Acers", prop_id, url, data["fingerprint"]) or not on_disk:
+        save_property_data(data, url)
+    else:
+        # Touch it so importers that look for recently scraped files still pick it up
+        os.utime(on_disk[0])
+        print(f"♻ Unchanged: {on_disk[0]}\n")
 
 
 # ------------------ Extract All Listing Links ------------------ #
@@ -323,21 +362,22 @@ def get_links_from_listing(listing_url):
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=False)
         page = browser.new_page()
-        page.goto(listing_url, wait_until="domcontentloaded", timeout=30000)
+        block_resources(page, block_images=True)
+        with timer("page.load_listing", url=listing_url):
+            page.goto(listing_url, wait_until="domcontentloaded", timeout=30000)
 
-        # Click popup
-        try:
-            page.locator("div[data-label='FRAUD_ALERT_UNDERSTOOD']").click(timeout=5000)
-            print("✔ Fraud alert popup closed")
-        except:
-            print("ℹ No fraud popup found")
+            # Click popup
+            try:
+                page.locator("div[data-label='FRAUD_ALERT_UNDERSTOOD']").click(timeout=5000)
+                print("✔ Fraud alert popup closed")
+            except:
+                print("ℹ No fraud popup found")
 
-        page.wait_for_timeout(3000)  # allow page to load
-        
-        # Scroll to load more
-        for _ in range(3):
-            page.mouse.wheel(0, 1000)
-            time.sleep(1)
+            # Wait for property cards instead of a fixed delay
+            wait_for_any(page, ["a[href*='spid-']"], timeout=10000)
+            
+            # Scroll to load more
+            scroll_to_bottom(page, max_rounds=3)
 
         # --- Extract proper property card URLs ---
         content = page.content()
@@ -377,6 +417,20 @@ def get_links_from_listing(listing_url):
 
 # ------------------ Main Execution ------------------ #
 if __name__ == "__main__":
+    from profiling import profile_from_cli
+    profile_from_cli()
+
+    os.makedirs("scraped_data", exist_ok=True)
+
+    # Single property: python3 99Acers.py --url <property url>
+    if len(sys.argv) > 2 and sys.argv[1] == "--url":
+        url = sys.argv[2]
+        data = scrape_property(url)
+        if not data:
+            sys.exit(1)
+        save_if_changed(data, url)
+        sys.exit(0)
+
     keyword = "Greater Noida"
     if len(sys.argv) > 1:
         keyword = sys.argv[1]
@@ -387,17 +441,13 @@ if __name__ == "__main__":
 
     links = get_links_from_listing(listing_url)
 
-    os.makedirs("scraped_data", exist_ok=True)
-
     for link in links:
+        # Listings checked recently are skipped until their refresh interval passes
+        if not is_due("99Acers", PropertyDataExtractor.extract_property_id(link)):
+            print(f"⏭ Not due for refresh: {link}")
+            continue
         data = scrape_property(link)
         if data:
-            filename = f"scraped_data/{data['property_id']}.json"
-
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-
-            update_property_index(data["property_id"], link)
-            print(f"💾 Saved: {filename}\n")
+            save_if_changed(data, link)
 
     print("🎉 Done — properties scraped and indexed!")
@@ -1,24 +1,64 @@
-from playwright.sync_api import sync_playwright
 import json
 import time
 import os
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 from urllib.parse import urlparse, quote
 import sys
 import re
 
+from deps import sync_playwright, BeautifulSoup, http_get
+from fact_extractor import extract_facts, MAGICBRICKS_FACT_LABELS
+from snapshots import snapshots_enabled, save_snapshot, existing_images
+from page_loading import block_resources, wait_for_any
+from metrics import timer, timed
+from freshness import listing_fingerprint, mark_checked
+from serialization import dump
+
 START_URL = "https://www.magicbricks.com/property-for-rent/residential-real-estate?bedroom=&proptype=Multistorey-Apartment,Builder-Floor-Apartment,Penthouse,Studio-Apartment,Service-Apartment&cityName=Greater-Noida"
 
 INDEX_FILE = "scraped_data/index.json"
 DATA_DIR = "scraped_data/properties"
 IMAGES_DIR = "scraped_data/images"
 
-os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(IMAGES_DIR, exist_ok=True)
+# Elements that tell us a page has rendered enough to extract from
+PROPERTY_PAGE_SELECTORS = ["h1.mb-pd__title", "#pdPrice2", "span#pdConfig", "span.mb-pd__price"]
+RESULTS_PAGE_SELECTORS = ["div.mb-srp__card", "div.mb-srp__list"]
+# Sections revealed by the "more details" / "View all details" clicks
+MORE_DETAILS_SELECTORS = ["div.mb-ldp__more-dtl__description--content", "#more-details"]
+
+# Every selector build_property_data reads, fetched together in one round trip
+TEXT_SELECTORS = [
+    "span#pdConfig", "#pdPrice2", "#superbuiltupArea_span", "#carpetArea_span",
+    "#furnishingLabel", "#availableForLabel", "div.component__availableFrom",
+    "#postedOnAndByLabel", "span.mb-pd__price", "a.mb-ldp__about-proj__projname",
+    "div.mb-ldp__more-dtl__description--content", "span.mb-pd__loc__name",
+    "span.mb-pd__dtls__address", "h1.mb-pd__title"
+]
+LIST_SELECTORS = [
+    "ul.mb-pd__amenitiesList li", "ul.mb-pd__societyAmenityList li", "ul.mb-pd__nearbyList li"
+]
+
+READ_DOM_JS = """
+({texts, lists}) => {
+    const payload = {texts: {}, lists: {}, images: []};
+    for (const selector of texts) {
+        const el = document.querySelector(selector);
+        payload.texts[selector] = el ? el.innerText.trim() : null;
+    }
+    for (const selector of lists) {
+        payload.lists[selector] = Array.from(document.querySelectorAll(selector), el => el.innerText.trim());
+    }
+    for (const img of document.images) {
+        payload.images.push(img.getAttribute("src") || img.getAttribute("data-src"));
+    }
+    return payload;
+}
+"""
 
 # -------------- Utility ---------------- #
+# Every DOM reader takes a `text_of(target, selector)` / `texts_of(target, selector)`
+# pair so the same extraction runs on a live Playwright page or on a parsed HTML
+# snapshot (see extract_property_from_html).
 def safe(page, selector):
     try:
         # Use a short timeout so we don't wait forever for missing elements
@@ -26,94 +66,140 @@ def safe(page, selector):
     except:
         return None
 
-def extract_reviews(page):
-    reviews = []
+def safe_all(page, selector):
+    texts = []
     try:
-        review_cards = page.locator("div.mb-review__ReviewCard").all()
-        for r in review_cards:
-            text = r.inner_text().strip()
-            rating = r.locator("span.mb-review__Rating").inner_text().replace("★", "").strip()
-            reviews.append({"text": text, "rating": rating})
+        for item in page.locator(selector).all():
+            texts.append(item.inner_text().strip())
     except:
         pass
-    return reviews
+    return texts
 
-def extract_features(page):
-    property_features = []
-    society_features = []
+@timed("extract.read_dom")
+def read_dom(page):
+    """Read all texts, lists and img sources we extract in a single page.evaluate call.
 
+    Returns (text_of, texts_of, image_srcs). Prefetched selectors answer instantly
+    (None / [] when the element is absent) instead of waiting out safe()'s timeout;
+    other selectors, or everything if the evaluate fails, go through the
+    element-by-element readers (safe, safe_all, image_srcs None).
+    """
     try:
-        prop_items = page.locator("ul.mb-pd__amenitiesList li").all()
-        for item in prop_items:
-            property_features.append(item.inner_text().strip())
-    except:
-        pass
+        payload = page.evaluate(READ_DOM_JS, {"texts": TEXT_SELECTORS, "lists": LIST_SELECTORS})
+    except Exception as e:
+        print(f"⚠ Batched DOM read failed, reading elements one by one: {e}")
+        return safe, safe_all, None
+
+    texts, lists = payload["texts"], payload["lists"]
+
+    def text_of(target, selector):
+        if selector in texts:
+            return texts[selector] or None
+        return safe(target, selector)
 
+    def texts_of(target, selector):
+        if selector in lists:
+            return lists[selector]
+        return safe_all(target, selector)
+
+    return text_of, texts_of, payload["images"]
+
+@timed("page.reveal_details")
+def click_if_present(page, selector, reveals):
+    """Click an optional element and wait for what it reveals; skip at once when it's absent."""
     try:
-        soc_items = page.locator("ul.mb-pd__societyAmenityList li").all()
-        for item in soc_items:
-            society_features.append(item.inner_text().strip())
+        if page.locator(selector).count() == 0:
+            return False
+        page.click(selector, timeout=2000)
     except:
-        pass
+        return False
+    wait_for_any(page, reveals, timeout=2000)
+    return True
 
-    return property_features, society_features
+def safe_soup(soup, selector):
+    el = soup.select_one(selector)
+    if not el:
+        return None
+    return el.get_text(" ", strip=True) or None
+
+def safe_all_soup(soup, selector):
+    return [el.get_text(" ", strip=True) for el in soup.select(selector)]
 
-def extract_nearby(page):
-    nearby = []
+def extract_reviews(page):
+    reviews = []
     try:
-        items = page.locator("ul.mb-pd__nearbyList li").all()
-        for item in items:
-            nearby.append(item.inner_text().strip())
+        review_cards = page.locator("div.mb-review__ReviewCard").all()
+        for r in review_cards:
+            text = r.inner_text().strip()
+            rating = r.locator("span.mb-review__Rating").inner_text().replace("★", "").strip()
+            reviews.append({"text": text, "rating": rating})
     except:
         pass
-    return nearby
+    return reviews
+
+def extract_features(page, texts_of=safe_all):
+    property_features = texts_of(page, "ul.mb-pd__amenitiesList li")
+    society_features = texts_of(page, "ul.mb-pd__societyAmenityList li")
+    return property_features, society_features
 
-def extract_basic_details(page):
+def extract_nearby(page, texts_of=safe_all):
+    return texts_of(page, "ul.mb-pd__nearbyList li")
+
+def extract_basic_details(page, text_of=safe):
     details = {
-        "configuration": safe(page, "span#pdConfig"),
-        "rent": safe(page, "#pdPrice2"),
-        "super_builtup_area": safe(page, "#superbuiltupArea_span"),
-        "carpet_area": safe(page, "#carpetArea_span"),
-        "furnishing": safe(page, "#furnishingLabel"),
-        "available_for": safe(page, "#availableForLabel"),
-        "available_from": safe(page, "div.component__availableFrom"),
-        "posted_by": safe(page, "#postedOnAndByLabel")
+        "configuration": text_of(page, "span#pdConfig"),
+        "rent": text_of(page, "#pdPrice2"),
+        "super_builtup_area": text_of(page, "#superbuiltupArea_span"),
+        "carpet_area": text_of(page, "#carpetArea_span"),
+        "furnishing": text_of(page, "#furnishingLabel"),
+        "available_for": text_of(page, "#availableForLabel"),
+        "available_from": text_of(page, "div.component__availableFrom"),
+        "posted_by": text_of(page, "#postedOnAndByLabel")
     }
     
     # Extract price if not found in rent field
     if not details["rent"]:
-        price_elem = safe(page, "span.mb-pd__price")
+        price_elem = text_of(page, "span.mb-pd__price")
         if price_elem:
             details["rent"] = price_elem
     
     return details
 
-def extract_locality_address(page):
+def extract_locality_address(page, text_of=safe):
     """Extract locality and full address from page."""
-    locality = None
-    address = None
-    
     # Try to get locality from breadcrumb or location section
-    try:
-        locality_elem = page.locator("span.mb-pd__loc__name").first
-        if locality_elem:
-            locality = locality_elem.inner_text(timeout=2000).strip()
-    except:
-        pass
+    locality = text_of(page, "span.mb-pd__loc__name")
     
     # Try to get full address
-    try:
-        address_elem = page.locator("span.mb-pd__dtls__address").first
-        if address_elem:
-            address = address_elem.inner_text(timeout=2000).strip()
-    except:
-        pass
+    address = text_of(page, "span.mb-pd__dtls__address")
     
     return locality, address
 
+def filter_image_urls(srcs):
+    """Keep likely property photos from a list of img src values."""
+    image_urls = []
+    for src in srcs:
+        if src and src.startswith("http"):
+            if any(x in src.lower() for x in [".jpg", ".jpeg", ".png", ".webp", "img", "photo"]):
+                if not any(x in src.lower() for x in ["icon", "logo", "svg", "button"]):
+                    image_urls.append(src)
+    return list(set(image_urls))
+
+def extract_property_id(link):
+    # Extract ID from URL parameter 'id'
+    match = re.search(r"id=([0-9a-zA-Z]+)", link)
+    if match:
+        return match.group(1)
+    # Fallback to old method but be careful
+    prop_id = link.split("-")[-1]
+    if "&" in prop_id:
+        prop_id = prop_id.split("&")[0]
+    return prop_id
+
+@timed("image.download")
 def download_image(url, folder):
     try:
-        response = requests.get(url, timeout=10)
+        response = http_get(url, timeout=10)
         if response.status_code == 200:
             # Extract filename from URL or generate one
             parsed = urlparse(url)
@@ -172,121 +258,47 @@ def extract_dynamic_facts(soup):
     return facts
 
 # -------------- Main Scraper ---------------- #
-def scrape_single_property(page):
-    link = page.url
-    print(f"   Scraping property: {link}")
-    
-    # Extract ID from URL parameter 'id'
-    match = re.search(r"id=([0-9a-zA-Z]+)", link)
-    if match:
-        prop_id = match.group(1)
-    else:
-        # Fallback to old method but be careful
-        prop_id = link.split("-")[-1]
-        if "&" in prop_id:
-            prop_id = prop_id.split("&")[0]
-        
-    file_path = f"{DATA_DIR}/{prop_id}.json"
-    
-    # Create media directory for this property
-    prop_images_dir = os.path.join(IMAGES_DIR, prop_id)
-    os.makedirs(prop_images_dir, exist_ok=True)
-
-    print("   Extracting images...")
-    image_urls = []
-    
-    # Get all images
-    try:
-        all_imgs = page.locator("img").all()
-        for img in all_imgs:
-            src = img.get_attribute("src") or img.get_attribute("data-src")
-            if src and src.startswith("http"):
-                if any(x in src.lower() for x in [".jpg", ".jpeg", ".png", ".webp", "img", "photo"]):
-                    if not any(x in src.lower() for x in ["icon", "logo", "svg", "button"]):
-                        image_urls.append(src)
-        
-        image_urls = list(set(image_urls))
-        
-        # Download images
-        local_images = []
-        for img_url in image_urls:
-            local_path = download_image(img_url, prop_images_dir)
-            if local_path:
-                local_images.append(local_path)
-    except Exception as e:
-        print(f"Error extracting images: {e}")
-        local_images = []
-        image_urls = []
-
-    # --- Advanced Interaction Strategy ---
-    try:
-        page.click("a[href='#more-details']", timeout=2000)
-        time.sleep(1)
-    except:
-        pass
-
-    try:
-        page.click("text=View all details", timeout=2000)
-        time.sleep(1)
-    except:
-        pass
-
-    # Parse content
-    content = page.content()
-    soup = BeautifulSoup(content, "html.parser")
+@timed("extract.build")
+def build_property_data(target, text_of, texts_of, soup, prop_id, link, image_urls, local_images):
+    """Assemble the property record; `target` is what text_of/texts_of read from."""
     full_text = soup.get_text(" ", strip=True)
     
     meta_data = extract_meta_tags(soup)
     structured_data = extract_json_ld(soup)
     dynamic_facts = extract_dynamic_facts(soup)
-    basic_details = extract_basic_details(page)
+    basic_details = extract_basic_details(target, text_of)
     
     # Specific Society Extraction
-    society_name = safe(page, "a.mb-ldp__about-proj__projname")
+    society_name = text_of(target, "a.mb-ldp__about-proj__projname")
     if society_name:
         dynamic_facts["Society"] = society_name
 
     # Specific Description Extraction
-    description = safe(page, "div.mb-ldp__more-dtl__description--content")
+    description = text_of(target, "div.mb-ldp__more-dtl__description--content")
     if not description:
             description = meta_data.get("description")
 
     # Extract locality and address
-    locality, address = extract_locality_address(page)
+    locality, address = extract_locality_address(target, text_of)
     
     # Extract features
-    prop_features, society_features = extract_features(page)
+    prop_features, society_features = extract_features(target, texts_of)
     
     # Extract nearby places
-    nearby = extract_nearby(page)
+    nearby = extract_nearby(target, texts_of)
+
+    title = text_of(target, "h1.mb-pd__title")
     
-    # --- Robust Regex Extraction ---
-    regex_facts = [
-        {"label": "Super Area", "regex": r"Super Area[:\s]*([\d,]+\s*sq\.?ft\.?)", "type": "area"},
-        {"label": "Carpet Area", "regex": r"Carpet Area[:\s]*([\d,]+\s*sq\.?ft\.?)", "type": "area"},
-        {"label": "Floor", "regex": r"Floor[:\s]*([0-9A-Za-z\s]+)(?:out of|$)", "type": "fact"},
-        {"label": "Transaction Type", "regex": r"Transaction Type[:\s]*([A-Za-z\s]+)", "type": "fact"},
-        {"label": "Status", "regex": r"Status[:\s]*([A-Za-z\s]+)", "type": "fact"},
-        {"label": "Facing", "regex": r"Facing[:\s]*([A-Za-z\s]+)", "type": "fact"},
-        {"label": "Society", "regex": r"(?:in|at)\s+([A-Za-z0-9\s]+(?:Apartments|Heights|Enclave|Residency|Tower|City|Park|Villas))", "type": "society"},
-        {"label": "Bathrooms", "regex": r"(\d+)\s*Bath(?:room)?s?", "type": "fact"},
-        {"label": "Balcony", "regex": r"(\d+)\s*Balcon(?:y|ies)", "type": "fact"},
-        {"label": "Furnishing", "regex": r"Furnishing[:\s]*([A-Za-z\s]+)", "type": "fact"},
-    ]
-
-    for pattern in regex_facts:
-        match = re.search(pattern["regex"], full_text, re.IGNORECASE)
-        if match:
-            val = match.group(1).strip()
-            if pattern["label"] not in dynamic_facts:
-                dynamic_facts[pattern["label"]] = val
+    # --- Robust Text Extraction (single keyword-anchored scan) ---
+    text_facts = extract_facts(full_text, MAGICBRICKS_FACT_LABELS + ["Price", "BHK"])
+    for label in MAGICBRICKS_FACT_LABELS:
+        if label in text_facts and label not in dynamic_facts:
+            dynamic_facts[label] = text_facts[label]
     
     # --- Fallback Logic for Core Fields ---
     price = basic_details.get("rent")
     if not price:
-        price_match = re.search(r"₹\s*([\d,]+\s*(?:Cr|Lac|Lakh|Crore)?)", full_text, re.IGNORECASE)
-        if price_match:
-            price = price_match.group(1)
+        price = text_facts.get("Price")
     
     area = basic_details.get("super_builtup_area") or basic_details.get("carpet_area")
     if not area:
@@ -295,21 +307,18 @@ def scrape_single_property(page):
     
     bhk = basic_details.get("configuration")
     if not bhk:
-        title = safe(page, "h1.mb-pd__title") or ""
-        if "BHK" in title:
+        if title and "BHK" in title:
             match = re.search(r"(\d+)\s*BHK", title, re.IGNORECASE)
             if match:
                 bhk = match.group(1) + " BHK"
         
-        if not bhk:
-            match = re.search(r"(\d+)\s*BHK", full_text, re.IGNORECASE)
-            if match:
-                bhk = match.group(1) + " BHK"
+        if not bhk and text_facts.get("BHK"):
+            bhk = text_facts["BHK"] + " BHK"
 
     # Build property data
-    property_data = {
+    return {
         "property_id": prop_id,
-        "property_name": safe(page, "h1.mb-pd__title") or meta_data.get("og:title"),
+        "property_name": title or meta_data.get("og:title"),
         "url": link,
         "bhk": bhk,
         "price": price,
@@ -330,11 +339,83 @@ def scrape_single_property(page):
         "area": area
     }
 
-    # Save json file
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(property_data, f, indent=4, ensure_ascii=False)
+@timed("json.write")
+def save_property_data(property_data):
+    file_path = f"{DATA_DIR}/{property_data['property_id']}.json"
+    # Created here rather than on import, so offline replays don't make scraped_data/
+    os.makedirs(DATA_DIR, exist_ok=True)
+    dump(property_data, file_path)
 
     print(f"✅ Saved → {file_path}")
+    return file_path
+
+def scrape_single_property(page):
+    link = page.url
+    print(f"   Scraping property: {link}")
+    
+    prop_id = extract_property_id(link)
+    
+    # Create media directory for this property
+    prop_images_dir = os.path.join(IMAGES_DIR, prop_id)
+    os.makedirs(prop_images_dir, exist_ok=True)
+
+    # --- Advanced Interaction Strategy ---
+    click_if_present(page, "a[href='#more-details']", MORE_DETAILS_SELECTORS)
+    click_if_present(page, "text=View all details", MORE_DETAILS_SELECTORS)
+
+    # One round trip for every text, list and image we need from the live page
+    text_of, texts_of, srcs = read_dom(page)
+
+    try:
+        if srcs is None:
+            srcs = []
+            for img in page.locator("img").all():
+                srcs.append(img.get_attribute("src") or img.get_attribute("data-src"))
+        image_urls = filter_image_urls(srcs)
+    except Exception as e:
+        print(f"Error extracting images: {e}")
+        image_urls = []
+
+    # Parse content
+    with timer("extract.parse"):
+        content = page.content()
+        if snapshots_enabled():
+            save_snapshot("MagicBricks", prop_id, link, content)
+        soup = BeautifulSoup(content, "html.parser")
+
+    property_data = build_property_data(page, text_of, texts_of, soup, prop_id, link, image_urls,
+                                        existing_images(prop_id))
+    property_data["fingerprint"] = listing_fingerprint(property_data)
+
+    # Only download images and rewrite the JSON when the listing changed since the last check
+    file_exists = os.path.exists(f"{DATA_DIR}/{prop_id}.json")
+    if not mark_checked("MagicBricks", prop_id, link, property_data["fingerprint"]) and file_exists:
+        # Touch it so importers that look for recently scraped files still pick it up
+        os.utime(f"{DATA_DIR}/{prop_id}.json")
+        print(f"♻ Unchanged: {DATA_DIR}/{prop_id}.json")
+        return
+
+    print("   Extracting images...")
+    local_images = []
+    for img_url in image_urls:
+        local_path = download_image(img_url, prop_images_dir)
+        if local_path:
+            local_images.append(local_path)
+    property_data["local_images"] = local_images
+
+    save_property_data(property_data)
+
+
+def extract_property_from_html(html, link):
+    """Run the extraction on stored page HTML, without a browser or downloads."""
+    soup = BeautifulSoup(html, "html.parser")
+    prop_id = extract_property_id(link)
+
+    srcs = [img.get("src") or img.get("data-src") for img in soup.find_all("img")]
+    image_urls = filter_image_urls(srcs)
+    local_images = existing_images(prop_id)
+
+    return build_property_data(soup, safe_soup, safe_all_soup, soup, prop_id, link, image_urls, local_images)
 
 
 def scrape():
@@ -347,6 +428,7 @@ def scrape():
     with sync_playwright() as pw:
         browser = pw.chromium.launch(headless=False)
         context = browser.new_context()
+        block_resources(context)
         page = context.new_page()
         
         # --- STRATEGY 1: Direct URL Navigation ---
@@ -357,8 +439,9 @@ def scrape():
         
         print(f"   Attempting direct navigation to: {direct_url}")
         try:
-            page.goto(direct_url, timeout=30000)
-            time.sleep(2)
+            with timer("page.load_results", url=direct_url):
+                page.goto(direct_url, wait_until="domcontentloaded", timeout=30000)
+                wait_for_any(page, RESULTS_PAGE_SELECTORS, timeout=5000)
             
             # Check if we landed on a valid results page
             # If the keyword was invalid, MB might redirect to home or show no results
@@ -443,58 +526,43 @@ def scrape():
             
             return is_mb and has_prop_keyword and is_not_search
 
-        # Wait loop
-        start_wait = time.time()
-        last_log_time = 0
-        
-        while time.time() - start_wait < 600: # Wait up to 10 minutes
-            # Check all pages in context
-            pages = context.pages
-            
-            # Log status every 2 seconds
-            if time.time() - last_log_time > 2:
-                print(f"   [DEBUG] Open pages: {len(pages)}")
-                for i, p in enumerate(pages):
-                    try:
-                        print(f"      Page {i}: {p.url}")
-                    except:
-                        pass
-                last_log_time = time.time()
-
-            # Look for a page that is NOT the initial search page (index 0)
-            for p in pages:
-                if p != page: # It's a new tab
-                    try:
-                        p.wait_for_load_state("domcontentloaded", timeout=500)
-                    except:
-                        pass
-                    
-                    url = p.url
-                    # If it's a new tab and looks vaguely like a property, take it.
-                    # We trust the user clicked something relevant.
-                    if "magicbricks.com" in url and url != "about:blank":
-                        print(f"   [DEBUG] MATCH FOUND in new tab: {url}")
-                        selected_page = p
-                        break
-            
-            if selected_page:
+        # Tabs opened before we started listening (e.g. during the search interaction)
+        for p in context.pages:
+            if p != page and "magicbricks.com" in p.url:
+                print(f"   [DEBUG] MATCH FOUND in new tab: {p.url}")
+                selected_page = p
                 break
+
+        deadline = time.time() + 600 # Wait up to 10 minutes
+        
+        while not selected_page and time.time() < deadline:
+            # Wakes up as soon as the user opens a listing in a new tab
+            try:
+                new_tab = context.wait_for_event("page", timeout=1000)
+                new_tab.wait_for_load_state("domcontentloaded")
+                print(f"   [DEBUG] New tab opened: {new_tab.url}")
+                # If it's a new tab and looks vaguely like a property, take it.
+                # We trust the user clicked something relevant.
+                if "magicbricks.com" in new_tab.url:
+                    print(f"   [DEBUG] MATCH FOUND in new tab: {new_tab.url}")
+                    selected_page = new_tab
+                    break
+            except:
+                pass
             
             # Also check if the main page navigated to a detail page
-            if page.url != "about:blank":
-                 if is_property_page(page):
-                     print(f"   [DEBUG] MATCH FOUND in main page: {page.url}")
-                     selected_page = page
-                     break
-            
-            time.sleep(1)
-        
-        if selected_page:
-            print(f"🎉 Detected property page: {selected_page.url}")
             try:
-                selected_page.wait_for_load_state("networkidle", timeout=10000)
+                if page.url != "about:blank" and is_property_page(page):
+                    print(f"   [DEBUG] MATCH FOUND in main page: {page.url}")
+                    selected_page = page
             except:
                 pass
+        
+        if selected_page:
+            print(f"🎉 Detected property page: {selected_page.url}")
+            # Wait for the listing details rather than for every tracker to go quiet
+            with timer("page.load", url=selected_page.url):
+                wait_for_any(selected_page, PROPERTY_PAGE_SELECTORS, timeout=10000)
             
             scrape_single_property(selected_page)
         else:
@@ -503,6 +571,9 @@ def scrape():
         browser.close()
 
 if __name__ == "__main__":
+    from profiling import profile_from_cli
+    profile_from_cli()
+
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("keyword", nargs="?", default="Greater Noida")
@@ -514,8 +585,11 @@ if __name__ == "__main__":
         with sync_playwright() as pw:
             browser = pw.chromium.launch(headless=True) # Headless is fine for direct URL
             page = browser.new_page()
+            block_resources(page)
             try:
-                page.goto(args.url, timeout=60000)
+                with timer("page.load", url=args.url):
+                    page.goto(args.url, wait_until="domcontentloaded", timeout=60000)
+                    wait_for_any(page, PROPERTY_PAGE_SELECTORS, timeout=10000)
                 # Handle potential popups
                 try:
                     page.click("text=Ok, understood", timeout=3000)
@@ -524,6 +598,9 @@ if __name__ == "__main__":
                 scrape_single_property(page)
             except Exception as e:
                 print(f"❌ Error scraping URL: {e}")
+                browser.close()
+                # Non-zero exit so callers (e.g. scheduler.py) can retry
+                sys.exit(1)
             browser.close()
     else:
         # Pass keyword to scrape function via sys.argv hack or modify scrape to take arg
@@ -0,0 +1,197 @@
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+from statistics import median
+from collections import Counter, defaultdict
+
+from geo import place_for_id
+from amenities import amenity_names
+from indexer import load_canonical_ids
+from mongo_export import parse_price
+from property_schema import is_current
+from serialization import dump, load
+
+# Use absolute paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "scraped_data")
+
+# Per-locality market figures for the dashboards, so a page reads one small
+# file instead of scanning every listing. aggregates_state.json keeps the few
+# facts each listing contributes (with the size and mtime of its file); a run
+# only re-reads files that changed since, then recomputes the rollups from the
+# facts. Bump AGGREGATES_VERSION when the facts or the output change.
+AGGREGATES_VERSION = 2
+ROLLING_DAYS = 90  # figures cover listings scraped this close to the newest one
+TOP_AMENITIES = 20
+
+# Facts kept per listing file, in this order
+FACT_FIELDS = ["mtime_ns", "size", "id", "locality", "name", "bhk", "type", "price", "sqft", "scraped_at", "amenity_mask"]
+
+_AREA_PATTERN = re.compile(r"([\d,]+(?:\.\d+)?)\s*(sq\.?\s*(?:ft|feet|yd|yard|m|meter|metre)|sqft|sqyd|sqm)?", re.IGNORECASE)
+_SQFT_PER_UNIT = {"yd": 9.0, "ya": 9.0, "m": 10.7639, "me": 10.7639}
+
+
+def parse_area(area):
+    """'2,450 sq.ft.' -> 2450.0, '200 Sq. Yd' -> 1800.0; square feet, or None if unreadable."""
+    if not area:
+        return None
+    if isinstance(area, (int, float)):
+        return float(area) or None
+    match = _AREA_PATTERN.search(str(area))
+    if not match:
+        return None
+    try:
+        value = float(match.group(1).replace(",", ""))
+    except ValueError:
+        return None
+    unit = re.sub(r"[^a-z]", "", (match.group(2) or "").lower())
+    unit = unit[2:] if unit.startswith("sq") else unit
+    return value * _SQFT_PER_UNIT.get(unit[:2], 1.0) or None
+
+
+def listing_facts(record):
+    """What a normalized record contributes to the aggregates (FACT_FIELDS minus the file stat)."""
+    location = record.get("location") or {}
+    locality = location.get("locality_id") or (location.get("locality") or "").strip().lower() or None
+    bhk = record.get("bhk")
+    return [
+        record.get("id"),
+        locality,
+        location.get("locality"),
+        str(bhk) if bhk not in (None, "") else None,
+        record.get("type"),
+        parse_price(record.get("price")) or None,
+        parse_area(record.get("area")),
+        record.get("scraped_at"),
+        record.get("amenity_mask") or 0
+    ]
+
+
+def _stats(facts):
+    prices = [f["price"] for f in facts if f["price"]]
+    per_sqft = [f["price"] / f["sqft"] for f in facts if f["price"] and f["sqft"]]
+    return {
+        "listings": len(facts),
+        "median_price": round(median(prices)) if prices else None,
+        "median_price_per_sqft": round(median(per_sqft), 2) if per_sqft else None
+    }
+
+
+def _by_type(facts):
+    # Rent and sale prices differ by orders of magnitude, so they never share a median
+    groups = defaultdict(list)
+    for f in facts:
+        groups[(f["type"] or "Unknown").lower()].append(f)
+    return {kind: _stats(group) for kind, group in sorted(groups.items())}
+
+
+def rollup(facts, canonical=None, rolling_days=ROLLING_DAYS):
+    """Per-locality figures from listing facts (dicts keyed by FACT_FIELDS)."""
+    canonical = canonical or {}
+    # Listed twice (or on both portals) counts once
+    facts = [f for f in facts if f["locality"] and str(canonical.get(str(f["id"]), f["id"])) == str(f["id"])]
+    dated = [f["scraped_at"] for f in facts if f["scraped_at"]]
+    window_start = None
+    if dated:
+        newest = max(datetime.fromisoformat(d) for d in dated)
+        window_start = (newest - timedelta(days=rolling_days)).isoformat()
+    # ISO timestamps compare correctly as strings; undated listings are kept
+    facts = [f for f in facts if not (window_start and f["scraped_at"] and f["scraped_at"] < window_start)]
+
+    groups = defaultdict(list)
+    for f in facts:
+        groups[f["locality"]].append(f)
+
+    localities = {}
+    for locality, group in sorted(groups.items()):
+        place = place_for_id(locality)
+        names = Counter(f["name"] for f in group if f["name"])
+        by_bhk = defaultdict(list)
+        for f in group:
+            if f["bhk"]:
+                by_bhk[f["bhk"]].append(f)
+        amenity_counts = Counter(a for f in group for a in amenity_names(f["amenity_mask"]))
+        localities[locality] = {
+            "name": place[0] if place else (names.most_common(1)[0][0] if names else locality),
+            "zone": place[1] if place else None,
+            "listings": len(group),
+            **_by_type(group),
+            "by_bhk": {
+                bhk: {"listings": len(items), **_by_type(items)}
+                for bhk, items in sorted(by_bhk.items(), key=lambda item: (len(item[0]), item[0]))
+            },
+            "amenities": {
+                name: round(count / len(group), 3) for name, count in amenity_counts.most_common(TOP_AMENITIES)
+            }
+        }
+    return {"window_start": window_start, "listings": len(facts), "localities": localities}
+
+
+def _load_state(path):
+    try:
+        state = load(path)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(state, dict) or state.get("version") != AGGREGATES_VERSION or state.get("fields") != FACT_FIELDS:
+        return {}
+    return state.get("listings", {})
+
+
+def update_aggregates(data_dir=DATA_DIR, known=None, canonical=None, full=False):
+    """Refresh scraped_data/aggregates.json from the normalized records in properties/.
+
+    known maps file names to listing_facts() the caller already computed
+    (the organizer, for the records it just wrote). Other files are only read
+    when new or changed since the last run, unless full=True. Returns the
+    aggregates that were written.
+    """
+    properties_dir = os.path.join(data_dir, "properties")
+    state_path = os.path.join(data_dir, "aggregates_state.json")
+    previous = {} if full else _load_state(state_path)
+    known = known or {}
+    canonical = load_canonical_ids(data_dir) if canonical is None else canonical
+
+    listings = {}
+    read = 0
+    if os.path.isdir(properties_dir):
+        with os.scandir(properties_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                stat = entry.stat()
+                old = previous.get(entry.name)
+                if entry.name in known:
+                    facts = known[entry.name]
+                elif old is not None and old[0] == stat.st_mtime_ns and old[1] == stat.st_size:
+                    listings[entry.name] = old
+                    continue
+                else:
+                    try:
+                        record = load(entry.path)
+                    except Exception as e:
+                        print(f"Error processing {entry.path}: {e}")
+                        continue
+                    read += 1
+                    # A raw scrape not normalized yet is remembered as contributing nothing
+                    facts = listing_facts(record) if is_current(record) else [None] * (len(FACT_FIELDS) - 2)
+                listings[entry.name] = [stat.st_mtime_ns, stat.st_size] + facts
+
+    dump({"version": AGGREGATES_VERSION, "fields": FACT_FIELDS, "listings": listings}, state_path, compact=True)
+    aggregates = {
+        "version": AGGREGATES_VERSION,
+        "generated_at": datetime.now().isoformat(),
+        "rolling_days": ROLLING_DAYS,
+        **rollup((dict(zip(FACT_FIELDS, row)) for row in listings.values()), canonical)
+    }
+    dump(aggregates, os.path.join(data_dir, "aggregates.json"))
+    print(f"📊 Aggregated {aggregates['listings']} listings into {len(aggregates['localities'])} localities "
+          f"({read} files read)")
+    return aggregates
+
+
+if __name__ == "__main__":
+    from profiling import profile_from_cli
+    profile_from_cli()
+
+    update_aggregates(full="--full" in sys.argv)
@@ -0,0 +1,123 @@
+import re
+from functools import lru_cache
+
+# Controlled vocabulary for the free-text amenities in a listing's `features`.
+# normalize_property stores the amenities it recognises as one integer,
+# amenity_mask, with bit i set for AMENITIES[i]; "has a gym and a pool" is then
+# (mask & wanted) == wanted instead of a string search. Bits are persisted in
+# records and the index: only ever append to this list, never reorder or
+# remove (a retired amenity keeps its slot), and at most 64 entries so a mask
+# fits a uint64.
+#
+# (name, aliases) - aliases match as whole words anywhere in a feature string,
+# so "24x7 Security" and "Security Personnel" both count as Security.
+AMENITIES = [
+    ("Power Back Up", ["power backup", "power back up", "dg backup", "generator"]),
+    ("Lift", ["lift", "lifts", "elevator", "elevators"]),
+    ("Park", ["park", "garden", "landscaped garden", "green area"]),
+    ("Reserved Parking", ["reserved parking", "covered parking", "car parking", "parking"]),
+    ("Visitor Parking", ["visitor parking", "visitors parking"]),
+    ("Security", ["security", "security guard", "security personnel", "gated community"]),
+    ("CCTV", ["cctv", "cctv surveillance", "surveillance"]),
+    ("Intercom", ["intercom"]),
+    ("Club House", ["club house", "clubhouse", "community hall", "community center", "community centre"]),
+    ("Swimming Pool", ["swimming pool", "pool"]),
+    ("Gymnasium", ["gym", "gymnasium", "fitness centre", "fitness center"]),
+    ("Jogging Track", ["jogging track", "jogging", "walking track"]),
+    ("Kids Play Area", ["kids play area", "children play area", "childrens play area", "play area", "play ground", "playground"]),
+    ("Indoor Games", ["indoor games", "indoor games room"]),
+    ("Sports Facility", ["sports facility", "tennis court", "badminton court", "basketball court", "cricket pitch"]),
+    ("Maintenance Staff", ["maintenance staff"]),
+    ("Water Storage", ["water storage", "water supply", "24x7 water"]),
+    ("Rain Water Harvesting", ["rain water harvesting", "rainwater harvesting"]),
+    ("Fire Safety", ["fire alarm", "fire fighting", "fire safety", "fire sprinklers"]),
+    ("Piped Gas", ["piped gas", "gas pipeline"]),
+    ("Internet", ["internet", "wifi", "wi fi", "broadband"]),
+    ("Air Conditioned", ["air conditioned", "air conditioning", "ac"]),
+    ("Modular Kitchen", ["modular kitchen"]),
+    ("Shopping Centre", ["shopping centre", "shopping center", "shopping complex", "convenience store"]),
+    ("Vaastu Compliant", ["vaastu compliant", "vastu compliant", "vaastu", "vastu"]),
+    ("Pet Friendly", ["pet friendly", "pets allowed"]),
+]
+assert len(AMENITIES) <= 64, "amenity masks are stored as uint64"
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_ALIASES = sorted(
+    ((tuple(_TOKEN_PATTERN.findall(alias)), bit) for bit, (_, aliases) in enumerate(AMENITIES) for alias in aliases),
+    key=lambda alias: -len(alias[0])
+)
+
+_numpy_module = None
+_numpy_checked = False
+
+
+def _numpy():
+    """NumPy, or None if it isn't installed (masks are then filtered in pure Python)."""
+    global _numpy_module, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            _numpy_module = numpy
+        except ImportError:
+            print("⚠ NumPy not installed, amenity filters fall back to pure Python")
+    return _numpy_module
+
+
+@lru_cache(maxsize=4096)
+def _feature_mask(feature):
+    # Feature strings repeat across listings, so each spelling is matched once. Longest
+    # aliases go first and consume their words: "Visitor Parking" is not also Reserved Parking
+    padded = f" {' '.join(_TOKEN_PATTERN.findall(feature.lower()))} "
+    mask = 0
+    for tokens, bit in _ALIASES:
+        phrase = f" {' '.join(tokens)} "
+        if phrase in padded:
+            mask |= 1 << bit
+            padded = padded.replace(phrase, "  ")
+    return mask
+
+
+def amenity_mask(features):
+    """Bitset of the AMENITIES named in `features` (a list, or a dict of category -> list)."""
+    if isinstance(features, dict):
+        features = [item for items in features.values() if isinstance(items, list) for item in items]
+    if not isinstance(features, list):
+        return 0
+    mask = 0
+    for feature in features:
+        if isinstance(feature, str):
+            mask |= _feature_mask(feature)
+    return mask
+
+
+def mask_for(*names):
+    """Mask of the given amenities, by vocabulary name or alias ("gym", "Swimming Pool")."""
+    mask = 0
+    for name in names:
+        wanted = _feature_mask(name)
+        if not wanted:
+            raise ValueError(f"Unknown amenity: {name}")
+        mask |= wanted
+    return mask
+
+
+def amenity_names(mask):
+    return [name for bit, (name, _) in enumerate(AMENITIES) if mask >> bit & 1]
+
+
+def mask_array(masks):
+    """Masks as a NumPy uint64 array (or a plain list without NumPy), built once per query batch."""
+    np = _numpy()
+    if np is None:
+        return list(masks)
+    return np.fromiter((m or 0 for m in masks), dtype=np.uint64)
+
+
+def positions_with(masks, wanted):
+    """Positions of the masks (from mask_array) that have every amenity in `wanted`."""
+    np = _numpy()
+    if np is None or not hasattr(masks, "dtype"):
+        return [i for i, mask in enumerate(masks) if mask and mask & wanted == wanted]
+    wanted = np.uint64(wanted)
+    return np.flatnonzero((masks & wanted) == wanted).tolist()
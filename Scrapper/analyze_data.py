@@ -1,16 +1,19 @@
 import os
-import json
 from collections import defaultdict
 
+from serialization import load
+
+EXAMPLE_FILES = 5  # filenames listed per field; the rest are only counted
+
 # Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "scraped_data")
 PROPERTIES_DIR = DATA_DIR
 
-def analyze_properties():
+def analyze_properties(properties_dir=PROPERTIES_DIR):
     """Analyze all property files for null/missing values."""
     
-    null_stats = defaultdict(lambda: {"count": 0, "files": []})
+    null_stats = defaultdict(lambda: {"count": 0, "examples": []})
     total_files = 0
     
     # Fields to check
@@ -23,16 +26,15 @@ def analyze_properties():
     print("ANALYZING SCRAPED DATA FOR NULL VALUES")
     print("=" * 60)
     
-    for filename in os.listdir(PROPERTIES_DIR):
+    for filename in os.listdir(properties_dir):
         if not filename.endswith(".json"):
             continue
             
         total_files += 1
-        filepath = os.path.join(PROPERTIES_DIR, filename)
+        filepath = os.path.join(properties_dir, filename)
         
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
+            data = load(filepath)
         except:
             print(f"⚠ Error reading {filename}")
             continue
@@ -56,7 +58,8 @@ def analyze_properties():
             
             if value is None or value == "" or value == "Unknown":
                 null_stats[field_name]["count"] += 1
-                null_stats[field_name]["files"].append(filename)
+                if len(null_stats[field_name]["examples"]) < EXAMPLE_FILES:
+                    null_stats[field_name]["examples"].append(filename)
     
     # Print summary
     print(f"\nTotal files analyzed: {total_files}")
@@ -68,9 +71,9 @@ def analyze_properties():
         percentage = (stats["count"] / total_files) * 100
         print(f"\n{field}:")
         print(f"  Null count: {stats['count']}/{total_files} ({percentage:.1f}%)")
-        print(f"  Files: {', '.join(stats['files'][:5])}")
-        if len(stats['files']) > 5:
-            print(f"         ... and {len(stats['files']) - 5} more")
+        print(f"  Files: {', '.join(stats['examples'])}")
+        if stats['count'] > EXAMPLE_FILES:
+            print(f"         ... and {stats['count'] - EXAMPLE_FILES} more")
     
     # Detailed analysis by source
     print("\n" + "=" * 60)
@@ -80,14 +83,13 @@ def analyze_properties():
     source_stats = {"99Acers": {"total": 0, "null_bhk": 0, "null_url": 0, "null_address": 0},
                     "MagicBricks": {"total": 0, "null_bhk": 0, "null_url": 0, "null_address": 0}}
     
-    for filename in os.listdir(PROPERTIES_DIR):
+    for filename in os.listdir(properties_dir):
         if not filename.endswith(".json"):
             continue
             
-        filepath = os.path.join(PROPERTIES_DIR, filename)
+        filepath = os.path.join(properties_dir, filename)
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
+            data = load(filepath)
         except:
             continue
         
@@ -133,4 +135,7 @@ def analyze_properties():
     print("\n")
 
 if __name__ == "__main__":
+    from profiling import profile_from_cli
+    profile_from_cli()
+
     analyze_properties()
@@ -0,0 +1,178 @@
+import os
+import itertools
+from contextlib import contextmanager
+
+# Files are written next to their destination under a temporary name, fsynced,
+# then renamed over it, so a crash leaves either the old file or the new one and
+# never a truncated mix. SCRAPER_FSYNC=0 keeps the rename but skips the fsyncs
+# (benchmarks, throwaway corpora); the files are then only as durable as the OS
+# page cache.
+FSYNC_ENV = "SCRAPER_FSYNC"
+
+_counter = itertools.count()
+
+
+def fsync_enabled():
+    return os.getenv(FSYNC_ENV, "1").strip().lower() not in ("0", "false", "no")
+
+
+def _temp_path(path):
+    # Unique per process and call, and never ending in .json, so directory scans skip leftovers
+    return f"{path}.{os.getpid()}.{next(_counter)}.tmp"
+
+
+def fsync_dir(path):
+    """Make renames inside directory `path` durable (a no-op where directories can't be opened)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(path, mode="wb", durable=None):
+    """Open a temporary file that replaces `path` when the block exits without error."""
+    durable = fsync_enabled() if durable is None else durable
+    tmp_path = _temp_path(path)
+    try:
+        with open(tmp_path, mode) as f:
+            yield f
+            f.flush()
+            if durable:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if durable:
+        fsync_dir(os.path.dirname(os.path.abspath(path)))
+
+
+def write_atomic(path, data, durable=None):
+    with atomic_open(path, "wb", durable) as f:
+        f.write(data)
+
+
+class AtomicBatch:
+    """Stage many file writes and make them durable together.
+
+    write() only puts the data in a temporary file. commit() then fsyncs all
+    of them back to back (their writeback has long started), renames each over
+    its destination and fsyncs every directory touched once, instead of paying
+    a file and a directory fsync per file. Until commit() no destination is
+    touched; a batch left by an exception is rolled back. Used as a context
+    manager it commits on success.
+    """
+
+    def __init__(self, durable=None):
+        self.durable = fsync_enabled() if durable is None else durable
+        self.staged = []
+
+    def write(self, path, data):
+        tmp_path = _temp_path(path)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        self.staged.append((tmp_path, path))
+
+    def commit(self):
+        if self.durable:
+            for tmp_path, _ in self.staged:
+                fd = os.open(tmp_path, os.O_RDWR)  # Windows won't fsync a read-only descriptor
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+        for tmp_path, path in self.staged:
+            os.replace(tmp_path, path)
+        if self.durable:
+            for directory in {os.path.dirname(os.path.abspath(path)) for _, path in self.staged}:
+                fsync_dir(directory)
+        committed = [path for _, path in self.staged]
+        self.staged = []
+        return committed
+
+    def abort(self):
+        for tmp_path, _ in self.staged:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.staged = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+
+class MoveJournal:
+    """Crash-safe "write the copy, then delete the original" for many files.
+
+    Once a batch of copies is committed, record() appends one line per
+    original (with its size and mtime) and fsyncs the journal; only then are
+    the originals deleted. If the process dies in between, recover() on the
+    next run deletes the originals the journal vouches for, unless they were
+    rewritten since (a fresh scrape of the same listing), so nothing has to be
+    reprocessed. The journal only exists while a batch of moves is in flight.
+    """
+
+    SEPARATOR = "\t"
+
+    def __init__(self, path):
+        self.path = path
+
+    def record(self, moves):
+        """moves: [(original, copy)] whose copies are already durable."""
+        lines = []
+        for original, copy in moves:
+            st = os.stat(original)
+            lines.append(self.SEPARATOR.join([original, copy, str(st.st_size), str(st.st_mtime_ns)]) + "\n")
+        created = not os.path.exists(self.path)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            if fsync_enabled():
+                os.fsync(f.fileno())
+        if created and fsync_enabled():
+            fsync_dir(os.path.dirname(os.path.abspath(self.path)))
+
+    def complete(self, moves):
+        """Delete the originals of moves that were just recorded, then the journal."""
+        for original, _ in moves:
+            if os.path.exists(original):
+                os.remove(original)
+        self.clear()
+
+    def recover(self):
+        """Finish moves interrupted by a crash; returns how many originals were deleted."""
+        if not os.path.exists(self.path):
+            return 0
+        removed = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.rstrip("\n").split(self.SEPARATOR)
+                if len(parts) != 4:
+                    continue  # torn last line: its originals were never deleted
+                original, copy, size, mtime_ns = parts
+                if not (os.path.exists(original) and os.path.exists(copy)):
+                    continue
+                st = os.stat(original)
+                if st.st_size == int(size) and st.st_mtime_ns == int(mtime_ns):
+                    os.remove(original)
+                    removed += 1
+        self.clear()
+        return removed
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,335 @@
+import os
+import sys
+import copy
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import importlib
+import statistics
+import subprocess
+from contextlib import redirect_stdout
+
+# Use absolute paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BASE_DIR, "fixtures")
+BASELINE_FILE = os.path.join(FIXTURES_DIR, "benchmark_baseline.json")
+
+DEFAULT_LISTINGS = 50000
+DEFAULT_REPEAT = 5
+FIXTURE_LOOPS = 200  # fixture cases are too quick to time a single call
+REGRESSION_TOLERANCE = 0.5  # --check fails when a median is 50% slower than its baseline
+
+# Scripts the backend or scheduler spawns per request; their import time is paid every time
+IMPORT_MODULES = [
+    "99Acers", "Magic_bricks", "search_discussions", "organizer", "indexer",
+    "analyze_data", "dedup", "scrape_service", "scheduler", "replay"
+]
+
+SOCIETIES = [
+    "ATS Rhapsody", "Gaur City 2", "Supertech Ecovillage 2", "Mahagun Mywoods", "Nirala Estate",
+    "Ajnara Homes", "Panchsheel Greens", "Ace City", "Cherry County", "Amrapali Leisure Valley"
+]
+SECTORS = ["Sector 1", "Sector 16B", "Sector 10", "Techzone 4", "Sector 12", "Sector 4"]
+
+
+def load_fixture(*parts, as_json=False):
+    with open(os.path.join(FIXTURES_DIR, *parts), "r", encoding="utf-8") as f:
+        return json.load(f) if as_json else f.read()
+
+
+def fixture_properties():
+    folder = os.path.join(FIXTURES_DIR, "properties")
+    return [load_fixture("properties", name, as_json=True) for name in sorted(os.listdir(folder))]
+
+
+def generate_corpus(root, listings=DEFAULT_LISTINGS, seed=1, images_every=100):
+    """Write a synthetic scraped_data/ tree under root and return its raw records.
+
+    Listings are variations of the fixture properties laid out the way the
+    scrapers leave them: 99acres files at the top level, MagicBricks files in
+    properties/. Every `images_every`th listing gets three image files.
+    """
+    rng = random.Random(seed)
+    acres, magicbricks = fixture_properties()
+    data_dir = os.path.join(root, "scraped_data")
+    os.makedirs(os.path.join(data_dir, "properties"), exist_ok=True)
+
+    records = []
+    for i in range(listings):
+        bhk = rng.randint(1, 5)
+        society = rng.choice(SOCIETIES)
+        sector = rng.choice(SECTORS)
+        title = f"{bhk} BHK Flat for Rent in {society}, {sector} Greater Noida West"
+        price = f"₹ {rng.randrange(8000, 90000, 500):,}"
+
+        if i % 2:
+            prop_id = f"{i:020x}"
+            data = copy.deepcopy(magicbricks)
+            data.update(property_id=prop_id, property_name=title, price=price, locality=sector)
+            data["link"] = data["link"].replace(magicbricks["property_id"], prop_id)
+            path = os.path.join(data_dir, "properties", f"{prop_id}.json")
+        else:
+            prop_id = f"R{i:08d}"
+            data = copy.deepcopy(acres)
+            data.update(property_id=prop_id, property_name=title, price=price, bhk=bhk)
+            path = os.path.join(data_dir, f"{prop_id}.json")
+
+        data["local_images"] = []
+        if i % images_every == 0:
+            images_dir = os.path.join(data_dir, "images", prop_id)
+            os.makedirs(images_dir, exist_ok=True)
+            for n in range(3):
+                name = f"{prop_id}_{n}.jpg"
+                with open(os.path.join(images_dir, name), "wb") as f:
+                    f.write(rng.randbytes(rng.choice([2048, 30720, 61440])))
+                # Absolute, since organizer resolves relative image paths against Scrapper/
+                data["local_images"].append(os.path.join(images_dir, name))
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        records.append(data)
+    return records
+
+
+# ---------------- Cases ---------------- #
+# Each case takes the run context and returns the zero-argument callable to time.
+
+def case_normalize_fixtures(ctx):
+    from organizer import normalize_property
+    props = fixture_properties()
+
+    def run():
+        for _ in range(FIXTURE_LOOPS):
+            for data in props:
+                normalize_property(data, "fixture.json", {}, frozenset())
+    return run
+
+
+def case_normalize_corpus(ctx):
+    from organizer import normalize_property
+
+    def run():
+        for data in ctx["records"]:
+            normalize_property(data, "corpus.json", {}, frozenset())
+    return run
+
+
+def case_clean_images_corpus(ctx):
+    from organizer import clean_images
+    from image_filter import ImageCache
+    with_images = [data["local_images"] for data in ctx["records"] if data["local_images"]]
+    cache = ImageCache(os.path.join(ctx["data_dir"], "image_cache.json"))
+
+    def run():
+        for local_images in with_images:
+            clean_images(local_images, cache=cache)
+    return run
+
+
+def case_extract_all_99acres(ctx):
+    acres = importlib.import_module("99Acers")
+    html = load_fixture("html", "acres_ats_rhapsody.html")
+    url = "https://www.99acres.com/4-bhk-bedroom-apartment-flat-for-rent-in-ats-rhapsody-spid-R81234567"
+
+    def run():
+        for _ in range(FIXTURE_LOOPS // 10):
+            acres.PropertyDataExtractor(html, "R81234567", download_images=False).extract_all(url)
+    return run
+
+
+def case_magicbricks_facts(ctx):
+    from fact_extractor import extract_facts, MAGICBRICKS_FACT_LABELS
+    pages = [load_fixture("page_text", name) for name in
+             ("magicbricks_supertech.txt", "magicbricks_minimal.txt")]
+
+    def run():
+        for _ in range(FIXTURE_LOOPS):
+            for text in pages:
+                extract_facts(text, MAGICBRICKS_FACT_LABELS)
+    return run
+
+
+def case_json_roundtrip_corpus(ctx):
+    from serialization import dumps_bytes, loads
+    records = ctx["records"]
+
+    def run():
+        for data in records:
+            loads(dumps_bytes(data))
+    return run
+
+
+def case_index_files_corpus(ctx):
+    from indexer import index_files
+    return lambda: index_files(ctx["data_dir"], full=True)
+
+
+def case_index_files_unchanged_corpus(ctx):
+    # The common case after a scrape: nothing (or little) changed since the last build
+    from indexer import index_files
+    index_files(ctx["data_dir"])
+    return lambda: index_files(ctx["data_dir"])
+
+
+def case_analyze_properties_corpus(ctx):
+    from analyze_data import analyze_properties
+    properties_dir = os.path.join(ctx["data_dir"], "properties")
+    return lambda: analyze_properties(properties_dir)
+
+
+CASES = [
+    ("normalize_property[fixtures]", case_normalize_fixtures),
+    ("normalize_property[corpus]", case_normalize_corpus),
+    ("clean_images[corpus]", case_clean_images_corpus),
+    ("PropertyDataExtractor.extract_all[99acres]", case_extract_all_99acres),
+    ("extract_facts[magicbricks]", case_magicbricks_facts),
+    ("json_roundtrip[corpus]", case_json_roundtrip_corpus),
+    ("index_files[corpus]", case_index_files_corpus),
+    ("index_files[corpus, unchanged]", case_index_files_unchanged_corpus),
+    ("analyze_properties[corpus]", case_analyze_properties_corpus),
+]
+
+
+def measure(func, repeat):
+    func()  # warm-up: imports, caches, page cache
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return {"median": statistics.median(samples), "min": min(samples)}
+
+
+def run_cases(listings, repeat, only=None):
+    root = tempfile.mkdtemp(prefix="scrapper-bench-")
+    results = {}
+    try:
+        print(f"🏗  Generating synthetic corpus of {listings} listings in {root}")
+        started = time.perf_counter()
+        records = generate_corpus(root, listings)
+        print(f"   done in {time.perf_counter() - started:.1f}s")
+
+        # Scrapper modules default to Scrapper/scraped_data; every case is handed
+        # the synthetic tree (or an ImageCache inside it) explicitly instead
+        ctx = {"root": root, "data_dir": os.path.join(root, "scraped_data"), "records": records}
+        for name, case in CASES:
+            if only and only not in name:
+                continue
+            # Third-party libraries are imported on first use (see deps), so a missing
+            # one can surface during the warm-up call rather than in the case setup
+            try:
+                func = case(ctx)
+                with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                    results[name] = measure(func, repeat)
+            except ImportError as e:
+                print(f"⚠ {name}: skipped ({e})")
+                continue
+            print(f"⏱  {name}: median {results[name]['median'] * 1000:.1f} ms, "
+                  f"min {results[name]['min'] * 1000:.1f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def import_time(module):
+    """Cumulative import time of `module` in a fresh interpreter, per python -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"__import__({module!r})"],
+        cwd=BASE_DIR, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise ImportError(proc.stderr.strip().splitlines()[-1])
+    # "import time: self [us] | cumulative | imported package", nested imports indented
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module and not parts[2].startswith("  "):
+            return int(parts[1]) / 1e6
+    raise ImportError(f"{module} missing from -X importtime output")
+
+
+def run_imports(repeat, only=None):
+    results = {}
+    for module in IMPORT_MODULES:
+        name = f"import[{module}]"
+        if only and only not in name:
+            continue
+        try:
+            samples = [import_time(module) for _ in range(repeat)]
+        except ImportError as e:
+            print(f"⚠ {name}: skipped ({e})")
+            continue
+        results[name] = {"median": statistics.median(samples), "min": min(samples)}
+        print(f"⏱  {name}: median {results[name]['median'] * 1000:.1f} ms, "
+              f"min {results[name]['min'] * 1000:.1f} ms")
+    return results
+
+
+def machine_info():
+    from serialization import BACKEND
+    return {
+        "json_backend": BACKEND,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count()
+    }
+
+
+def compare(results, baseline, listings):
+    """Print the change against the baseline; returns the names of regressed cases."""
+    if listings is not None and baseline.get("listings") != listings:
+        print(f"⚠ Baseline was recorded with {baseline.get('listings')} listings, not comparing")
+        return []
+    regressed = []
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        change = result["median"] / base["median"] - 1
+        flag = "❌" if change > REGRESSION_TOLERANCE else "✅"
+        print(f"{flag} {name}: {change:+.0%} vs baseline")
+        if change > REGRESSION_TOLERANCE:
+            regressed.append(name)
+    return regressed
+
+
+if __name__ == "__main__":
+    from profiling import profile_from_cli
+    profile_from_cli()
+
+    parser = argparse.ArgumentParser(description="Benchmark Scrapper hot paths on fixtures and a synthetic corpus")
+    parser.add_argument("--listings", type=int, default=DEFAULT_LISTINGS)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--only", help="Run only cases whose name contains this text")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Write results to {os.path.relpath(BASELINE_FILE, BASE_DIR)}")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if a case regressed against the baseline")
+    parser.add_argument("--imports", action="store_true",
+                        help="Time importing each script (python -X importtime) instead of the corpus cases")
+    args = parser.parse_args()
+
+    # Import timings are kept under their own key, so either kind of baseline can be refreshed alone
+    key = "imports" if args.imports else "results"
+    if args.imports:
+        results = run_imports(args.repeat, args.only)
+    else:
+        results = run_cases(args.listings, args.repeat, args.only)
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    if args.save_baseline:
+        baseline.update({"machine": machine_info(), key: results})
+        if not args.imports:
+            baseline["listings"] = args.listings
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=4)
+        print(f"💾 Baseline saved to {BASELINE_FILE}")
+    elif baseline.get(key):
+        regressed = compare(results, {**baseline, "results": baseline[key]}, None if args.imports else args.listings)
+        if args.check and regressed:
+            sys.exit(1)
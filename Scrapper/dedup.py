@@ -0,0 +1,237 @@
+import os
+import re
+import zlib
+import random
+from array import array
+from collections import defaultdict
+
+from image_hash import dhash, hamming, resolve_image_path
+from records import PropertySummary
+from mongo_export import parse_price
+from serialization import dump, load
+
+# Use absolute paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "scraped_data")
+PROPERTIES_DIR = os.path.join(DATA_DIR, "properties")
+DUPLICATES_FILE = os.path.join(DATA_DIR, "duplicates.json")
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: pairs above ~0.7 Jaccard almost always share a band
+SIMILARITY_THRESHOLD = 0.7
+IMAGE_DISTANCE = 3  # max differing bits between two dHashes of the same photo
+IMAGES_PER_LISTING = 3
+PRICE_TOLERANCE = 0.1  # listed prices further apart than this are different flats
+MAX_BUCKET_SIZE = 300  # members compared pairwise per bucket; bigger buckets are cut here (and reported)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def listing_tokens(prop):
+    """Word and word-bigram shingles over title, locality and key facts."""
+    location = prop.get("location") or {}
+    facts = [prop.get("bhk"), prop.get("area"), prop.get("price"), location.get("locality")]
+    text = " ".join(str(part) for part in [prop.get("title")] + facts if part)
+    words = _TOKEN_PATTERN.findall(text.lower())
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+class MinHasher:
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = random.Random(seed)
+        self.params = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                       for _ in range(num_perm)]
+
+    def signature(self, tokens):
+        values = [zlib.crc32(t.encode("utf-8")) for t in tokens] or [0]
+        # array('Q') takes 8 bytes per value instead of a list of 64 boxed ints
+        return array("Q", [min((a * v + b) % _MERSENNE_PRIME for v in values) for a, b in self.params])
+
+
+def estimated_similarity(sig_a, sig_b):
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        self.parent.setdefault(x, x)
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        self.parent[self.find(a)] = self.find(b)
+
+
+def image_hashes(prop, image_infos=None):
+    """dHashes of a listing's first few photos, reusing image_filter results when given."""
+    hashes = []
+    for path in (prop.get("images") or [])[:IMAGES_PER_LISTING]:
+        if image_infos is not None:
+            info = image_infos.get(resolve_image_path(path))
+            hashes.append(info and info["dhash"])
+        else:
+            hashes.append(dhash(path))
+    return [h for h in hashes if h is not None]
+
+
+def find_duplicates(props, threshold=SIMILARITY_THRESHOLD, use_images=True, image_infos=None):
+    """Cluster near-duplicate listings.
+
+    Text signatures are MinHash/LSH banded and image dHashes are bucketed by
+    16-bit chunk, so only listings sharing a bucket are ever compared and the
+    work stays roughly linear in corpus size. Returns (canonical, clusters):
+    canonical maps every id to its cluster's canonical id, clusters maps each
+    canonical id with at least one duplicate to its member ids.
+    """
+    hasher = MinHasher()
+    rows = NUM_PERM // BANDS
+    by_id = {str(p["id"]): p for p in props if p.get("id")}
+    # Listings are referred to by position from here on; everything per listing lives
+    # in flat arrays so memory stays at a few hundred bytes per listing
+    ids = list(by_id)
+    listings = list(by_id.values())
+    del by_id
+
+    signatures = array("Q")
+    band_keys = [array("q") for _ in range(BANDS)]
+    for prop in listings:
+        sig = hasher.signature(listing_tokens(prop))
+        signatures.extend(sig)
+        for band in range(BANDS):
+            band_keys[band].append(hash(tuple(sig[band * rows:(band + 1) * rows])))
+
+    images = {}
+    image_buckets = defaultdict(list)
+    if use_images:
+        for i, prop in enumerate(listings):
+            hashes = image_hashes(prop, image_infos)
+            if hashes:
+                images[i] = hashes
+            for h in hashes:
+                # Hashes within IMAGE_DISTANCE (< 4) bits share at least one exact 16-bit chunk
+                for chunk in range(4):
+                    image_buckets[(chunk, (h >> (16 * chunk)) & 0xFFFF)].append(i)
+
+    clusters = _UnionFind()
+    oversized = 0
+    for members in _buckets(band_keys, image_buckets):
+        # Near-duplicate similarity is not transitive, so every pair in a bucket is checked;
+        # only pairs union-find already put in one cluster are skipped. A bucket that big is
+        # usually boilerplate text or a shared stock photo, and is cut to keep the pass bounded
+        if len(members) > MAX_BUCKET_SIZE:
+            oversized += 1
+            members = members[:MAX_BUCKET_SIZE]
+        for i in range(1, len(members)):
+            b = members[i]
+            for a in members[:i]:
+                if clusters.find(a) != clusters.find(b) and _is_duplicate(a, b, signatures, images, threshold, listings):
+                    clusters.union(a, b)
+    if oversized:
+        print(f"⚠ {oversized} dedup buckets had more than {MAX_BUCKET_SIZE} listings; only their first "
+              f"{MAX_BUCKET_SIZE} were compared")
+
+    groups = defaultdict(list)
+    for i in range(len(ids)):
+        groups[clusters.find(i)].append(i)
+
+    canonical = {}
+    duplicate_clusters = {}
+    for members in groups.values():
+        leader = ids[max(members, key=lambda i: _canonical_rank(listings[i]))]
+        for i in members:
+            canonical[ids[i]] = leader
+        if len(members) > 1:
+            duplicate_clusters[leader] = sorted(ids[i] for i in members)
+    return canonical, duplicate_clusters
+
+
+def _buckets(band_keys, image_buckets):
+    """Every LSH band bucket and image chunk bucket with more than one member, one band at a time."""
+    for keys in band_keys:
+        yield from _shared_keys(keys)
+    for members in image_buckets.values():
+        if len(members) > 1:
+            yield members
+
+
+def _shared_keys(keys):
+    """Yield the positions sharing each key that occurs more than once, in ascending order."""
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    members = []
+    for i in order:
+        if members and keys[members[0]] != keys[i]:
+            if len(members) > 1:
+                yield members
+            members = []
+        members.append(i)
+    if len(members) > 1:
+        yield members
+
+
+def _leading_number(value):
+    # "3 BHK" -> 3; only the first number counts, so "2.5 BHK" is 2 rather than 25
+    match = re.match(r"\s*(\d+)", str(value or ""))
+    return int(match.group(1)) if match else None
+
+
+def _compatible(prop_a, prop_b):
+    """Listings with different BHK or clearly different prices are never the same flat."""
+    bhk_a, bhk_b = _leading_number(prop_a.get("bhk")), _leading_number(prop_b.get("bhk"))
+    if bhk_a and bhk_b and bhk_a != bhk_b:
+        return False
+    # Compared in rupees: "1.2 Cr" and "120 Lac" are the same price
+    price_a, price_b = parse_price(prop_a.get("price")), parse_price(prop_b.get("price"))
+    if price_a and price_b and abs(price_a - price_b) > PRICE_TOLERANCE * max(price_a, price_b):
+        return False
+    return True
+
+
+def _is_duplicate(a, b, signatures, images, threshold, listings):
+    if not _compatible(listings[a], listings[b]):
+        return False
+    sig_a = signatures[a * NUM_PERM:(a + 1) * NUM_PERM]
+    sig_b = signatures[b * NUM_PERM:(b + 1) * NUM_PERM]
+    if estimated_similarity(sig_a, sig_b) >= threshold:
+        return True
+    return any(hamming(x, y) <= IMAGE_DISTANCE for x in images.get(a, []) for y in images.get(b, []))
+
+
+def _canonical_rank(prop):
+    """Prefer the richest listing: most images, then a known price, then the most recent scrape."""
+    image_count = prop.get("image_count")
+    if image_count is None:
+        image_count = len(prop.get("images") or [])
+    return (image_count, bool(prop.get("price")), prop.get("scraped_at") or "", str(prop["id"]))
+
+
+def write_duplicates(canonical, clusters, path=DUPLICATES_FILE):
+    dump({"canonical": canonical, "clusters": clusters}, path)
+
+
+def main():
+    props = []
+    for filename in sorted(os.listdir(PROPERTIES_DIR)):
+        if not filename.endswith(".json"):
+            continue
+        try:
+            props.append(PropertySummary(load(os.path.join(PROPERTIES_DIR, filename)), filename))
+        except Exception:
+            print(f"⚠ Skipping invalid JSON: {filename}")
+
+    canonical, clusters = find_duplicates(props)
+    write_duplicates(canonical, clusters)
+    duplicates = sum(len(members) - 1 for members in clusters.values())
+    print(f"🧬 {len(props)} listings, {len(clusters)} duplicate clusters, {duplicates} duplicates")
+
+
+if __name__ == "__main__":
+    from profiling import profile_from_cli
+    profile_from_cli()
+
+    main()
@@ -0,0 +1,23 @@
+# Heavy third-party libraries, imported on first use. The backend spawns a
+# fresh Python process for every scrape and discussion search, so anything
+# imported at module level is paid on every request, including --help, bad
+# arguments, listings skipped by freshness checks and offline replays that
+# never open a browser. `python benchmark.py --imports` tracks what startup costs.
+
+
+def sync_playwright():
+    """playwright.sync_api.sync_playwright()."""
+    from playwright.sync_api import sync_playwright as start
+    return start()
+
+
+def BeautifulSoup(*args, **kwargs):
+    """bs4.BeautifulSoup(...)."""
+    from bs4 import BeautifulSoup as soup
+    return soup(*args, **kwargs)
+
+
+def http_get(url, **kwargs):
+    """requests.get(...)."""
+    import requests
+    return requests.get(url, **kwargs)
@@ -0,0 +1,88 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from image_hash import _pil, resolve_image_path
+from atomic_io import atomic_open
+
+# Use absolute paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Variant name -> max width in px. Variants are never upscaled.
+DERIVATIVE_WIDTHS = {
+    "thumb": 320,
+    "medium": 960,
+}
+WEBP_QUALITY = 75
+DERIVED_DIRNAME = "derived"  # next to the originals, so /images serves them as-is
+WORKERS = os.cpu_count() or 1
+
+
+def derivative_path(img_path, variant):
+    """scraped_data/images/<id>/a.jpg -> scraped_data/images/<id>/derived/a_<variant>.webp"""
+    folder, filename = os.path.split(img_path)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(folder, DERIVED_DIRNAME, f"{stem}_{variant}.webp")
+
+
+def _is_fresh(src, dest):
+    return os.path.exists(dest) and os.path.getmtime(dest) >= os.path.getmtime(src)
+
+
+def _render(job):
+    """Worker: decode one original once and write every missing variant."""
+    src, targets = job
+    Image = _pil()
+    try:
+        with Image.open(src) as img:
+            # Let JPEG decode at the smallest scale that still covers the widest variant
+            widest = max(width for width, _ in targets)
+            img.draft("RGB", (widest, widest * img.height // max(img.width, 1)))
+            img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+            for width, dest in targets:
+                variant = img.copy()
+                variant.thumbnail((width, width * 4))
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                # Not fsynced: a variant lost in a crash is just rendered again
+                with atomic_open(dest, durable=False) as f:
+                    variant.save(f, "WEBP", quality=WEBP_QUALITY, method=4)
+        return src, None
+    except Exception as e:
+        return src, str(e)
+
+
+def generate_derivatives(image_paths, workers=WORKERS):
+    """Make WebP variants of every image that lacks an up-to-date one.
+
+    Returns {img_path: {variant: derivative_path}} for every image whose
+    variants exist afterwards, with paths in the same form as img_path.
+    """
+    if _pil() is None:
+        return {}
+
+    pending = []
+    for img_path in dict.fromkeys(image_paths):
+        src = resolve_image_path(img_path)
+        if not os.path.exists(src):
+            continue
+        targets = [
+            (width, resolve_image_path(derivative_path(img_path, variant)))
+            for variant, width in DERIVATIVE_WIDTHS.items()
+        ]
+        stale = [(width, dest) for width, dest in targets if not _is_fresh(src, dest)]
+        if stale:
+            pending.append((src, stale))
+
+    if pending:
+        print(f"🖼  Generating derivatives for {len(pending)} images")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for src, error in pool.map(_render, pending, chunksize=8):
+                if error:
+                    print(f"⚠ Could not resize {src}: {error}")
+
+    variants = {}
+    for img_path in image_paths:
+        paths = {variant: derivative_path(img_path, variant) for variant in DERIVATIVE_WIDTHS}
+        if all(os.path.exists(resolve_image_path(p)) for p in paths.values()):
+            variants[img_path] = paths
+    return variants
+
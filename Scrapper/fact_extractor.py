@@ -0,0 +1,152 @@
+import re
+from functools import lru_cache
+
+# Longest value we read after (or before) a keyword. Keeps the worst case
+# linear in page length no matter how the page text is shaped.
+MAX_VALUE_CHARS = 120
+
+SOCIETY_SUFFIXES = ["Apartments", "Heights", "Enclave", "Residency", "Tower", "City", "Park", "Villas"]
+
+# label -> (lowercase keyword that anchors it, how the value is read)
+FACT_RULES = {
+    "Super Area": ("super area", "area"),
+    "Carpet Area": ("carpet area", "area"),
+    "Floor": ("floor", "floor"),
+    "Transaction Type": ("transaction type", "words"),
+    "Status": ("status", "words"),
+    "Facing": ("facing", "words"),
+    "Furnishing": ("furnishing", "words"),
+    "Bathrooms": ("bath", "count"),
+    "Balcony": ("balcon", "count"),
+    "Price": ("₹", "price"),
+    "BHK": ("bhk", "count"),
+}
+
+# Labels each scraper has always looked for in page text
+ACRES_FACT_LABELS = ["Super Area", "Carpet Area", "Floor", "Transaction Type", "Status",
+                     "Facing", "Society", "Bathrooms", "Balcony"]
+MAGICBRICKS_FACT_LABELS = ACRES_FACT_LABELS + ["Furnishing"]
+
+_VALUE_PATTERNS = {
+    "area": re.compile(r"[:\s]*([\d,]+\s*sq\.?ft\.?)", re.IGNORECASE),
+    "floor": re.compile(r"[:\s]*([0-9A-Za-z\s]+)(?:(out of)|$)", re.IGNORECASE),
+    "words": re.compile(r"[:\s]*([A-Za-z\s]+)", re.IGNORECASE),
+    "price": re.compile(r"\s*([\d,]+\s*(?:Cr|Lac|Lakh|Crore)?)", re.IGNORECASE),
+}
+_COUNT_BEFORE = re.compile(r"(\d+)\s*$")
+_RUN_BEFORE = re.compile(r"[A-Za-z0-9\s]*$")
+_RUN_AFTER = re.compile(r"[A-Za-z0-9\s]*")
+_SOCIETY_PATTERN = re.compile(
+    r"(?:in|at)\s+([A-Za-z0-9\s]+(?:" + "|".join(SOCIETY_SUFFIXES) + r"))", re.IGNORECASE
+)
+
+
+def _lowered(text):
+    """Lowercase text for keyword lookup while keeping offsets aligned with the original."""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A few characters lowercase to more than one character; leave those as they are
+        lowered = "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+    return lowered
+
+
+def _read_forward(text, kind, end):
+    """Read the value that follows a keyword ending at `end`."""
+    limit = min(len(text), end + MAX_VALUE_CHARS)
+    match = _VALUE_PATTERNS[kind].match(text, end, limit)
+    if not match:
+        return None
+    # `$` also matches at the window edge; only accept it at the real end of the text
+    if kind == "floor" and match.group(2) is None and match.end() != len(text):
+        return None
+    return match.group(1).strip()
+
+
+def _read_count(text, start):
+    """Read the number written just before a keyword starting at `start`."""
+    match = _COUNT_BEFORE.search(text, max(0, start - 20), start)
+    return match.group(1) if match else None
+
+
+def _read_society(text, start, end):
+    """Read "in/at <name> <suffix>" around a society suffix found at start:end."""
+    # The name can only span letters, digits and spaces, so stay inside that run
+    run_start = _RUN_BEFORE.search(text, max(0, start - MAX_VALUE_CHARS), start).start()
+    run_end = _RUN_AFTER.match(text, end, min(len(text), end + MAX_VALUE_CHARS)).end()
+    match = _SOCIETY_PATTERN.search(text, run_start, run_end)
+    return match.group(1).strip() if match else None
+
+
+@lru_cache(maxsize=None)
+def _anchors(labels):
+    """One alternation over the keywords of `labels`, and keyword -> label."""
+    by_keyword = {}
+    for label in labels:
+        if label == "Society":
+            by_keyword.update((suffix.lower(), label) for suffix in SOCIETY_SUFFIXES)
+        else:
+            by_keyword[FACT_RULES[label][0]] = label
+    pattern = "|".join(re.escape(k) for k in sorted(by_keyword, key=len, reverse=True))
+    return re.compile(pattern), by_keyword
+
+
+def _read_fact(text, label, start, end):
+    """Read the value of `label` anchored on the keyword found at start:end."""
+    if label == "Society":
+        return _read_society(text, start, end)
+    kind = FACT_RULES[label][1]
+    if kind == "count":
+        return _read_count(text, start)
+    return _read_forward(text, kind, end)
+
+
+def extract_facts(text, labels=None):
+    """Extract labelled facts (areas, floor, society, price...) from page text.
+
+    Each label is anchored on a keyword, and all keywords are found in one
+    pass over a lowercased copy of the text; a value is read from a bounded
+    window around its keyword, so no pattern ever backtracks across the whole
+    page. Returns a dict of label -> value for the first occurrence of each
+    label that yields a value.
+    """
+    labels = tuple(labels or list(FACT_RULES) + ["Society"])
+    pattern, by_keyword = _anchors(labels)
+    lowered = _lowered(text)
+
+    found = {}
+    pending = set(labels)
+    match = pattern.search(lowered)
+    while match and pending:
+        label = by_keyword[match.group()]
+        if label in pending:
+            value = _read_fact(text, label, match.start(), match.end())
+            if value:
+                found[label] = value
+                pending.discard(label)
+        # Keywords overlap ("villas super area"), so resume one character in
+        match = pattern.search(lowered, match.start() + 1)
+    return {label: found[label] for label in labels if label in found}
+
+
+if __name__ == "__main__":
+    from profiling import profile_from_cli
+    profile_from_cli()
+
+    import os
+    import sys
+    import time
+
+    corpus_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "page_text")
+    paths = sys.argv[1:] or sorted(
+        os.path.join(corpus_dir, f) for f in os.listdir(corpus_dir) if f.endswith(".txt")
+    )
+
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            page_text = f.read()
+        started = time.perf_counter()
+        facts = extract_facts(page_text)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"📄 {os.path.basename(path)} ({len(page_text)} chars, {elapsed:.2f} ms)")
+        for key, value in facts.items():
+            print(f"   {key}: {value}")
@@ -0,0 +1,164 @@
+import os
+import json
+import atexit
+import hashlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows: runs are not locked against each other
+    fcntl = None
+
+from serialization import dump, load
+
+# Use absolute paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "scraped_data")
+STATE_FILE = os.path.join(DATA_DIR, "crawl_state.json")
+LOCK_FILE = STATE_FILE + ".lock"
+
+# A listing is re-checked after `interval`; the interval doubles every time it comes
+# back unchanged and resets when it changes, so stable listings are visited rarely.
+MIN_INTERVAL = timedelta(days=1)
+MAX_INTERVAL = timedelta(days=14)
+
+# A run reads crawl_state.json once and keeps its checks in memory; they are
+# merged into the file under a lock every FLUSH_EVERY checks and at exit, so
+# scrapers running side by side (see scheduler) never lose each other's checks.
+FLUSH_EVERY = 100
+
+_state = None
+_pending = {}
+
+
+def listing_fingerprint(data):
+    """Hash of the fields that matter to users: price, title, facts and image URLs."""
+    material = {
+        "price": data.get("price"),
+        "title": data.get("property_name") or data.get("title"),
+        "facts": data.get("dynamic_facts") or {},
+        "images": sorted(data.get("image_urls") or [])
+    }
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def load_state(path=STATE_FILE):
+    if not os.path.exists(path):
+        return {}
+    try:
+        return load(path)
+    except Exception as e:
+        print(f"⚠ Could not read crawl state, starting fresh: {e}")
+        return {}
+
+
+def save_state(state, path=STATE_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    dump(state, path)
+
+
+@contextmanager
+def _locked(path=LOCK_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def _current_state():
+    # This run's view: the file as first read, plus its own checks
+    global _state
+    if _state is None:
+        _state = load_state()
+        atexit.register(flush_state)
+    return _state
+
+
+def flush_state():
+    """Merge this run's checks into crawl_state.json (others may have written since it was read)."""
+    global _pending
+    if not _pending:
+        return
+    with _locked():
+        state = load_state()
+        state.update(_pending)
+        save_state(state)
+    _pending = {}
+
+
+def _key(source, property_id):
+    return f"{source}:{property_id}"
+
+
+def is_due(source, property_id, now=None, state=None):
+    """True if the listing was never checked or its refresh interval has passed."""
+    state = _current_state() if state is None else state
+    entry = state.get(_key(source, property_id))
+    if not entry:
+        return True
+    now = now or datetime.now()
+    return now >= datetime.fromisoformat(entry["next_check_at"])
+
+
+def listing_changed(source, property_id, fingerprint, state=None):
+    """Compare a fresh fingerprint with the stored one without recording anything."""
+    state = _current_state() if state is None else state
+    entry = state.get(_key(source, property_id))
+    return not entry or entry["fingerprint"] != fingerprint
+
+
+def mark_checked(source, property_id, url, fingerprint, now=None):
+    """Record a check and schedule the next one. Returns True if the listing changed.
+
+    The check reaches crawl_state.json with the next flush_state().
+    """
+    state = _current_state()
+    key = _key(source, property_id)
+    entry = state.get(key)
+    now = now or datetime.now()
+
+    changed = not entry or entry["fingerprint"] != fingerprint
+    if changed:
+        interval = MIN_INTERVAL
+    else:
+        interval = min(MAX_INTERVAL, timedelta(seconds=entry["interval_seconds"] * 2))
+
+    state[key] = _pending[key] = {
+        "source": source,
+        "property_id": property_id,
+        "url": url,
+        "fingerprint": fingerprint,
+        "last_checked_at": now.isoformat(),
+        "last_changed_at": now.isoformat() if changed else entry["last_changed_at"],
+        "interval_seconds": int(interval.total_seconds()),
+        "next_check_at": (now + interval).isoformat()
+    }
+    if len(_pending) >= FLUSH_EVERY:
+        flush_state()
+    return changed
+
+
+def due_listings(source=None, now=None):
+    """Listings whose refresh is due, oldest first."""
+    now = now or datetime.now()
+    due = [
+        entry for entry in load_state().values()
+        if (source is None or entry["source"] == source)
+        and now >= datetime.fromisoformat(entry["next_check_at"])
+    ]
+    return sorted(due, key=lambda entry: entry["next_check_at"])
+
+
+if __name__ == "__main__":
+    from profiling import profile_from_cli
+    profile_from_cli()
+
+    import sys
+    source = sys.argv[1] if len(sys.argv) > 1 else None
+    due = due_listings(source)
+    print(f"🕐 {len(due)} listings due for refresh")
+    for entry in due:
+        print(f"   {entry['source']} {entry['property_id']} (last checked {entry['last_checked_at']})")
@@ -0,0 +1,413 @@
+import os
+import re
+import sys
+import math
+import time
+from functools import lru_cache
+from collections import defaultdict
+
+# Offline gazetteer of the localities, sectors and landmarks listings mention.
+# Coordinates are approximate centroids (within about a kilometre), which is
+# as precise as "Sector 16B" gets and plenty for radius searches of a few km.
+# Add rows as new localities show up in the scrapes; names are matched
+# case-insensitively on whole words, and a name that exists in several zones
+# (Noida and Greater Noida West both have a Sector 1) is resolved from the rest
+# of the text. Each place has a canonical locality id (zone/name slug, e.g.
+# greater-noida-west/sector-16b) that records and the index group by instead of
+# the raw spelling; misspellings are resolved with a trigram index.
+NOIDA = "Noida"
+GREATER_NOIDA = "Greater Noida"
+GREATER_NOIDA_WEST = "Greater Noida West"
+
+# (name, zone, lat, lon, aliases)
+GAZETTEER = [
+    # Greater Noida West (Noida Extension)
+    ("Sector 1", GREATER_NOIDA_WEST, 28.6000, 77.4330, []),
+    ("Sector 2", GREATER_NOIDA_WEST, 28.5960, 77.4480, []),
+    ("Sector 3", GREATER_NOIDA_WEST, 28.5920, 77.4550, []),
+    ("Sector 4", GREATER_NOIDA_WEST, 28.6080, 77.4320, ["Gaur City 1"]),
+    ("Sector 10", GREATER_NOIDA_WEST, 28.5820, 77.4420, []),
+    ("Sector 12", GREATER_NOIDA_WEST, 28.5860, 77.4340, []),
+    ("Sector 16", GREATER_NOIDA_WEST, 28.5960, 77.4360, []),
+    ("Sector 16B", GREATER_NOIDA_WEST, 28.5900, 77.4490, []),
+    ("Sector 16C", GREATER_NOIDA_WEST, 28.6060, 77.4420, ["Gaur City 2"]),
+    ("Techzone 4", GREATER_NOIDA_WEST, 28.5870, 77.4330, ["Tech Zone 4", "Techzone IV"]),
+    ("Knowledge Park 5", GREATER_NOIDA_WEST, 28.5830, 77.4550, ["Knowledge Park V"]),
+    ("Gaur Chowk", GREATER_NOIDA_WEST, 28.6050, 77.4290, ["Ek Murti Chowk", "Ek Murti", "Gaur City Chowk"]),
+    ("Char Murti Chowk", GREATER_NOIDA_WEST, 28.5950, 77.4440, ["Char Murti"]),
+    ("Gaur City Mall", GREATER_NOIDA_WEST, 28.6070, 77.4300, []),
+    # Greater Noida
+    ("Pari Chowk", GREATER_NOIDA, 28.4665, 77.5125, []),
+    ("Alpha 1", GREATER_NOIDA, 28.4720, 77.5090, ["Alpha I"]),
+    ("Alpha 2", GREATER_NOIDA, 28.4790, 77.5130, ["Alpha II"]),
+    ("Beta 1", GREATER_NOIDA, 28.4670, 77.4990, ["Beta I"]),
+    ("Beta 2", GREATER_NOIDA, 28.4560, 77.5180, ["Beta II"]),
+    ("Gamma 1", GREATER_NOIDA, 28.4550, 77.5010, ["Gamma I"]),
+    ("Gamma 2", GREATER_NOIDA, 28.4530, 77.5110, ["Gamma II"]),
+    ("Delta 1", GREATER_NOIDA, 28.4760, 77.5230, ["Delta I"]),
+    ("Delta 2", GREATER_NOIDA, 28.4810, 77.5200, ["Delta II"]),
+    ("Delta 3", GREATER_NOIDA, 28.4850, 77.5290, ["Delta III"]),
+    ("Swarn Nagri", GREATER_NOIDA, 28.4720, 77.5290, []),
+    ("Zeta 1", GREATER_NOIDA, 28.4540, 77.5300, ["Zeta I"]),
+    ("Mu", GREATER_NOIDA, 28.4420, 77.5160, ["Mu 1", "Mu 2"]),
+    ("Omicron 1", GREATER_NOIDA, 28.4370, 77.5230, ["Omicron I"]),
+    ("Eta 1", GREATER_NOIDA, 28.4400, 77.5420, ["Eta I"]),
+    ("Chi Phi", GREATER_NOIDA, 28.4450, 77.5340, ["Chi 1", "Chi 2", "Phi 1", "Phi 2"]),
+    ("Knowledge Park 1", GREATER_NOIDA, 28.4730, 77.4950, ["Knowledge Park I"]),
+    ("Knowledge Park 2", GREATER_NOIDA, 28.4590, 77.4960, ["Knowledge Park II"]),
+    ("Knowledge Park 3", GREATER_NOIDA, 28.4700, 77.4840, ["Knowledge Park III"]),
+    ("Sector 36", GREATER_NOIDA, 28.4580, 77.5310, []),
+    ("Sector 37", GREATER_NOIDA, 28.4500, 77.5290, []),
+    ("Jaypee Greens", GREATER_NOIDA, 28.4470, 77.5010, []),
+    ("India Expo Mart", GREATER_NOIDA, 28.4600, 77.4975, ["Expo Mart"]),
+    ("Sharda University", GREATER_NOIDA, 28.4730, 77.4830, []),
+    ("GNIDA Office", GREATER_NOIDA, 28.4793, 77.5323, []),
+    # Noida
+    ("Sector 1", NOIDA, 28.5890, 77.3110, []),
+    ("Sector 4", NOIDA, 28.5850, 77.3200, []),
+    ("Sector 10", NOIDA, 28.5890, 77.3300, []),
+    ("Sector 12", NOIDA, 28.5970, 77.3540, []),
+    ("Sector 15", NOIDA, 28.5850, 77.3110, []),
+    ("Sector 16", NOIDA, 28.5790, 77.3150, []),
+    ("Sector 18", NOIDA, 28.5700, 77.3230, []),
+    ("Sector 44", NOIDA, 28.5570, 77.3380, []),
+    ("Sector 50", NOIDA, 28.5720, 77.3660, []),
+    ("Sector 51", NOIDA, 28.5860, 77.3710, []),
+    ("Sector 52", NOIDA, 28.5880, 77.3600, []),
+    ("Sector 62", NOIDA, 28.6270, 77.3690, []),
+    ("Sector 63", NOIDA, 28.6250, 77.3800, []),
+    ("Sector 75", NOIDA, 28.5770, 77.3830, []),
+    ("Sector 76", NOIDA, 28.5680, 77.3840, []),
+    ("Sector 77", NOIDA, 28.5710, 77.3930, []),
+    ("Sector 78", NOIDA, 28.5630, 77.3860, []),
+    ("Sector 93", NOIDA, 28.5240, 77.3860, []),
+    ("Sector 100", NOIDA, 28.5480, 77.3730, []),
+    ("Sector 104", NOIDA, 28.5420, 77.3680, []),
+    ("Sector 107", NOIDA, 28.5390, 77.3790, []),
+    ("Sector 110", NOIDA, 28.5470, 77.3880, []),
+    ("Sector 119", NOIDA, 28.5890, 77.3970, []),
+    ("Sector 120", NOIDA, 28.5890, 77.3940, []),
+    ("Sector 121", NOIDA, 28.5960, 77.3920, []),
+    ("Sector 128", NOIDA, 28.5200, 77.3620, []),
+    ("Sector 137", NOIDA, 28.5080, 77.4100, []),
+    ("Sector 143", NOIDA, 28.4990, 77.4230, []),
+    ("Sector 150", NOIDA, 28.4350, 77.4800, []),
+    ("Sector 168", NOIDA, 28.4930, 77.4160, []),
+    ("Noida City Centre", NOIDA, 28.5747, 77.3560, ["City Centre"]),
+    ("Botanical Garden", NOIDA, 28.5640, 77.3340, []),
+    ("Film City", NOIDA, 28.5700, 77.3180, []),
+]
+
+# Spellings of the zones in listings, most specific first (matched on whole words)
+ZONE_NAMES = [
+    ("greater noida west", GREATER_NOIDA_WEST), ("greater noida w", GREATER_NOIDA_WEST),
+    ("gr noida west", GREATER_NOIDA_WEST), ("gr noida w", GREATER_NOIDA_WEST), ("gnw", GREATER_NOIDA_WEST),
+    ("noida extension", GREATER_NOIDA_WEST), ("noida extn", GREATER_NOIDA_WEST), ("noida ext", GREATER_NOIDA_WEST),
+    ("greater noida", GREATER_NOIDA), ("gr noida", GREATER_NOIDA), ("noida", NOIDA)
+]
+FUZZY_MIN_SIMILARITY = 0.6  # trigram Dice coefficient; below this a misspelling is left unresolved
+FUZZY_SHORT_MIN_SIMILARITY = 0.8  # for names with under SHORT_NAME_LETTERS letters ("Eta 2" is not "Beta 2")
+SHORT_NAME_LETTERS = 6
+FUZZY_MIN_COVERAGE = 0.7  # share of the query's trigrams a name must contain
+
+EARTH_RADIUS_KM = 6371.0
+CELL_KM = 1.0
+_REFERENCE_LAT = 28.5  # the grid's km-per-degree of longitude is taken here; every zone is within 0.2 degrees
+_KM_PER_LAT = 110.57
+_KM_PER_LON = 111.32 * math.cos(math.radians(_REFERENCE_LAT))
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text):
+    text = str(text).lower().replace("’", "'")
+    text = re.sub(r"\bsec(?:t)?\b\.?", "sector", text)
+    text = re.sub(r"(\d+)[\s-]+([a-z])\b", r"\1\2", text)  # "Sector 16 B", "16-B" -> 16b
+    return _TOKEN_PATTERN.findall(text)
+
+
+def _slug(text):
+    return "-".join(_tokens(text))
+
+
+def locality_id(name, zone):
+    """Stable id of a gazetteer place, e.g. greater-noida-west/sector-16b."""
+    return f"{_slug(zone)}/{_slug(name)}"
+
+
+def zone_of(text):
+    padded = f" {' '.join(_tokens(text))} "
+    return next((zone for alias, zone in ZONE_NAMES if f" {alias} " in padded), None)
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Fuzzy lookup of short names by shared character trigrams.
+
+    Each name's trigrams go into an inverted index, so a query only scores
+    the names it shares a trigram with. A match must also cover most of the
+    query, contain exactly its numbers ("Sector 16D" is not a misspelling of
+    "Sector 16") and have every word of the name turn up in it ("Gaur City"
+    is not "Gaur City Mall"). Short names need a closer match.
+    """
+
+    def __init__(self):
+        self.names = []  # (trigram count, numbers, min similarity, trigrams of each word, value)
+        self.postings = defaultdict(list)  # trigram -> [name position]
+
+    def add(self, tokens, value):
+        grams = _trigrams(" ".join(tokens))
+        words = [t for t in tokens if not t[0].isdigit()]
+        short = sum(len(w) for w in words) < SHORT_NAME_LETTERS
+        position = len(self.names)
+        self.names.append((
+            len(grams),
+            frozenset(t for t in tokens if t[0].isdigit()),
+            FUZZY_SHORT_MIN_SIMILARITY if short else 0.0,
+            tuple(_trigrams(w) for w in words),
+            value
+        ))
+        for gram in grams:
+            self.postings[gram].append(position)
+
+    def best(self, tokens, accept=None, min_similarity=FUZZY_MIN_SIMILARITY):
+        """(value, similarity) of the closest name that accept(value) allows, or None."""
+        grams = _trigrams(" ".join(tokens))
+        numbers = frozenset(t for t in tokens if t[0].isdigit())
+        shared = defaultdict(int)
+        for gram in grams:
+            for position in self.postings.get(gram, ()):
+                shared[position] += 1
+        best = None
+        for position, count in shared.items():
+            size, name_numbers, name_min_similarity, word_grams, value = self.names[position]
+            similarity = 2 * count / (size + len(grams))
+            if similarity < max(min_similarity, name_min_similarity) or count < FUZZY_MIN_COVERAGE * len(grams):
+                continue
+            if name_numbers != numbers or any(not (word & grams) for word in word_grams):
+                continue
+            if accept and not accept(value):
+                continue
+            if best is None or similarity > best[1]:
+                best = (value, similarity)
+        return best
+
+
+class Gazetteer:
+    """Finds GAZETTEER places in free text (locality, address, title)."""
+
+    def __init__(self, rows=GAZETTEER):
+        self.places = []  # (name, zone, lat, lon, locality id)
+        self.names = defaultdict(list)  # first token -> [(tokens, place position)]
+        self.fuzzy = TrigramIndex()
+        self.zones = {zone: (zone, zone, None, None, _slug(zone)) for _, zone in ZONE_NAMES}
+        for name, zone, lat, lon, aliases in rows:
+            position = len(self.places)
+            self.places.append((name, zone, lat, lon, locality_id(name, zone)))
+            for alias in [name] + aliases:
+                tokens = tuple(_tokens(alias))
+                self.names[tokens[0]].append((tokens, position))
+                self.fuzzy.add(tokens, position)
+        for candidates in self.names.values():
+            candidates.sort(key=lambda candidate: -len(candidate[0]))  # longest name wins
+        self.by_id = {place[4]: place for place in self.places + list(self.zones.values())}
+
+    def matches(self, text):
+        """Names (as token tuples) of the places mentioned in text, left to right."""
+        tokens = _tokens(text)
+        found = []
+        i = 0
+        while i < len(tokens):
+            for name, _ in self.names.get(tokens[i], ()):
+                if tuple(tokens[i:i + len(name)]) == name:
+                    found.append(name)
+                    i += len(name)
+                    break
+            else:
+                i += 1
+        return found
+
+    def locate(self, *texts):
+        """(name, zone, lat, lon, locality id) of the first place the texts name, most specific text first.
+
+        When the texts mention a zone, only places in that zone count ("Sector
+        62, Greater Noida West" is not Noida's Sector 62); when they don't, a
+        name shared by several zones is skipped. When no text
+        names a place exactly, the first text is matched fuzzily (see
+        resolve), so "Sectr 16B, Gr Noida W" still finds Sector 16B. Text
+        that only names a zone ("Noida Extension") gets the zone itself, with
+        no coordinates: a zone is too big to be a point in radius searches.
+        """
+        zone = zone_of(" ".join(str(t) for t in texts if t))
+        place = self._exact(texts, zone)
+        if place is None and texts and texts[0]:
+            place = self.resolve(str(texts[0]), zone)
+        if place is None and zone is not None:
+            place = self.zones[zone]
+        return place
+
+    def _exact(self, texts, zone):
+        for text in texts:
+            if not text:
+                continue
+            for name in self.matches(text):
+                positions = [p for candidate, p in self.names[name[0]] if candidate == name]
+                if zone is not None:
+                    positions = [p for p in positions if self.places[p][1] == zone]
+                if len(positions) == 1:
+                    return self.places[positions[0]]
+        return None
+
+    def resolve(self, text, zone=None):
+        """Fuzzy match of a raw locality string, with the zone words stripped off."""
+        return _resolve(self, text, zone)
+
+
+@lru_cache(maxsize=65536)
+def _resolve(gazetteer, text, zone):
+    # Raw locality strings repeat across thousands of listings, so each spelling is matched once
+    tokens = [t for t in _tokens(text) if t not in _ZONE_WORDS]
+    if not tokens:
+        return None
+    match = gazetteer.fuzzy.best(tokens, accept=lambda p: zone is None or gazetteer.places[p][1] == zone)
+    if match is None:
+        return None
+    positions = {p for p, place in enumerate(gazetteer.places) if place[0] == gazetteer.places[match[0]][0]}
+    # Like exact matches, a name in several zones needs the zone to decide
+    return gazetteer.places[match[0]] if zone is not None or len(positions) == 1 else None
+
+
+_ZONE_WORDS = {word for alias, _ in ZONE_NAMES for word in alias.split()} | {"west", "extension"}
+_gazetteer = None
+
+
+def gazetteer():
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer()
+    return _gazetteer
+
+
+def locate(*texts):
+    return gazetteer().locate(*texts)
+
+
+def place_for_id(locality_id):
+    """The (name, zone, lat, lon, locality id) of a canonical locality id, or None."""
+    return gazetteer().by_id.get(locality_id)
+
+
+def canonical_locality(*texts):
+    """Locality id for raw locality/address/title text, or None if no gazetteer place matches."""
+    place = locate(*texts)
+    return place[4] if place else None
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = math.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _cell(lat, lon, cell_km):
+    return (math.floor(lon * _KM_PER_LON / cell_km), math.floor(lat * _KM_PER_LAT / cell_km))
+
+
+class GridIndex:
+    """Uniform grid over (lat, lon) points for radius queries.
+
+    Listings are located at gazetteer centroids, so many share a point: the
+    grid holds each distinct point once with the positions (index rows,
+    listing ids...) located there, and a query measures one distance per
+    point rather than per listing.
+    """
+
+    def __init__(self, cell_km=CELL_KM):
+        self.cell_km = cell_km
+        self.points = {}  # (lat, lon) -> [positions]
+        self.cells = defaultdict(list)  # cell -> [(lat, lon)]
+
+    def add(self, position, lat, lon):
+        point = (lat, lon)
+        positions = self.points.get(point)
+        if positions is None:
+            positions = self.points[point] = []
+            self.cells[_cell(lat, lon, self.cell_km)].append(point)
+        positions.append(position)
+
+    def within(self, lat, lon, km):
+        """[(distance_km, position)] of everything within km of (lat, lon), nearest first."""
+        cx, cy = _cell(lat, lon, self.cell_km)
+        reach = math.ceil(km / self.cell_km)
+        found = []
+        for x in range(cx - reach, cx + reach + 1):
+            for y in range(cy - reach, cy + reach + 1):
+                for point in self.cells.get((x, y), ()):
+                    distance = distance_km(lat, lon, *point)
+                    if distance <= km:
+                        found.extend((distance, position) for position in self.points[point])
+        found.sort()
+        return found
+
+    def __len__(self):
+        return sum(len(positions) for positions in self.points.values())
+
+
+def grid_from_index(index, cell_km=CELL_KM):
+    """GridIndex over the rows of scraped_data/index.json (see indexer) that have coordinates."""
+    lat_column, lon_column = index["fields"].index("lat"), index["fields"].index("lon")
+    grid = GridIndex(cell_km)
+    for position, row in enumerate(index["rows"]):
+        if row[lat_column] is not None and row[lon_column] is not None:
+            grid.add(position, row[lat_column], row[lon_column])
+    return grid
+
+
+def nearby(index, grid, place, km=3.0):
+    """Index rows (as dicts, with distance_km) within km of a gazetteer place or a "lat,lon" pair."""
+    match = re.match(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$", place)
+    if match:
+        lat, lon = float(match.group(1)), float(match.group(2))
+    else:
+        located = locate(place)
+        if located is None or located[2] is None:
+            raise ValueError(f"Unknown place: {place}")
+        lat, lon = located[2], located[3]
+    results = []
+    for distance, position in grid.within(lat, lon, km):
+        row = dict(zip(index["fields"], index["rows"][position]))
+        row["distance_km"] = round(distance, 2)
+        results.append(row)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    from indexer import DATA_DIR, load_index
+    from profiling import profile_from_cli
+    profile_from_cli()
+
+    parser = argparse.ArgumentParser(description="Listings within a radius of a locality, sector or landmark")
+    parser.add_argument("place", help='Gazetteer name ("Pari Chowk", "Sector 16B Greater Noida West") or "lat,lon"')
+    parser.add_argument("--km", type=float, default=3.0)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    index = load_index(os.path.join(DATA_DIR, "index.json"))
+    if index is None:
+        sys.exit("No current scraped_data/index.json, run indexer.py first")
+    grid = grid_from_index(index)
+    start = time.perf_counter()
+    try:
+        results = nearby(index, grid, args.place, args.km)
+    except ValueError as e:
+        sys.exit(str(e))
+    elapsed = (time.perf_counter() - start) * 1000
+    for row in results[:args.limit]:
+        print(f"{row['distance_km']:5.2f} km  {row['locality'] or '-':<20} {row['title']}")
+    print(f"📍 {len(results)} of {len(grid)} located listings within {args.km:g} km ({elapsed:.1f} ms)")
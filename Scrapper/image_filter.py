@@ -0,0 +1,183 @@
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from image_hash import _pil, image_info, hamming
+from serialization import dump, load
+
+# Use absolute paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "scraped_data")
+CACHE_FILE = os.path.join(DATA_DIR, "image_cache.json")
+
+# Page furniture the scrapers sometimes pick up, recognisable by file name alone
+NAME_BLOCKLIST = [
+    "logo", "icon", "blueheart", "shortlist", "videocam", "mute",
+    "fullscreen", "time2", "landmarkgroup", "nearme", "voicesearch",
+    "projectnoimage", "loader", "spinner", "arrow", "star", "rating",
+    "whatsapp", "facebook", "twitter", "share", "email", "call",
+    "dealer", "request-photo", "img_not_avail"
+]
+
+MIN_SIDE = 200  # px; anything smaller is a badge or icon, not a photo of the flat
+MAX_ASPECT = 3.0  # wider (or taller) than 3:1 is a banner
+NEAR_DUPLICATE_DISTANCE = 3  # dHash bits; closer shots of one listing are the same photo
+# A picture on listings of several different flats is a logo or "no photo" tile. Listings
+# are grouped by duplicate cluster first (see dedup): a flat reposted by three brokers, or
+# on both portals, shares real photos. Shared pictures are only dropped if they also look
+# like graphics (a small file, or a dHash with almost no edges), unless they turn up
+# across many flats.
+PLACEHOLDER_MIN_LISTINGS = 3
+PLACEHOLDER_ALWAYS_LISTINGS = 10
+GRAPHIC_MAX_BYTES = 15360
+GRAPHIC_MAX_EDGE_BITS = 4  # dHash bits set (or clear) in a flat tile with text on it
+FALLBACK_MIN_BYTES = 10240  # size cutoff used only when Pillow isn't installed
+WORKERS = min(8, os.cpu_count() or 1)
+
+
+def photo_sized(width, height):
+    return min(width, height) >= MIN_SIDE and max(width, height) <= MAX_ASPECT * min(width, height)
+
+
+class ImageCache:
+    """Image facts keyed by path, valid while the file keeps its size and mtime.
+
+    A run only stats the images it has seen before; new or rewritten files
+    are the only ones opened.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self.entries = {}  # path -> [size, mtime_ns, info]
+        self.dirty = False
+        if os.path.exists(path):
+            try:
+                data = load(path)
+                if isinstance(data, dict) and data.get("version") == self.VERSION:
+                    self.entries = data["entries"]
+            except Exception as e:
+                print(f"⚠ Could not read image cache, starting fresh: {e}")
+
+    def get(self, full_path, stat):
+        entry = self.entries.get(full_path)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+        return None
+
+    def put(self, full_path, stat, info):
+        self.entries[full_path] = [stat.st_size, stat.st_mtime_ns, info]
+        self.dirty = True
+
+    def save(self, prune=False):
+        """Write the cache if it changed; prune=True also drops images that no longer exist."""
+        if prune:
+            gone = [path for path in self.entries if not os.path.exists(path)]
+            for path in gone:
+                del self.entries[path]
+            self.dirty = self.dirty or bool(gone)
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        dump({"version": self.VERSION, "entries": self.entries}, self.path, compact=True)
+        self.dirty = False
+
+
+def analyze_images(full_paths, cache=None, workers=WORKERS, prune=False):
+    """Map each absolute image path to {width, height, dhash, bytes}, or None if unreadable.
+
+    Images that fail the size check are classified from their header alone and
+    never decoded. Files are processed in parallel; results are cached by
+    path, size and mtime (see ImageCache). Pass prune=True when full_paths
+    covers every stored image, so entries of deleted images are dropped.
+    """
+    if _pil() is None:
+        return {}
+    cache = cache or ImageCache()
+
+    def analyze(full_path):
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return full_path, None
+        info = cache.get(full_path, stat)
+        if info is None:
+            info = image_info(full_path, with_hash=photo_sized)
+            if info is not None:
+                info["bytes"] = stat.st_size
+                cache.put(full_path, stat, info)
+        return full_path, info
+
+    unique_paths = list(dict.fromkeys(full_paths))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        infos = dict(pool.map(analyze, unique_paths))
+    cache.save(prune)
+    return infos
+
+
+def listing_group(prop_id, canonical=None):
+    """Key under which reposts of one flat count as a single listing for placeholder detection.
+
+    That is the listing's duplicate cluster from the last dedup run (canonical
+    maps ids to canonical ids, see indexer.load_canonical_ids); listings not
+    clustered yet are their own group.
+    """
+    prop_id = str(prop_id)
+    return (canonical or {}).get(prop_id, prop_id)
+
+
+def looks_like_graphic(info):
+    edges = bin(info["dhash"]).count("1")
+    return (info.get("bytes") or 0) < GRAPHIC_MAX_BYTES or min(edges, 64 - edges) <= GRAPHIC_MAX_EDGE_BITS
+
+
+def placeholder_hashes(paths_by_listing, infos, groups=None):
+    """dHashes of logos and "no photo" tiles shared across listings of different flats.
+
+    groups maps a listing to its listing_group(); listings in one group count
+    once. A hash is a placeholder when it appears in PLACEHOLDER_MIN_LISTINGS
+    groups and looks like a graphic, or in PLACEHOLDER_ALWAYS_LISTINGS groups.
+    """
+    groups = groups or {}
+    owners = defaultdict(set)
+    sample = {}
+    for listing, paths in paths_by_listing.items():
+        for path in paths:
+            info = infos.get(path)
+            if info and info["dhash"] is not None:
+                owners[info["dhash"]].add(groups.get(listing, listing))
+                sample[info["dhash"]] = info
+    return {
+        h for h, seen in owners.items()
+        if len(seen) >= PLACEHOLDER_ALWAYS_LISTINGS
+        or (len(seen) >= PLACEHOLDER_MIN_LISTINGS and looks_like_graphic(sample[h]))
+    }
+
+
+def select_photos(full_paths, infos, placeholders=frozenset()):
+    """Keep real, distinct photos of the flat, in their original order."""
+    pil_available = _pil() is not None
+    kept = []
+    kept_hashes = []
+    for full_path in full_paths:
+        filename = os.path.basename(full_path).lower()
+        if any(x in filename for x in NAME_BLOCKLIST):
+            continue
+
+        if not pil_available:
+            if os.path.getsize(full_path) >= FALLBACK_MIN_BYTES:
+                kept.append(full_path)
+            continue
+
+        info = infos.get(full_path)
+        if not info or not photo_sized(info["width"], info["height"]):
+            continue
+        h = info["dhash"]
+        if h in placeholders:
+            continue
+        if any(hamming(h, other) <= NEAR_DUPLICATE_DISTANCE for other in kept_hashes):
+            continue
+        kept.append(full_path)
+        kept_hashes.append(h)
+    return kept
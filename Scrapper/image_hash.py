@@ -0,0 +1,75 @@
+import os
+
+# Use absolute paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_pil_image = None
+_pil_checked = False
+
+
+def _pil():
+    """Pillow's Image module, or None if Pillow isn't installed.
+
+    Warns once; hashing, placeholder filtering and WebP variants are then skipped.
+    """
+    global _pil_image, _pil_checked
+    if not _pil_checked:
+        _pil_checked = True
+        try:
+            from PIL import Image
+            _pil_image = Image
+        except ImportError:
+            print("⚠ Pillow not installed (pip install -r requirements.txt): image hashes, "
+                  "placeholder filtering and WebP variants are disabled")
+    return _pil_image
+
+
+def resolve_image_path(img_path):
+    """Image paths in property JSON are relative to the Scrapper directory."""
+    return img_path if os.path.isabs(img_path) else os.path.join(BASE_DIR, img_path)
+
+
+def _dhash_of(img, size):
+    # draft() lets JPEG decode at reduced scale, which is most of the cost
+    img.draft("L", (size * 4, size * 4))
+    pixels = list(img.convert("L").resize((size + 1, size)).getdata())
+
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def image_info(img_path, with_hash=None, size=8):
+    """Width, height and dHash of an image, or None if it can't be read.
+
+    Dimensions come from the file header alone; the pixels are only decoded
+    when with_hash(width, height) is true (always, if with_hash is None).
+    """
+    Image = _pil()
+    if Image is None:
+        return None
+    try:
+        with Image.open(resolve_image_path(img_path)) as img:
+            width, height = img.size
+            wanted = with_hash is None or with_hash(width, height)
+            return {
+                "width": width,
+                "height": height,
+                "dhash": _dhash_of(img, size) if wanted else None
+            }
+    except Exception:
+        return None
+
+
+def dhash(img_path, size=8):
+    """64-bit difference hash of an image, or None if it can't be read."""
+    info = image_info(img_path, size=size)
+    return info["dhash"] if info else None
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
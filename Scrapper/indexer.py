@@ -1,87 +1,319 @@
 import os
-import json
-import glob
-
-def index_files():
-    base_dir = "scraped_data"
-    index_file = os.path.join(base_dir, "index.json")
-    properties_index_file = os.path.join(base_dir, "properties_index.json")
-    
-    # Files to ignore (index files themselves)
-    ignore_files = {"index.json", "properties_index.json"}
-    
-    indexed_data = []
-    
-    # Load existing properties index for lookup (99Acers metadata)
-    properties_lookup = {}
-    if os.path.exists(properties_index_file):
+import re
+import sys
+from datetime import datetime
+
+from property_schema import NON_PROPERTY_FILES, source_for_id
+from records import intern_text
+from geo import canonical_locality, locate
+from amenities import amenity_mask, mask_array, mask_for, positions_with
+from serialization import dumps_bytes, load
+from atomic_io import atomic_open
+
+# Use absolute paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "scraped_data")
+
+# scraped_data/index.json is the one index of the corpus, for raw scrapes
+# (scraped_data/*.json, properties/ before the organizer has run) and
+# normalized records alike. The organizer refreshes it after every run and
+# `python indexer.py` rebuilds it on its own; both only re-read files whose
+# size or mtime changed since the last build. Bump INDEX_VERSION whenever
+# INDEX_FIELDS or the layout changes, which forces a full rebuild.
+INDEX_VERSION = 4
+INDEX_FIELDS = [
+    "id", "source", "title", "type", "bhk", "locality", "locality_id", "city", "address", "lat", "lon", "url",
+    "amenity_mask", "image_count", "scraped_at", "schema_version", "canonical_id", "file_path", "mtime_ns", "size"
+]
+# by_locality is keyed by canonical locality id (see geo), or by the lowercased
+# raw locality for listings the gazetteer can't place
+LOOKUPS = {"by_source": "source", "by_locality": "locality", "by_bhk": "bhk"}
+
+# Top-level keys an index row is built from; the rest of a record is never needed
+RECORD_FIELDS = {
+    "schema_version", "id", "property_id", "source", "title", "property_name", "type", "bhk",
+    "location", "locality", "address", "url", "link", "images", "local_images", "scraped_at",
+    "features", "amenity_mask"
+}
+STREAM_MIN_BYTES = 256 * 1024  # bigger files are parsed with ijson (when installed), skipping unused fields
+
+_COLUMN = {name: i for i, name in enumerate(INDEX_FIELDS)}
+_ijson = None
+_masks_cache = None
+
+
+def _ijson_module():
+    global _ijson
+    if _ijson is None:
         try:
-            with open(properties_index_file, "r", encoding="utf-8") as f:
-                p_index = json.load(f)
-                for item in p_index:
-                    properties_lookup[item.get("property_id")] = item
-        except Exception as e:
-            print(f"Warning: Could not read properties_index.json: {e}")
-
-    # Pattern 1: 99Acers files in scraped_data root
-    files_99acers = glob.glob(os.path.join(base_dir, "*.json"))
-    
-    # Pattern 2: MagicBricks files in scraped_data/properties
-    files_magicbricks = glob.glob(os.path.join(base_dir, "properties", "*.json"))
-    
-    print(f"Found {len(files_99acers)} 99Acers files and {len(files_magicbricks)} MagicBricks files.")
-    
-    # Process 99Acers files
-    for file_path in files_99acers:
-        filename = os.path.basename(file_path)
-        if filename in ignore_files:
+            import ijson
+            _ijson = ijson
+        except ImportError:
+            _ijson = False
+    return _ijson or None
+
+
+def read_fields(path, size=None):
+    """The RECORD_FIELDS of a property file, streamed for big files so the rest is never built."""
+    ijson = _ijson_module()
+    if ijson is None or (size if size is not None else os.path.getsize(path)) < STREAM_MIN_BYTES:
+        data = load(path)
+        return {k: data[k] for k in RECORD_FIELDS if k in data} if isinstance(data, dict) else {}
+
+    fields = {}
+    key, builder = None, None
+    with open(path, "rb") as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == "" and event in ("map_key", "end_map"):
+                # Back at the top level: the previous wanted value (if any) is complete
+                if key is not None:
+                    fields[key] = builder.value
+                key, builder = None, None
+                if event == "map_key" and value in RECORD_FIELDS:
+                    key, builder = value, ijson.ObjectBuilder()
+            elif builder is not None:
+                builder.event(event, value)
+    return fields
+
+
+def _lookup_key(field, value, locality_id=None):
+    if value is None or value == "":
+        return None
+    if field == "bhk":
+        match = re.match(r"\s*(\d+)", str(value))
+        return match.group(1) if match else None
+    if field == "locality":
+        return locality_id or str(value).strip().lower() or None
+    return str(value)
+
+
+def row_from_record(fields, file_path, stat, urls=None):
+    """Index row for a raw or normalized record, given its RECORD_FIELDS."""
+    location = fields.get("location") if isinstance(fields.get("location"), dict) else {}
+    prop_id = fields.get("id") or fields.get("property_id")
+    title = fields.get("title") or fields.get("property_name")
+    locality = location.get("locality") or fields.get("locality")
+    address = location.get("address") or fields.get("address")
+    if "schema_version" in fields:
+        images = fields.get("images")
+        place = (None, None, location.get("lat"), location.get("lon"), location.get("locality_id"))
+        mask = fields.get("amenity_mask") or 0
+    else:
+        # Raw scrapes are placed the way normalize_property will place them
+        images = fields.get("local_images")
+        place = locate(locality, address, title) or (None,) * 5
+        mask = amenity_mask(fields.get("features"))
+    url, saved_at = (urls or {}).get(prop_id, (None, None))
+    return [
+        prop_id,
+        intern_text(fields.get("source") or source_for_id(prop_id)),
+        title,
+        intern_text(fields.get("type")),
+        intern_text(fields.get("bhk")),
+        intern_text(locality),
+        intern_text(place[4]),
+        intern_text(location.get("city")),
+        address,
+        place[2],
+        place[3],
+        fields.get("url") or fields.get("link") or url,
+        mask,
+        len(images) if isinstance(images, list) else 0,
+        fields.get("scraped_at") or saved_at,
+        fields.get("schema_version"),  # None until the organizer has normalized the record
+        None,
+        file_path,
+        stat.st_mtime_ns,
+        stat.st_size
+    ]
+
+
+def row_from_summary(summary, schema_version, file_path, stat):
+    """Index row for a record the organizer already holds as a PropertySummary."""
+    return [
+        summary.id, summary.source, summary.title, summary.type, summary.bhk, summary.locality,
+        summary.locality_id, summary.city, summary.address, summary.lat, summary.lon, summary.url,
+        summary.amenity_mask, summary.image_count, summary.scraped_at, schema_version, None, file_path, stat.st_mtime_ns, stat.st_size
+    ]
+
+
+def load_index(path=None):
+    """The current index, or None if it is missing, unreadable or from another INDEX_VERSION."""
+    path = path or os.path.join(DATA_DIR, "index.json")
+    try:
+        index = load(path)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index, dict) or index.get("version") != INDEX_VERSION or index.get("fields") != INDEX_FIELDS:
+        return None
+    return index
+
+
+def _amenity_masks(index):
+    # One uint64 array per loaded index, reused by every amenity query
+    global _masks_cache
+    if _masks_cache is None or _masks_cache[0] is not index:
+        _masks_cache = (index, mask_array(row[_COLUMN["amenity_mask"]] for row in index["rows"]))
+    return _masks_cache[1]
+
+
+def find(index, amenities=None, **filters):
+    """Rows matching every filter, e.g. find(index, source="99Acers", locality="Sec 16B, Noida Extension", bhk=3).
+
+    A locality is canonicalized like the listings were, so any spelling the
+    gazetteer resolves finds the same rows. amenities=["gym", "pool"] keeps
+    rows that have all of them (see amenities.mask_for).
+    """
+    positions = None
+    if amenities:
+        positions = set(positions_with(_amenity_masks(index), mask_for(*amenities)))
+    for field, value in filters.items():
+        key = _lookup_key(field, value, canonical_locality(value) if field == "locality" else None)
+        matches = set(index[f"by_{field}"].get(key, []))
+        positions = matches if positions is None else positions & matches
+    rows = index["rows"] if positions is None else [index["rows"][i] for i in sorted(positions)]
+    return [dict(zip(INDEX_FIELDS, row)) for row in rows]
+
+
+def _property_files(data_dir):
+    # Raw 99acres scrapes sit in scraped_data/ itself; properties/ holds raw
+    # MagicBricks scrapes and every normalized record
+    for folder in (data_dir, os.path.join(data_dir, "properties")):
+        if not os.path.isdir(folder):
             continue
-            
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            prop_id = data.get("property_id")
-            
-            # Look up in properties_index.json
-            lookup = properties_lookup.get(prop_id, {})
-            url = lookup.get("url")
-            
-            entry = {
-                "property_id": prop_id,
-                "property_name": data.get("property_name"),
-                "url": url,
-                "file_path": file_path,
-                "scraped_at": data.get("scraped_at") or lookup.get("saved_at"),
-                "source": "99Acers"
-            }
-            indexed_data.append(entry)
-        except Exception as e:
-            print(f"Error processing {file_path}: {e}")
-
-    # Process MagicBricks files
-    for file_path in files_magicbricks:
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            entry = {
-                "property_id": data.get("property_id"),
-                "property_name": data.get("property_name"),
-                "url": data.get("link"),
-                "file_path": file_path,
-                "scraped_at": data.get("scraped_at"),
-                "source": "MagicBricks"
-            }
-            indexed_data.append(entry)
-        except Exception as e:
-            print(f"Error processing {file_path}: {e}")
-
-    # Write the index
-    with open(index_file, "w", encoding="utf-8") as f:
-        json.dump(indexed_data, f, ensure_ascii=False, indent=4)
-        
-    print(f"Successfully indexed {len(indexed_data)} properties to {index_file}")
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.name not in NON_PROPERTY_FILES and entry.is_file():
+                    yield entry
+
+
+def _urls_mtime(data_dir):
+    try:
+        return os.stat(os.path.join(data_dir, "properties_index.json")).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _url_lookup(data_dir):
+    # 99acres saves listing URLs in properties_index.json rather than in the raw record
+    path = os.path.join(data_dir, "properties_index.json")
+    if not os.path.exists(path):
+        return {}
+    try:
+        return {item.get("property_id"): (item.get("url"), item.get("saved_at")) for item in load(path)}
+    except Exception as e:
+        print(f"Warning: Could not read properties_index.json: {e}")
+        return {}
+
+
+def load_canonical_ids(data_dir=DATA_DIR):
+    """listing id -> canonical listing id, from duplicates.json (see dedup)."""
+    path = os.path.join(data_dir, "duplicates.json")
+    if not os.path.exists(path):
+        return {}
+    try:
+        return load(path).get("canonical", {})
+    except Exception as e:
+        print(f"Warning: Could not read duplicates.json: {e}")
+        return {}
+
+
+def build_index(data_dir=DATA_DIR, known=None, schema_version=None, canonical=None, full=False):
+    """Scan the corpus once and write scraped_data/index.json.
+
+    known maps file names in properties/ to PropertySummary objects the
+    caller already has (the organizer), which are indexed without reading
+    the file. Other files are only read when new or changed since the last
+    build, unless full=True. canonical ids come from `canonical` or
+    duplicates.json. Returns the index that was written.
+    """
+    index_path = os.path.join(data_dir, "index.json")
+    properties_dir = os.path.join(data_dir, "properties")
+    relative_to = os.path.dirname(os.path.abspath(data_dir))
+    urls_mtime = _urls_mtime(data_dir)
+    previous = None if full else load_index(index_path)
+    reusable = {}
+    if previous:
+        # Raw 99acres rows take their url from properties_index.json, so they go stale with it
+        urls_changed = previous.get("urls_mtime_ns") != urls_mtime
+        reusable = {
+            row[_COLUMN["file_path"]]: row for row in previous["rows"]
+            if not urls_changed or row[_COLUMN["schema_version"]] is not None
+        }
+    previous = None
+    known = known or {}
+    urls = None
+    canonical = load_canonical_ids(data_dir) if canonical is None else canonical
+
+    rows = []
+    read = reused = 0
+    for entry in _property_files(data_dir):
+        stat = entry.stat()
+        file_path = os.path.relpath(entry.path, relative_to).replace(os.sep, "/")
+        summary = known.get(entry.name) if os.path.dirname(entry.path) == properties_dir else None
+        old = reusable.get(file_path)
+        if summary is not None:
+            row = row_from_summary(summary, schema_version, file_path, stat)
+        elif old is not None and old[_COLUMN["mtime_ns"]] == stat.st_mtime_ns and old[_COLUMN["size"]] == stat.st_size:
+            row = old
+            reused += 1
+        else:
+            if urls is None:
+                urls = _url_lookup(data_dir)
+            try:
+                row = row_from_record(read_fields(entry.path, stat.st_size), file_path, stat, urls)
+            except Exception as e:
+                print(f"Error processing {entry.path}: {e}")
+                continue
+            read += 1
+        prop_id = str(row[_COLUMN["id"]])
+        row[_COLUMN["canonical_id"]] = canonical.get(prop_id, row[_COLUMN["id"]])
+        rows.append(row)
+
+    # Secondary lookups hold row positions, so they are rebuilt with every write
+    lookups = {name: {} for name in LOOKUPS}
+    for position, row in enumerate(rows):
+        for name, field in LOOKUPS.items():
+            key = _lookup_key(field, row[_COLUMN[field]], row[_COLUMN["locality_id"]])
+            if key is not None:
+                lookups[name].setdefault(key, []).append(position)
+
+    index = {
+        "version": INDEX_VERSION,
+        "generated_at": datetime.now().isoformat(),
+        "count": len(rows),
+        "urls_mtime_ns": urls_mtime,
+        "fields": INDEX_FIELDS,
+        **lookups,
+        "rows": rows
+    }
+    _write_index(index, index_path)
+    print(f"📇 Indexed {len(rows)} properties ({read} read, {reused} unchanged, "
+          f"{len(rows) - read - reused} from the organizer)")
+    return index
+
+
+def _write_index(index, path):
+    # Compact, one row per line: a 200k-listing index stays small, diffs stay
+    # readable, and no single string the size of the whole index is built
+    with atomic_open(path) as f:
+        f.write(b"{")
+        for key, value in index.items():
+            if key == "rows":
+                continue
+            f.write(dumps_bytes(key, compact=True) + b":" + dumps_bytes(value, compact=True) + b",\n")
+        f.write(b'"rows":[')
+        for position, row in enumerate(index["rows"]):
+            f.write((b"\n" if position == 0 else b",\n") + dumps_bytes(row, compact=True))
+        f.write(b"\n]}\n")
+
+
+def index_files(data_dir=DATA_DIR, full=False):
+    return build_index(data_dir, full=full)
+
 
 if __name__ == "__main__":
-    index_files()
+    from profiling import profile_from_cli
+    profile_from_cli()
+
+    index_files(full="--full" in sys.argv)
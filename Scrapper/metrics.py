@@ -0,0 +1,121 @@
+import os
+import sys
+import json
+import math
+import time
+import atexit
+import functools
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+# Use absolute paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+METRICS_DIR = os.path.join(BASE_DIR, "scraped_data", "metrics")
+
+# SCRAPER_METRICS=1 writes every timing as a JSON line to
+# scraped_data/metrics/<script>-<timestamp>.ndjson; any other value is used as
+# the file path. The per-stage summary is printed to stderr at exit either way.
+METRICS_ENV = "SCRAPER_METRICS"
+
+_durations = defaultdict(list)
+_lock = threading.Lock()
+_sink = None
+_sink_opened = False
+
+
+def _open_sink():
+    global _sink, _sink_opened
+    if _sink_opened:
+        return _sink
+    _sink_opened = True
+    setting = os.getenv(METRICS_ENV, "").strip()
+    if not setting or setting == "0":
+        return None
+    if setting in ("1", "true", "yes"):
+        script = os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0]
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        path = os.path.join(METRICS_DIR, f"{script}-{stamp}-{os.getpid()}.ndjson")
+    else:
+        path = setting
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    _sink = open(path, "a", encoding="utf-8", buffering=1)
+    return _sink
+
+
+def record(stage, seconds, **fields):
+    """Add one timing for `stage` (and write it out if SCRAPER_METRICS is set)."""
+    with _lock:
+        if not _durations:
+            atexit.register(print_summary)
+        _durations[stage].append(seconds)
+        sink = _open_sink()
+        if sink:
+            event = {"type": "timing", "stage": stage, "ms": round(seconds * 1000, 3),
+                     "at": datetime.now().isoformat(), **fields}
+            sink.write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+
+
+@contextmanager
+def timer(stage, **fields):
+    """Time the enclosed block as one sample of `stage`; failures are recorded with ok=false."""
+    started = time.perf_counter()
+    ok = True
+    try:
+        yield
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        record(stage, time.perf_counter() - started, ok=ok, **fields)
+
+
+def timed(stage):
+    """Decorator form of timer()."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _percentile(ordered, pct):
+    # Nearest-rank percentile of an already sorted list
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summary():
+    """{stage: {count, total_ms, p50_ms, p95_ms, max_ms}} for everything recorded so far."""
+    with _lock:
+        stages = {stage: sorted(values) for stage, values in _durations.items()}
+    return {
+        stage: {
+            "count": len(values),
+            "total_ms": round(sum(values) * 1000, 1),
+            "p50_ms": round(_percentile(values, 50) * 1000, 1),
+            "p95_ms": round(_percentile(values, 95) * 1000, 1),
+            "max_ms": round(values[-1] * 1000, 1)
+        }
+        for stage, values in stages.items()
+    }
+
+
+def print_summary(file=None):
+    stats = summary()
+    if not stats:
+        return
+    # stderr, so scripts whose stdout is parsed (search_discussions.py) stay clean
+    file = file or sys.stderr
+    print("\n⏱  Stage timings", file=file)
+    print(f"   {'stage':<28}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'total ms':>12}", file=file)
+    for stage, s in sorted(stats.items(), key=lambda item: item[1]["total_ms"], reverse=True):
+        print(f"   {stage:<28}{s['count']:>7}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['total_ms']:>12.1f}", file=file)
+
+    sink = _open_sink()
+    if sink:
+        sink.write(json.dumps({"type": "summary", "at": datetime.now().isoformat(), "stages": stats}) + "\n")
+        sink.close()
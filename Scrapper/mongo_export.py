@@ -0,0 +1,128 @@
+import os
+import re
+import hashlib
+
+from atomic_io import atomic_open
+from serialization import dumps_bytes
+
+# Use absolute paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "scraped_data")
+EXPORT_DIR = os.path.join(DATA_DIR, "export")
+EXPORT_FILE = os.path.join(EXPORT_DIR, "properties.ndjson")
+
+# backend/server.js serves scraped_data/images at /images
+IMAGE_URL_PREFIX = "/images/"
+
+
+def stable_object_id(source, prop_id):
+    """24-hex ObjectId derived from the listing identity, so re-imports upsert the same document."""
+    return hashlib.sha1(f"{source}:{prop_id}".encode("utf-8")).hexdigest()[:24]
+
+
+def parse_price(price):
+    """'₹ 1.2 Cr' -> 12000000.0, '45 Lac' -> 4500000.0, '25,000' -> 25000.0"""
+    if not price:
+        return 0
+    if isinstance(price, (int, float)):
+        return price
+    text = str(price).lower()
+    digits = re.sub(r"[^\d.]", "", text)
+    try:
+        value = float(digits)
+    except ValueError:
+        return 0
+    if "cr" in text:
+        return value * 10000000
+    if "lac" in text or "lakh" in text:
+        return value * 100000
+    if "k" in text:
+        return value * 1000
+    return value
+
+
+def public_image_path(img_path):
+    """scraped_data/images/<id>/a.jpg -> /images/<id>/a.jpg"""
+    if img_path.startswith("http"):
+        return img_path
+    rel_path = os.path.relpath(img_path, os.path.join("scraped_data", "images"))
+    return IMAGE_URL_PREFIX + rel_path.replace(os.sep, "/")
+
+
+def display_title(prop, bhk):
+    """'3 BHK Apartment in ATS Rhapsody, Sector 1' from the society and sector a listing names.
+
+    The record keeps the portal's own title (its "for Rent"/"for Sale" is what
+    type detection reads); only the backend shows the tidied one.
+    """
+    facts = prop.get("dynamic_facts") or {}
+    society = facts.get("Society")
+    society = society if society and society != "N/A" else None
+    match = re.search(r"Sector\s*(\d+[A-Za-z]?)", f"{prop['title']} {prop.get('description') or ''}", re.IGNORECASE)
+    sector = f"Sector {match.group(1)}" if match else None
+    bhk = bhk if bhk != "N/A" else ""
+    if society or sector:
+        title = f"{bhk} {facts.get('Property Type') or 'Property'} in {society or sector}".strip()
+        return f"{title}, {sector}" if society and sector else title
+    if len(prop["title"].strip()) < 5:
+        city = (prop.get("location") or {}).get("city") or "Greater Noida"
+        return f"{bhk or 'Property'} for {prop.get('type') or 'Sale'} in {city}"
+    return prop["title"]
+
+
+def to_mongo_document(prop):
+    """Map a normalized property (see property_schema) onto the backend Property model, in Extended JSON."""
+    location = prop.get("location") or {}
+    features = prop.get("features") or {}
+    if isinstance(features, dict):
+        features = features.get("property") or []
+    bhk = prop.get("bhk")
+    bhk = f"{bhk} BHK" if isinstance(bhk, int) else (bhk or "N/A")
+
+    document = {
+        "_id": {"$oid": stable_object_id(prop["source"], prop["id"])},
+        "schema_version": prop["schema_version"],
+        "title": display_title(prop, bhk),
+        "description": prop["description"],
+        "price": parse_price(prop.get("price")),
+        "address": location.get("address") or "Unknown Location",
+        "city": location.get("city") or "Greater Noida",
+        "state": "Unknown",
+        "country": "India",
+        "features": features,
+        "images": [public_image_path(p) for p in prop.get("images") or []],
+        # Parallel to images: {variant: url} of each photo's resized WebP copies, {} if it has none
+        "image_variants": [
+            {variant: public_image_path(path) for variant, path in (prop.get("image_variants") or {}).get(p, {}).items()}
+            for p in prop.get("images") or []
+        ],
+        "isScraped": True,
+        "dynamic_facts": prop["dynamic_facts"],
+        "bhk": bhk,
+        "area": prop.get("area") or "N/A",
+        "keywords": prop.get("keywords") or []
+    }
+    # url has a sparse unique index: a missing url must be absent, not null
+    if prop.get("url"):
+        document["url"] = prop["url"]
+    return document
+
+
+def write_export(props, canonical=None, path=EXPORT_FILE):
+    """Write one Extended JSON document per line, ready for a single bulk upsert.
+
+    Listings that are duplicates of another (per `canonical`) and listings
+    without photos are left out. Returns the number of documents written.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    written = 0
+    with atomic_open(path) as f:
+        for prop in props:
+            if canonical and canonical.get(str(prop["id"]), str(prop["id"])) != str(prop["id"]):
+                continue
+            if not prop.get("images") or not prop.get("title"):
+                continue
+            f.write(dumps_bytes(to_mongo_document(prop), compact=True))
+            f.write(b"\n")
+            written += 1
+    return written
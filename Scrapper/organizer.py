@@ -1,75 +1,156 @@
 import os
-import json
 import shutil
 from datetime import datetime
 
+from dedup import find_duplicates, write_duplicates
+from image_filter import analyze_images, listing_group, placeholder_hashes, select_photos
+from derivatives import generate_derivatives
+from mongo_export import write_export, EXPORT_FILE
+from property_schema import NON_PROPERTY_FILES, SCHEMA_VERSION, is_current, validate_property, source_for_id
+from records import PropertySummary
+from serialization import dumps_bytes, load
+from atomic_io import AtomicBatch, MoveJournal, write_atomic
+from indexer import build_index, load_canonical_ids
+from geo import locate
+from aggregates import listing_facts, update_aggregates
+from amenities import amenity_mask
+
 # Use absolute paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "scraped_data")
 PROPERTIES_DIR = os.path.join(DATA_DIR, "properties")
 IMAGES_DIR = os.path.join(DATA_DIR, "images")
-INDEX_FILE = os.path.join(DATA_DIR, "index.json")
+MOVE_JOURNAL = os.path.join(DATA_DIR, "organizer_moves.journal")
+NORMALIZE_BATCH = 1000  # stale records held in memory at once while normalizing
 
-os.makedirs(PROPERTIES_DIR, exist_ok=True)
-os.makedirs(IMAGES_DIR, exist_ok=True)
-
-def clean_images(local_images):
-    """Filter out likely icons or invalid images based on size or name."""
-    cleaned = []
-    for img_path in local_images:
-        # Resolve absolute path
-        if os.path.isabs(img_path):
-            full_path = img_path
-        else:
-            # Try relative to BASE_DIR first
-            full_path = os.path.join(BASE_DIR, img_path)
-            if not os.path.exists(full_path):
-                # Try relative to DATA_DIR
-                full_path = os.path.join(DATA_DIR, img_path)
+def ensure_dirs():
+    # Not at import time, so importing the module (tests, benchmark.py) leaves scraped_data/ alone
+    os.makedirs(PROPERTIES_DIR, exist_ok=True)
+    os.makedirs(IMAGES_DIR, exist_ok=True)
 
+def resolve_image(img_path):
+    """Absolute path of a stored image, or None if the file is gone."""
+    if os.path.isabs(img_path):
+        full_path = img_path
+    else:
+        # Try relative to BASE_DIR first
+        full_path = os.path.join(BASE_DIR, img_path)
         if not os.path.exists(full_path):
-            continue
-            
-        filename = os.path.basename(img_path).lower()
-        
-        # Strict filter for component images
-        blocklist = [
-            "logo", "icon", "blueheart", "shortlist", "videocam", "mute", 
-            "fullscreen", "time2", "landmarkgroup", "nearme", "voicesearch", 
-            "projectnoimage", "loader", "spinner", "arrow", "star", "rating",
-            "whatsapp", "facebook", "twitter", "share", "email", "call",
-            "dealer", "request-photo", "img_not_avail"
-        ]
-        
-        if any(x in filename for x in blocklist):
-            continue
-            
-        # Filter by size (skip very small images < 10KB to be safe against icons)
-        try:
-            if os.path.getsize(full_path) < 10240:  # 10KB
-                continue
-        except:
-            pass
-            
+            # Try relative to DATA_DIR
+            full_path = os.path.join(DATA_DIR, img_path)
+    return full_path if os.path.exists(full_path) else None
+
+def raw_images(data):
+    """Local image paths of a scraped (or already normalized) property."""
+    images = data.get("images")
+    if isinstance(images, list) and images and "scraped_data" in images[0]:
+        return images
+    return data.get("local_images", [])
+
+def clean_images(local_images, infos=None, placeholders=frozenset(), cache=None):
+    """Keep real, distinct photos: drop icons, banners, placeholders and repeated shots.
+
+    infos/placeholders come from a corpus-wide image_filter pass; without them
+    the images are analyzed on the spot, through `cache` (an ImageCache) if given.
+    """
+    full_paths = [p for p in (resolve_image(img_path) for img_path in local_images) if p]
+    if infos is None:
+        infos = analyze_images(full_paths, cache)
+
+    cleaned = []
+    for full_path in select_photos(full_paths, infos, placeholders):
         # Normalize path to be relative to scraped_data for portable JSON
         rel_path = os.path.relpath(full_path, DATA_DIR)
         cleaned.append(os.path.join("scraped_data", rel_path))
         
     return cleaned
 
-def normalize_property(data, filename):
+# Footer text MagicBricks appends to descriptions; everything from the first marker on is dropped
+DESCRIPTION_JUNK_MARKERS = [
+    "Flats near Sector", "Popular Localities", "Property Options", "Quick Area Conversions",
+    "State specific Area Units", "Links", "Company", "Our Partners", "CONTACT US",
+    "Read more", "Flats for rent in"
+]
+
+# Page sections that the scrapers pick up as facts
+FACT_JUNK_KEYS = {
+    "Home Loans", "Real Estate Articles", "Latest News", "About Us",
+    "Get HelpCustomer Services & FAQs", "Why you should consider this property?",
+    "Key Highlightsof the property", "Key Highlights", "Average Rating",
+    "Positives", "Negatives", "Quick Area Conversions", "State specific Area Units",
+    "Links", "Company", "Our Partners", "CONTACT US",
+    "1", "2", "3", "4", "5"
+}
+FACT_JUNK_PATTERNS = [
+    r"^Flats near", r"^Popular Localities", r"^Property Options",
+    r".* nearby listings$", r"^About ", r"^Reviews of",
+    r"^Property Rates in", r"^Rent .* Flat in"
+]
+
+CITY_NAMES = [
+    ("greater noida", "Greater Noida"), ("noida", "Noida"), ("delhi", "Delhi"),
+    ("gurgaon", "Gurgaon"), ("gurugram", "Gurgaon"), ("ghaziabad", "Ghaziabad")
+]
+
+def clean_description(text):
+    if not text:
+        return "No description available"
+    cleaned = str(text)
+    for marker in DESCRIPTION_JUNK_MARKERS:
+        index = cleaned.find(marker)
+        if index != -1:
+            cleaned = cleaned[:index]
+    return " ".join(cleaned.split()) or "No description available"
+
+def clean_dynamic_facts(facts):
+    """Drop page-section junk and reviewer lines ("Owner | 4mo ago"); values become strings."""
+    import re
+    cleaned = {}
+    for key, value in (facts or {}).items():
+        if key in FACT_JUNK_KEYS or any(re.match(p, key) for p in FACT_JUNK_PATTERNS):
+            continue
+        if isinstance(value, str) and ("Owner |" in value or "Agent |" in value):
+            continue
+        cleaned[key] = " ".join(str(value).split())
+    return cleaned
+
+def derived_facts(text, features):
+    """Society, property type, bathrooms and project amenities read from title + description."""
+    import re
+    facts = {}
+
+    society = None
+    society_match = re.search(r"\b(?:in|at)\s+([A-Za-z0-9\s]+)(?:,|$|Sector|Near)", text, re.IGNORECASE)
+    if society_match:
+        candidate = society_match.group(1).strip()
+        if "noida" not in candidate.lower():
+            society = candidate
+    facts["Society"] = society or "N/A"
+
+    prop_type = "Apartment"
+    for pattern, name in [(r"Villa", "Villa"), (r"Plot|Land", "Plot"), (r"Floor", "Independent Floor"),
+                          (r"Studio", "Studio"), (r"Penthouse", "Penthouse")]:
+        if re.search(pattern, text, re.IGNORECASE):
+            prop_type = name
+            break
+    facts["Property Type"] = prop_type
+
+    bath_match = re.search(r"(\d+)\s*(?:Bath|Bathroom|Washroom)", text, re.IGNORECASE)
+    if bath_match:
+        facts["Bathrooms"] = bath_match.group(1)
+
+    if isinstance(features, dict) and features.get("society"):
+        facts["Project Amenities"] = ", ".join(features["society"])
+    return facts
+
+def normalize_property(data, filename, image_infos=None, placeholders=frozenset()):
     """Normalize property data structure with advanced parsing for searchability."""
     
     prop_id = data.get("id") or data.get("property_id")
     
     # Determine source based on ID format
     import re
-    if re.match(r"^[A-Z]\d+$", str(prop_id)):
-        source = "99Acers"
-    elif len(str(prop_id)) > 15:
-        source = "MagicBricks"
-    else:
-        source = "Unknown"
+    source = source_for_id(prop_id)
 
     # --- 1. Title & Basic Info Extraction ---
     title = data.get("title") or data.get("property_name")
@@ -88,6 +169,8 @@ def normalize_property(data, filename):
     if not details:
         details = {}
 
+    description = clean_description(data.get("description"))
+
     # Extract BHK - prioritize scraped value
     bhk = data.get("bhk")  # Direct field from 99Acers
     if not bhk:
@@ -109,6 +192,11 @@ def normalize_property(data, filename):
                 if "Bedroom" in f:
                     m = re.search(r"(\d+)", f)
                     if m: bhk = int(m.group(1))
+    if not bhk:
+        # Last resort: the description ("1 RK" is kept as written)
+        bhk_match = re.search(r"(\d+)\s*(BHK|Bedroom|RK)", description, re.IGNORECASE)
+        if bhk_match:
+            bhk = f"{bhk_match.group(1)} RK" if bhk_match.group(2).upper() == "RK" else int(bhk_match.group(1))
 
     # Extract Property Type (Rent/Sale)
     prop_type = "Rent" 
@@ -118,11 +206,17 @@ def normalize_property(data, filename):
         prop_type = "Sale"
     
     # Extract Area
-    area = details.get("area") or details.get("super_builtup_area") or details.get("carpet_area")
+    area = data.get("area") or details.get("area") or details.get("super_builtup_area") or details.get("carpet_area")
+    if area and (len(str(area)) > 50 or not re.search(r"\d", str(area))):
+        area = None  # page text picked up in place of an area
     if not area:
         area_match = re.search(r"(\d+)\s*(Sq-ft|sqft|sq ft)", title, re.IGNORECASE)
         if area_match:
             area = f"{area_match.group(1)} Sq-ft"
+    if not area:
+        area_match = re.search(r"(\d+(?:,\d+)?)\s*(sqft|sq\.ft|sq ft|sq yards|gaj)", description, re.IGNORECASE)
+        if area_match:
+            area = f"{area_match.group(1)} {area_match.group(2)}"
 
     # Extract Price - prioritize scraped value
     price = data.get("price")  # Direct field from 99Acers
@@ -130,10 +224,11 @@ def normalize_property(data, filename):
         price = details.get("price") or details.get("rent")
 
     # --- 3. Location Parsing ---
-    # Prioritize scraped locality and address
-    locality = data.get("locality")
-    address = data.get("address")
-    city = "Greater Noida"
+    # Prioritize scraped locality and address; normalized records keep them under location
+    location = data.get("location") if isinstance(data.get("location"), dict) else {}
+    locality = location.get("locality") or data.get("locality")
+    address = location.get("address") or data.get("address")
+    city = location.get("city") or "Greater Noida"
 
     if not locality or locality == "Unknown":
         # Fallback to title parsing
@@ -158,6 +253,15 @@ def normalize_property(data, filename):
         else:
             address = city
 
+    # A sector named in the listing leads the address, as the backend used to show it
+    sector_match = re.search(r"Sector\s*(\d+[A-Za-z]?)", f"{title} {description}", re.IGNORECASE)
+    if sector_match and f"Sector {sector_match.group(1)}" not in address:
+        address = f"Sector {sector_match.group(1)}, {address}"
+
+    lowered = f"{address} {title}".lower()
+    city = next((name for needle, name in CITY_NAMES if needle in lowered), city)
+    place = locate(locality if locality != "Unknown" else None, address, title)
+
     # --- 4. Generate Keywords ---
     keywords = []
     if bhk: keywords.append(f"{bhk} BHK")
@@ -171,13 +275,17 @@ def normalize_property(data, filename):
         for cat in features:
             keywords.extend(features[cat][:5])
     
-    keywords = list(set([str(k).strip() for k in keywords if k]))
+    keywords = list(dict.fromkeys(str(k).strip() for k in keywords if k))
+
+    dynamic_facts = clean_dynamic_facts(data.get("dynamic_facts"))
+    for key, value in derived_facts(f"{title} {description}", features).items():
+        dynamic_facts.setdefault(key, value)
 
     # --- 5. Construct Final Normalized Object ---
-    local_images = data.get("images") if "images" in data and isinstance(data["images"], list) and data["images"] and "scraped_data" in data["images"][0] else data.get("local_images", [])
-    cleaned_images = clean_images(local_images)
+    cleaned_images = clean_images(raw_images(data), image_infos, placeholders)
 
     normalized = {
+        "schema_version": SCHEMA_VERSION,
         "id": prop_id,
         "source": source,
         "title": title,
@@ -188,26 +296,56 @@ def normalize_property(data, filename):
         "location": {
             "address": address,
             "city": city,
-            "locality": locality
+            "locality": locality,
+            "locality_id": place[4] if place else None,
+            "lat": place[2] if place else None,
+            "lon": place[3] if place else None
         },
         "url": data.get("url") or data.get("link"),
+        "description": description,
+        "dynamic_facts": dynamic_facts,
         "images": cleaned_images,
+        "image_variants": {},
         "features": features,
+        "amenity_mask": amenity_mask(features),
         "keywords": keywords,
         "scraped_at": data.get("scraped_at")
     }
     
     return normalized
 
-def main():
-    all_properties = []
-    
+def load_record(path):
+    try:
+        return load(path)
+    except:
+        print(f"⚠ Skipping invalid JSON: {path}")
+        return None
+
+def exported_records(summaries, canonical):
+    """Full records of the listings write_export keeps, read back from disk one at a time."""
+    for summary in summaries:
+        prop_id = str(summary.id)
+        if not summary.image_count or not summary.title or canonical.get(prop_id, prop_id) != prop_id:
+            continue
+        record = load_record(os.path.join(PROPERTIES_DIR, summary.filename))
+        if record:
+            yield record
+
+def main(reprocess_all=False):
+    ensure_dirs()
+    # A crash between saving records to properties/ and removing their root copies
+    # is finished here instead of normalizing those records again
+    journal = MoveJournal(MOVE_JOURNAL)
+    recovered = journal.recover()
+    if recovered:
+        print(f"♻ Finished {recovered} moves interrupted by the last run")
+
     # 1. Identify all JSON files in scraped_data and scraped_data/properties
     files_to_process = []
     
     # Check root scraped_data
     for f in os.listdir(DATA_DIR):
-        if f.endswith(".json") and f not in ["index.json", "properties_index.json"]:
+        if f.endswith(".json") and f not in NON_PROPERTY_FILES:
             files_to_process.append(os.path.join(DATA_DIR, f))
             
     # Check properties dir
@@ -217,44 +355,137 @@ def main():
             
     print(f"🔍 Found {len(files_to_process)} files to process")
 
+    # Records already at the current schema version are used as-is and only their
+    # PropertySummary is kept; everything else is (re)normalized below, a batch at a time
+    summaries = {}
+    facts = {}  # aggregates contributions of the records normalized in this run
+    stale = []
+    paths_by_listing = {}
+    groups = {}
+    known_canonical = load_canonical_ids(DATA_DIR)
     for path in files_to_process:
-        try:
-            with open(path, "r") as file:
-                data = json.load(file)
-        except:
-            print(f"⚠ Skipping invalid JSON: {path}")
+        data = load_record(path)
+        if data is None:
             continue
-            
-        filename = os.path.basename(path)
-        normalized = normalize_property(data, filename)
-        
-        # Always save to properties/ dir
-        target_path = os.path.join(PROPERTIES_DIR, filename)
-        
-        with open(target_path, "w") as file:
-            json.dump(normalized, file, indent=4)
-            
-        # If file was in root, remove it (since we moved/saved it to properties)
-        if os.path.dirname(path) == DATA_DIR:
-            os.remove(path)
-            
-        all_properties.append({
-            "id": normalized["id"],
-            "title": normalized["title"],
-            "source": normalized["source"],
-            "type": normalized["type"],
-            "bhk": normalized["bhk"],
-            "location": normalized["location"],
-            "file_path": f"scraped_data/properties/{filename}",
-            "image_count": len(normalized["images"])
-        })
-        print(f"✅ Processed {filename}")
-
-    # 3. Update Index
-    with open(INDEX_FILE, "w") as f:
-        json.dump(all_properties, f, indent=4)
+        paths_by_listing[path] = [p for p in (resolve_image(img) for img in raw_images(data)) if p]
+        groups[path] = listing_group(data.get("id") or data.get("property_id") or path, known_canonical)
+        if reprocess_all or not is_current(data):
+            stale.append(path)
+        else:
+            filename = os.path.basename(path)
+            summaries[filename] = PropertySummary(data, filename)
+    print(f"🔁 {len(stale)} records to normalize, {len(summaries)} already at schema v{SCHEMA_VERSION}")
+
+    # 2. Classify every image once, in parallel, so placeholders shared across listings can be spotted
+    image_infos = analyze_images([p for paths in paths_by_listing.values() for p in paths], prune=True)
+    placeholders = placeholder_hashes(paths_by_listing, image_infos, groups)
+    del paths_by_listing, groups, known_canonical
+
+    for start in range(0, len(stale), NORMALIZE_BATCH):
+        normalized_by_path = []
+        for path in stale[start:start + NORMALIZE_BATCH]:
+            data = load_record(path)
+            normalized = normalize_property(data, os.path.basename(path), image_infos, placeholders)
+            normalized_by_path.append((path, normalized))
+
+        # 3. Resized WebP variants for the photos that survived cleaning (skips up-to-date ones)
+        image_variants = generate_derivatives([img for _, n in normalized_by_path for img in n["images"]])
+
+        # The whole batch becomes durable with one round of fsyncs (see atomic_io.AtomicBatch)
+        moves = []
+        with AtomicBatch() as batch:
+            for path, normalized in normalized_by_path:
+                filename = os.path.basename(path)
+                normalized["image_variants"] = {img: image_variants[img] for img in normalized["images"] if img in image_variants}
+
+                errors = validate_property(normalized)
+                if errors:
+                    print(f"⚠ Skipping {filename}: {'; '.join(errors)}")
+                    continue
+                
+                # Always save to properties/ dir
+                target_path = os.path.join(PROPERTIES_DIR, filename)
+                
+                batch.write(target_path, dumps_bytes(normalized))
+                    
+                # If file was in root, it is removed once its copy in properties/ is on disk
+                if os.path.dirname(path) == DATA_DIR:
+                    moves.append((path, target_path))
+
+                summaries[filename] = PropertySummary(normalized, filename)
+                facts[filename] = listing_facts(normalized)
+                print(f"✅ Processed {filename}")
+
+        if moves:
+            journal.record(moves)
+            journal.complete(moves)
+
+    # 4. Cluster near-duplicates (same flat listed twice or on both portals)
+    canonical, clusters = find_duplicates(summaries.values(), image_infos=image_infos)
+    write_duplicates(canonical, clusters)
+    print(f"🧬 Found {len(clusters)} duplicate clusters")
+
+    # 5. Update the index; records normalized here are indexed from their summaries, not re-read
+    indexed = build_index(DATA_DIR, known=summaries, schema_version=SCHEMA_VERSION, canonical=canonical)["count"]
+
+    # 6. Per-locality market figures for the dashboards (only changed files are read)
+    update_aggregates(DATA_DIR, known=facts, canonical=canonical)
+
+    # 7. Bulk export for the backend (one upsert per canonical listing)
+    exported = write_export(exported_records(summaries.values(), canonical), canonical)
+    print(f"📦 Exported {exported} documents to {os.path.relpath(EXPORT_FILE, BASE_DIR)}")
     
-    print(f"🎉 Organization complete. Indexed {len(all_properties)} properties.")
+    print(f"🎉 Organization complete. Indexed {indexed} properties.")
+
+def organize_files(files, export_path):
+    """Normalize just `files` (names in properties/ or scraped_data/, or paths) and export them to export_path.
+
+    The quick path for the backend's scrape endpoints, which costs the same
+    whatever the size of the corpus. Images are classified per listing (the
+    corpus-wide placeholder check needs every listing). Duplicates, the
+    index, aggregates, the full export and moving root copies into
+    properties/ are left to the next main() run. Returns the number of
+    documents written.
+    """
+    ensure_dirs()
+    props = []
+    for name in files:
+        candidates = [name] if os.path.dirname(name) else [os.path.join(PROPERTIES_DIR, name), os.path.join(DATA_DIR, name)]
+        path = next((p for p in candidates if os.path.exists(p)), None)
+        data = load_record(path) if path else None
+        if data is None:
+            print(f"⚠ No property file {name}")
+            continue
+        filename = os.path.basename(path)
+        if not is_current(data):
+            data = normalize_property(data, filename)
+            image_variants = generate_derivatives(data["images"])
+            data["image_variants"] = {img: image_variants[img] for img in data["images"] if img in image_variants}
+            errors = validate_property(data)
+            if errors:
+                print(f"⚠ Skipping {filename}: {'; '.join(errors)}")
+                continue
+            write_atomic(os.path.join(PROPERTIES_DIR, filename), dumps_bytes(data))
+            print(f"✅ Processed {filename}")
+        props.append(data)
+    exported = write_export(props, load_canonical_ids(DATA_DIR), export_path)
+    print(f"📦 Exported {exported} of {len(files)} documents to {export_path}")
+    return exported
 
 if __name__ == "__main__":
-    main()
+    from profiling import profile_from_cli
+    profile_from_cli()
+
+    import argparse
+    parser = argparse.ArgumentParser(description="Normalize, de-duplicate, index and export scraped properties")
+    parser.add_argument("--all", action="store_true", help="re-normalize every record, not just stale ones")
+    parser.add_argument("files", nargs="*", help="only normalize these property files and export them to --export-to")
+    parser.add_argument("--export-to", help="export file for the given files")
+    args = parser.parse_args()
+
+    if args.files:
+        if not args.export_to:
+            parser.error("--export-to is required with files")
+        organize_files(args.files, args.export_to)
+    else:
+        main(reprocess_all=args.all)
@@ -0,0 +1,65 @@
+import os
+
+# Resource types we never need for extraction. Images stay allowed by default
+# because the scrapers collect property photos.
+BLOCKED_RESOURCE_TYPES = {"font", "media", "websocket", "eventsource", "manifest"}
+
+# Ad, analytics and tracker hosts seen on 99acres, MagicBricks and Reddit
+BLOCKED_HOST_KEYWORDS = [
+    "doubleclick", "googlesyndication", "googleadservices", "google-analytics",
+    "googletagmanager", "googletagservices", "adservice", "amazon-adsystem",
+    "facebook.net", "connect.facebook", "hotjar", "clarity.ms", "criteo",
+    "taboola", "outbrain", "moengage", "webengage", "clevertap", "scorecardresearch",
+    "newrelic", "nr-data", "branch.io", "appsflyer", "chartbeat", "quantserve",
+    "redditstatic.com/ads", "ads.reddit", "events.reddit", "youtube.com/embed"
+]
+
+# Set SCRAPER_BLOCK_RESOURCES=0 to load pages with everything (e.g. when debugging selectors)
+BLOCK_ENV = "SCRAPER_BLOCK_RESOURCES"
+
+
+def blocking_enabled():
+    return os.getenv(BLOCK_ENV, "1").lower() not in ("0", "false", "no")
+
+
+def block_resources(target, block_images=False, resource_types=None, host_keywords=None):
+    """Abort requests for ads, analytics, fonts and media on a page or browser context."""
+    if not blocking_enabled():
+        return
+
+    resource_types = set(resource_types or BLOCKED_RESOURCE_TYPES)
+    if block_images:
+        resource_types.add("image")
+    host_keywords = host_keywords or BLOCKED_HOST_KEYWORDS
+
+    def handle(route):
+        request = route.request
+        url = request.url.lower()
+        if request.resource_type in resource_types or any(k in url for k in host_keywords):
+            return route.abort()
+        return route.continue_()
+
+    target.route("**/*", handle)
+
+
+def wait_for_any(page, selectors, timeout=10000):
+    """Wait until any of the selectors is attached. Returns False instead of raising."""
+    try:
+        page.wait_for_selector(", ".join(selectors), state="attached", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+def scroll_to_bottom(page, step=1000, settle_ms=300, max_rounds=10):
+    """Scroll until the page stops growing, so lazy content loads without fixed sleeps."""
+    last_height = 0
+    for _ in range(max_rounds):
+        page.mouse.wheel(0, step)
+        page.wait_for_timeout(settle_ms)
+        height, bottom = page.evaluate(
+            "() => [document.body.scrollHeight, window.scrollY + window.innerHeight]"
+        )
+        if bottom >= height and height == last_height:
+            break
+        last_height = height
@@ -0,0 +1,98 @@
+import os
+import sys
+import atexit
+from datetime import datetime
+
+# Use absolute paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILES_DIR = os.path.join(BASE_DIR, "scraped_data", "profiles")
+
+# --profile / --profile=cpu runs the script under cProfile, --profile=memory under
+# tracemalloc. SCRAPER_PROFILE=cpu|memory does the same without touching the
+# command line (e.g. for scripts started by the backend or the scheduler).
+PROFILE_ENV = "SCRAPER_PROFILE"
+MODES = ("cpu", "memory")
+TOP_N = 25
+
+_started = False
+
+
+def _mode_from_cli():
+    """Read and remove --profile[=mode] from sys.argv so the script's own parsing never sees it."""
+    mode = None
+    for arg in list(sys.argv[1:]):
+        if arg == "--profile" or arg.startswith("--profile="):
+            sys.argv.remove(arg)
+            mode = arg.partition("=")[2] or "cpu"
+    if mode is None:
+        setting = os.getenv(PROFILE_ENV, "").strip().lower()
+        if setting and setting != "0":
+            mode = "cpu" if setting in ("1", "true", "yes") else setting
+    if mode is not None and mode not in MODES:
+        print(f"⚠ Unknown profile mode '{mode}', expected one of {', '.join(MODES)}", file=sys.stderr)
+        return None
+    return mode
+
+
+def _output_path(extension):
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    script = os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0]
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    return os.path.join(PROFILES_DIR, f"{script}-{stamp}-{os.getpid()}.{extension}")
+
+
+def _start_cpu():
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+
+    def report():
+        profiler.disable()
+        path = _output_path("pstats")
+        profiler.dump_stats(path)
+        print(f"\n🔬 CPU profile written to {path} (open with snakeviz or pstats)", file=sys.stderr)
+        stats = pstats.Stats(profiler, stream=sys.stderr)
+        stats.sort_stats("cumulative").print_stats(TOP_N)
+
+    atexit.register(report)
+    profiler.enable()
+
+
+def _start_memory():
+    import tracemalloc
+
+    tracemalloc.start(25)
+
+    def report():
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        path = _output_path("tracemalloc")
+        snapshot.dump(path)
+        print(f"\n🔬 Allocation snapshot written to {path} (tracemalloc.Snapshot.load)", file=sys.stderr)
+        print(f"   current {current / 1048576:.1f} MiB, peak {peak / 1048576:.1f} MiB", file=sys.stderr)
+        for stat in snapshot.statistics("lineno")[:TOP_N]:
+            print(f"   {stat}", file=sys.stderr)
+
+    atexit.register(report)
+
+
+def profile_from_cli():
+    """Call first thing in a script's __main__ block.
+
+    Profiling stays on until the interpreter exits (including sys.exit and
+    Ctrl+C), then the profile is written to scraped_data/profiles/ and the top
+    functions or allocation sites are printed to stderr. Worker processes are
+    not profiled; run py-spy against their PIDs for those.
+    """
+    global _started
+    mode = _mode_from_cli()
+    if mode is None or _started:
+        return None
+    _started = True
+    if mode == "cpu":
+        _start_cpu()
+    else:
+        _start_memory()
+    return mode
@@ -0,0 +1,91 @@
+# Schema of normalized property records (scraped_data/properties/*.json).
+# organizer.normalize_property is their only producer and the backend ingests
+# them via the NDJSON export without renormalizing. Bump SCHEMA_VERSION whenever
+# normalize_property's output changes; the organizer then reprocesses exactly
+# the records written by an older version.
+
+import re
+
+SCHEMA_VERSION = 6
+
+NoneType = type(None)
+
+# field -> allowed types
+PROPERTY_SCHEMA = {
+    "schema_version": (int,),
+    "id": (str, int),
+    "source": (str,),
+    "title": (str,),
+    "type": (str,),
+    "bhk": (int, str, NoneType),
+    "price": (str, int, float, NoneType),
+    "area": (str, NoneType),
+    "location": (dict,),
+    "url": (str, NoneType),
+    "description": (str,),
+    "dynamic_facts": (dict,),
+    "images": (list,),
+    "image_variants": (dict,),
+    "features": (dict, list),
+    "amenity_mask": (int,),  # bitset over amenities.AMENITIES
+    "keywords": (list,),
+    "scraped_at": (str, NoneType),
+}
+
+LOCATION_SCHEMA = {
+    "address": (str,),
+    "city": (str,),
+    "locality": (str, NoneType),
+    "locality_id": (str, NoneType),  # canonical id from the geo gazetteer, e.g. noida/sector-62
+    "lat": (float, NoneType),  # approximate, from the geo gazetteer
+    "lon": (float, NoneType),
+}
+
+SOURCES = {"99Acers", "MagicBricks", "Unknown"}
+
+# Bookkeeping files that live next to freshly scraped properties in scraped_data/
+NON_PROPERTY_FILES = frozenset({
+    "index.json", "properties_index.json", "duplicates.json", "image_cache.json",
+    "crawl_state.json", "scrape_queue.json", "aggregates.json", "aggregates_state.json"
+})
+
+
+def source_for_id(prop_id):
+    """Portal a listing id comes from: 99acres ids look like R81234567, MagicBricks ids are long hex."""
+    if re.match(r"^[A-Z]\d+$", str(prop_id)):
+        return "99Acers"
+    if len(str(prop_id)) > 15:
+        return "MagicBricks"
+    return "Unknown"
+
+
+def is_current(record):
+    return isinstance(record, dict) and record.get("schema_version") == SCHEMA_VERSION
+
+
+def validate_property(record):
+    """Return a list of problems with a normalized record (empty if it is valid)."""
+    errors = []
+    for schema, value, prefix in (
+        (PROPERTY_SCHEMA, record, ""),
+        (LOCATION_SCHEMA, record.get("location") or {}, "location."),
+    ):
+        for field, types in schema.items():
+            if field not in value:
+                errors.append(f"missing {prefix}{field}")
+            elif not isinstance(value[field], types) or isinstance(value[field], bool):
+                errors.append(f"{prefix}{field} has type {type(value[field]).__name__}")
+
+    if errors:
+        return errors
+    if not str(record["id"]).strip():
+        errors.append("empty id")
+    if record["source"] not in SOURCES:
+        errors.append(f"unknown source {record['source']}")
+    if not record["title"].strip():
+        errors.append("empty title")
+    if not all(isinstance(p, str) for p in record["images"]):
+        errors.append("images must be paths")
+    if not all(isinstance(v, str) for v in record["dynamic_facts"].values()):
+        errors.append("dynamic_facts values must be strings")
+    return errors
@@ -0,0 +1,65 @@
+import sys
+
+IMAGES_KEPT = 3  # dedup only hashes a listing's first few photos
+
+
+def intern_text(value):
+    """Share one copy of strings that repeat across listings (source, type, city, locality)."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class PropertySummary:
+    """The part of a normalized property that the organizer keeps in memory.
+
+    A full record with description, facts and features is several KB as a
+    dict; this keeps only what the index, dedup and export selection read, with
+    repeated strings interned. get() and [] answer like the record it was built
+    from (location comes back as a dict), so dedup works on either.
+    """
+
+    __slots__ = (
+        "id", "title", "source", "type", "bhk", "price", "area",
+        "address", "city", "locality", "locality_id", "lat", "lon", "url", "amenity_mask", "images", "image_count", "scraped_at", "filename"
+    )
+
+    def __init__(self, record, filename):
+        location = record.get("location") or {}
+        images = record.get("images") or []
+        self.id = record.get("id")
+        self.title = record.get("title")
+        self.source = intern_text(record.get("source"))
+        self.type = intern_text(record.get("type"))
+        self.bhk = intern_text(record.get("bhk"))
+        self.price = record.get("price")
+        self.area = record.get("area")
+        self.address = location.get("address")
+        self.city = intern_text(location.get("city"))
+        self.locality = intern_text(location.get("locality"))
+        self.locality_id = intern_text(location.get("locality_id"))
+        self.lat = location.get("lat")
+        self.lon = location.get("lon")
+        self.url = record.get("url")
+        self.amenity_mask = record.get("amenity_mask") or 0
+        self.images = tuple(images[:IMAGES_KEPT])
+        self.image_count = len(images)
+        self.scraped_at = record.get("scraped_at")
+        self.filename = intern_text(filename)
+
+    @property
+    def location(self):
+        return {
+            "address": self.address, "city": self.city, "locality": self.locality,
+            "locality_id": self.locality_id, "lat": self.lat, "lon": self.lon
+        }
+
+    def get(self, key, default=None):
+        if key == "location":
+            return self.location
+        if key in self.__slots__:
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key):
+        if key != "location" and key not in self.__slots__:
+            raise KeyError(key)
+        return self.get(key)
@@ -0,0 +1,56 @@
+import os
+import argparse
+import importlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from snapshots import BASE_DIR, latest_snapshots, load_snapshot
+
+SOURCES = ["99Acers", "MagicBricks"]
+
+
+def replay_snapshot(html_path):
+    """Re-extract one stored page and write its property JSON like a live scrape would."""
+    html, meta = load_snapshot(html_path)
+    url = meta["url"]
+
+    if meta["source"] == "99Acers":
+        acres = importlib.import_module("99Acers")
+        extractor = acres.PropertyDataExtractor(html, meta["property_id"], download_images=False)
+        data = extractor.extract_all(url)
+        return acres.save_property_data(data, url)
+
+    magic_bricks = importlib.import_module("Magic_bricks")
+    data = magic_bricks.extract_property_from_html(html, url)
+    return magic_bricks.save_property_data(data)
+
+
+def replay(source=None, workers=None):
+    paths = latest_snapshots(source)
+    print(f"🔁 Replaying {len(paths)} snapshots")
+
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(replay_snapshot, path): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                done += 1
+            except Exception as e:
+                print(f"⚠ Replay failed for {futures[future]}: {e}")
+
+    print(f"🎉 Replay complete. Re-extracted {done}/{len(paths)} properties.")
+    return done
+
+
+if __name__ == "__main__":
+    from profiling import profile_from_cli
+    profile_from_cli()
+
+    parser = argparse.ArgumentParser(description="Re-run extraction over saved HTML snapshots")
+    parser.add_argument("--source", choices=SOURCES, help="Only replay one portal")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    # The scrapers write to paths relative to the Scrapper directory
+    os.chdir(BASE_DIR)
+    replay(args.source, args.workers)
@@ -0,0 +1,270 @@
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+import subprocess
+from datetime import datetime
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+from freshness import due_listings
+from serialization import dump, load
+
+# Use absolute paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "scraped_data")
+QUEUE_FILE = os.path.join(DATA_DIR, "scrape_queue.json")
+
+SCRIPTS = {
+    "99Acers": os.path.join(BASE_DIR, "99Acers.py"),
+    "MagicBricks": os.path.join(BASE_DIR, "Magic_bricks.py"),
+}
+# Keyword runs of these scrapers wait for someone to pick a listing in the
+# browser, so they cannot be queued; queue the listing URLs instead
+INTERACTIVE_KEYWORD_SOURCES = {"MagicBricks"}
+SOURCE_HOSTS = {
+    "99Acers": "www.99acres.com",
+    "MagicBricks": "www.magicbricks.com",
+}
+
+# host -> (requests per second, burst). Anything else gets DEFAULT_RATE_LIMIT.
+HOST_RATE_LIMITS = {
+    "www.99acres.com": (0.2, 2),
+    "www.magicbricks.com": (0.2, 2),
+}
+DEFAULT_RATE_LIMIT = (0.5, 1)
+
+MAX_ATTEMPTS = 4
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 30 * 60
+JOB_TIMEOUT_SECONDS = 15 * 60
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class JobQueue:
+    """Persistent list of scrape jobs, checkpointed to QUEUE_FILE after every change (add_all is one change)."""
+
+    def __init__(self, path=QUEUE_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.jobs = []
+        if os.path.exists(path):
+            self.jobs = load(path)
+        # A job still marked running was interrupted by a crash; run it again
+        for job in self.jobs:
+            if job["status"] == "running":
+                job["status"] = "pending"
+            if job["status"] == "pending" and job["kind"] == "keyword" and job["source"] in INTERACTIVE_KEYWORD_SOURCES:
+                job.update(status="failed", last_error=f"{job['source']} keyword searches are interactive")
+        self.by_id = {job["id"]: job for job in self.jobs}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        dump(self.jobs, self.path)
+
+    def add(self, source, kind, target, requeue=False):
+        """Queue a job; with requeue=True a finished job for the same target runs again."""
+        return self.add_all([(source, kind, target)], requeue)[0]
+
+    def add_all(self, specs, requeue=False):
+        """Queue (source, kind, target) jobs with one save; returns the job or None for each."""
+        for source, kind, _ in specs:
+            if kind == "keyword" and source in INTERACTIVE_KEYWORD_SOURCES:
+                raise ValueError(f"{source} keyword searches are interactive; queue its listing URLs with --url")
+        with self.lock:
+            added = [self._add(source, kind, target, requeue) for source, kind, target in specs]
+            if any(added):
+                self.save()
+            return added
+
+    def _add(self, source, kind, target, requeue):
+        job_id = f"{source}:{kind}:{target}"
+        job = self.by_id.get(job_id)
+        if job is not None:
+            if not requeue or job["status"] in ("pending", "running"):
+                return None
+            job.update(status="pending", attempts=0, next_attempt_at=0,
+                       last_error=None, finished_at=None)
+            return job
+        job = {
+            "id": job_id,
+            "source": source,
+            "kind": kind,
+            "target": target,
+            "status": "pending",
+            "attempts": 0,
+            "next_attempt_at": 0,
+            "last_error": None,
+            "created_at": datetime.now().isoformat(),
+            "finished_at": None
+        }
+        self.jobs.append(job)
+        self.by_id[job_id] = job
+        return job
+
+    def claim_due(self):
+        """Mark and return the next pending job whose backoff has elapsed, if any."""
+        with self.lock:
+            now = time.time()
+            for job in self.jobs:
+                if job["status"] == "pending" and job["next_attempt_at"] <= now:
+                    job["status"] = "running"
+                    job["attempts"] += 1
+                    self.save()
+                    return job
+            return None
+
+    def has_pending(self):
+        with self.lock:
+            return any(job["status"] in ("pending", "running") for job in self.jobs)
+
+    def finish(self, job, error=None):
+        with self.lock:
+            if error is None:
+                job["status"] = "done"
+                job["finished_at"] = datetime.now().isoformat()
+                job["last_error"] = None
+            elif job["attempts"] >= MAX_ATTEMPTS:
+                job["status"] = "failed"
+                job["finished_at"] = datetime.now().isoformat()
+                job["last_error"] = error
+            else:
+                job["status"] = "pending"
+                job["next_attempt_at"] = time.time() + backoff_delay(job["attempts"])
+                job["last_error"] = error
+            self.save()
+
+
+def backoff_delay(attempts):
+    """Exponential backoff with jitter for the given number of failed attempts."""
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def job_host(job):
+    if job["kind"] == "url":
+        return urlparse(job["target"]).netloc
+    return SOURCE_HOSTS[job["source"]]
+
+
+def run_job(job):
+    """Run the scraper script for a job. Returns None on success or an error string."""
+    args = [sys.executable, SCRIPTS[job["source"]]]
+    args += ["--url", job["target"]] if job["kind"] == "url" else [job["target"]]
+    try:
+        result = subprocess.run(args, cwd=BASE_DIR, capture_output=True, text=True,
+                                timeout=JOB_TIMEOUT_SECONDS)
+    except subprocess.TimeoutExpired:
+        return f"timed out after {JOB_TIMEOUT_SECONDS}s"
+    if result.returncode != 0:
+        return (result.stderr or result.stdout).strip()[-500:] or f"exit code {result.returncode}"
+    return None
+
+
+def run(queue, workers=2):
+    buckets = {}
+    buckets_lock = threading.Lock()
+
+    def bucket_for(host):
+        with buckets_lock:
+            if host not in buckets:
+                buckets[host] = TokenBucket(*HOST_RATE_LIMITS.get(host, DEFAULT_RATE_LIMIT))
+            return buckets[host]
+
+    def work(job):
+        bucket_for(job_host(job)).acquire()
+        print(f"🕐 [{job['attempts']}/{MAX_ATTEMPTS}] {job['id']}")
+        error = run_job(job)
+        queue.finish(job, error)
+        if error:
+            print(f"⚠ {job['id']} failed: {error.splitlines()[-1]}")
+        else:
+            print(f"✅ {job['id']}")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        while queue.has_pending():
+            in_flight = {f for f in in_flight if not f.done()}
+            job = queue.claim_due() if len(in_flight) < workers else None
+            if job:
+                in_flight.add(pool.submit(work, job))
+            else:
+                # Nothing due yet (backoff) or all workers busy
+                time.sleep(1)
+
+    done = sum(job["status"] == "done" for job in queue.jobs)
+    failed = sum(job["status"] == "failed" for job in queue.jobs)
+    print(f"🎉 Queue drained: {done} done, {failed} failed.")
+
+
+def print_status(queue):
+    counts = {}
+    for job in queue.jobs:
+        counts[job["status"]] = counts.get(job["status"], 0) + 1
+    print(f"📋 {len(queue.jobs)} jobs: " + ", ".join(f"{k} {v}" for k, v in sorted(counts.items())))
+    for job in queue.jobs:
+        if job["status"] == "failed":
+            print(f"   ❌ {job['id']}: {job['last_error']}")
+
+
+if __name__ == "__main__":
+    from profiling import profile_from_cli
+    profile_from_cli()
+
+    parser = argparse.ArgumentParser(description="Rate-limited, resumable scrape queue")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = sub.add_parser("add", help="Queue URLs or keywords")
+    add_parser.add_argument("--source", choices=list(SCRIPTS), required=True)
+    add_parser.add_argument("--url", action="append", default=[])
+    add_parser.add_argument("--keyword", action="append", default=[])
+
+    run_parser = sub.add_parser("run", help="Process the queue until it is drained")
+    run_parser.add_argument("--workers", type=int, default=2)
+
+    due_parser = sub.add_parser("add-due", help="Queue listings whose refresh interval has passed")
+    due_parser.add_argument("--source", choices=list(SCRIPTS))
+
+    sub.add_parser("status", help="Show queue counts and failures")
+
+    args = parser.parse_args()
+    queue = JobQueue()
+
+    if args.command == "add":
+        if args.keyword and args.source in INTERACTIVE_KEYWORD_SOURCES:
+            parser.error(f"{args.source} keyword searches are interactive; queue its listing URLs with --url")
+        added = queue.add_all([(args.source, "url", u) for u in args.url] +
+                              [(args.source, "keyword", k) for k in args.keyword])
+        print(f"📌 Queued {sum(1 for job in added if job)} new jobs")
+    elif args.command == "add-due":
+        added = queue.add_all([(entry["source"], "url", entry["url"]) for entry in due_listings(args.source)],
+                              requeue=True)
+        print(f"📌 Queued {sum(1 for job in added if job)} listings due for refresh")
+    elif args.command == "run":
+        run(queue, args.workers)
+    else:
+        print_status(queue)
@@ -0,0 +1,291 @@
+import os
+import re
+import sys
+import uuid
+import asyncio
+import argparse
+from datetime import datetime
+
+from serialization import dumps_bytes, load, loads
+from scheduler import INTERACTIVE_KEYWORD_SOURCES
+
+# Use absolute paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCRIPTS = {
+    "99Acers": os.path.join(BASE_DIR, "99Acers.py"),
+    "MagicBricks": os.path.join(BASE_DIR, "Magic_bricks.py"),
+}
+
+DEFAULT_PORT = 5055
+MAX_CONCURRENT_JOBS = 2
+MAX_FINISHED_JOBS = 200
+MAX_BODY_BYTES = 64 * 1024  # a job request is a few short fields
+STDOUT_LINE_LIMIT = 1024 * 1024  # longer scraper output lines are cut to about this many bytes
+
+# Lines the scrapers print after writing a property file, or after finding it unchanged
+SAVED_PATTERN = re.compile(r"(?:Saved →|Saved:|Unchanged:)\s*(\S+\.json)")
+
+
+class ScrapeJob:
+    def __init__(self, source, kind, target):
+        self.id = uuid.uuid4().hex
+        self.source = source
+        self.kind = kind
+        self.target = target
+        self.status = "queued"
+        self.events = []
+        self.properties = []
+        self.created_at = datetime.now().isoformat()
+        self.finished_at = None
+        self.changed = asyncio.Condition()
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "source": self.source,
+            "kind": self.kind,
+            "target": self.target,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "progress": [e["message"] for e in self.events if e["type"] == "progress"],
+            "properties": self.properties
+        }
+
+    async def emit(self, event_type, **fields):
+        async with self.changed:
+            self.events.append({"type": event_type, **fields})
+            self.changed.notify_all()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+
+class ScrapeService:
+    """Accepts scrape jobs over HTTP and runs at most `max_concurrent` scrapers at a time."""
+
+    def __init__(self, max_concurrent=MAX_CONCURRENT_JOBS):
+        self.jobs = {}
+        self.slots = asyncio.Semaphore(max_concurrent)
+
+    def submit(self, source, kind, target):
+        job = ScrapeJob(source, kind, target)
+        self.jobs[job.id] = job
+        self._forget_old_jobs()
+        asyncio.get_running_loop().create_task(self._run(job))
+        return job
+
+    def _forget_old_jobs(self):
+        finished = [job for job in self.jobs.values() if job.finished]
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job.id]
+
+    async def _run(self, job):
+        async with self.slots:
+            job.status = "running"
+            await job.emit("status", status="running")
+
+            args = [SCRIPTS[job.source]]
+            args += ["--url", job.target] if job.kind == "url" else [job.target]
+            proc = None
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    sys.executable, *args, cwd=BASE_DIR,
+                    # Unbuffered so progress lines arrive while the scraper runs
+                    env={**os.environ, "PYTHONUNBUFFERED": "1"},
+                    stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+                    limit=STDOUT_LINE_LIMIT
+                )
+                async for raw in read_lines(proc.stdout):
+                    line = raw.decode("utf-8", errors="replace").rstrip()
+                    if not line:
+                        continue
+                    await job.emit("progress", message=line)
+                    saved = SAVED_PATTERN.search(line)
+                    if saved:
+                        await self._emit_property(job, saved.group(1))
+                returncode = await proc.wait()
+            except Exception as e:
+                await job.emit("progress", message=f"❌ {e}")
+                returncode = -1
+            finally:
+                # Never leave a scraper running once its job stops following it
+                if proc is not None and proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+
+            job.status = "done" if returncode == 0 else "failed"
+            job.finished_at = datetime.now().isoformat()
+            await job.emit("status", status=job.status)
+
+    async def _emit_property(self, job, path):
+        full_path = path if os.path.isabs(path) else os.path.join(BASE_DIR, path)
+        try:
+            data = load(full_path)
+        except Exception as e:
+            await job.emit("progress", message=f"⚠ Could not read {path}: {e}")
+            return
+        job.properties.append(data)
+        await job.emit("property", property=data)
+
+    # ---------------- HTTP ---------------- #
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            if not request_line:
+                return
+            method, path, _ = request_line.split(" ", 2)
+
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+
+            try:
+                length = int(headers.get("content-length", 0))
+            except ValueError:
+                return await respond(writer, 400, {"error": "Invalid Content-Length"})
+            if length < 0:
+                return await respond(writer, 400, {"error": "Invalid Content-Length"})
+            if length > MAX_BODY_BYTES:
+                return await respond(writer, 413, {"error": f"Body is larger than {MAX_BODY_BYTES} bytes"})
+            body = await reader.readexactly(length) if length else b""
+
+            await self.route(method, path.split("?")[0].rstrip("/"), body, writer)
+        except ConnectionError:
+            pass  # the client went away; there is no one to answer
+        except Exception as e:
+            await respond(writer, 500, {"error": str(e)})
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body, writer):
+        parts = [p for p in path.split("/") if p]
+
+        if method == "POST" and parts == ["jobs"]:
+            try:
+                payload = loads(body or b"{}")
+            except ValueError:
+                return await respond(writer, 400, {"error": "Body must be JSON"})
+            if not isinstance(payload, dict):
+                return await respond(writer, 400, {"error": "Body must be a JSON object"})
+            source = payload.get("source", "MagicBricks")
+            if not isinstance(source, str) or source not in SCRIPTS:
+                return await respond(writer, 400, {"error": f"Unknown source {source}"})
+            url, keyword = payload.get("url"), payload.get("keyword")
+            if any(value is not None and not isinstance(value, str) for value in (url, keyword)):
+                return await respond(writer, 400, {"error": "url and keyword must be strings"})
+            if url:
+                job = self.submit(source, "url", url)
+            elif keyword:
+                if source in INTERACTIVE_KEYWORD_SOURCES:
+                    # The scraper would wait for someone to pick a listing in a browser (see scheduler)
+                    return await respond(writer, 400, {"error": f"{source} keyword searches are interactive; submit listing URLs"})
+                job = self.submit(source, "keyword", keyword)
+            else:
+                return await respond(writer, 400, {"error": "Please provide a url or keyword"})
+            return await respond(writer, 202, {"id": job.id, "status": job.status})
+
+        if method == "GET" and parts == ["jobs"]:
+            return await respond(writer, 200, [
+                {"id": j.id, "status": j.status, "target": j.target} for j in self.jobs.values()
+            ])
+
+        job = self.jobs.get(parts[1]) if len(parts) >= 2 and parts[0] == "jobs" else None
+        if method == "GET" and job and len(parts) == 2:
+            return await respond(writer, 200, job.summary())
+        if method == "GET" and job and parts[2:] == ["events"]:
+            return await stream_events(job, writer)
+
+        await respond(writer, 404, {"error": "Not found"})
+
+
+async def read_lines(stream):
+    """Lines of a subprocess stream. One longer than the stream's limit is cut
+    there instead of raising, and the rest of it is skipped."""
+    head = None  # start of an overlong line whose end hasn't arrived yet
+    while True:
+        try:
+            line = await stream.readuntil(b"\n")
+        except asyncio.LimitOverrunError as e:
+            chunk = await stream.readexactly(e.consumed)
+            head = chunk if head is None else head
+            continue
+        except asyncio.IncompleteReadError as e:
+            line = head if head is not None else e.partial
+            if line:
+                yield line
+            return
+        if head is not None:
+            line, head = head, None
+        yield line
+
+
+async def respond(writer, status, payload):
+    body = dumps_bytes(payload, compact=True)
+    reason = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large"}.get(status, "Error")
+    writer.write(
+        f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+
+
+async def stream_events(job, writer):
+    """Stream job events as newline-delimited JSON until the job finishes.
+
+    The status line is already sent once streaming starts, so a failure after
+    that is reported as a final {"type": "error"} event.
+    """
+    writer.write(
+        b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nConnection: close\r\n\r\n"
+    )
+    sent = 0
+    try:
+        while True:
+            async with job.changed:
+                await job.changed.wait_for(lambda: len(job.events) > sent or job.finished)
+                pending = job.events[sent:]
+                finished = job.finished
+            for event in pending:
+                writer.write(dumps_bytes(event, compact=True) + b"\n")
+            sent += len(pending)
+            await writer.drain()
+            if finished and sent == len(job.events):
+                return
+    except ConnectionError:
+        raise
+    except Exception as e:
+        writer.write(dumps_bytes({"type": "error", "message": str(e)}, compact=True) + b"\n")
+        await writer.drain()
+
+
+async def serve(host, port, socket_path, max_concurrent):
+    service = ScrapeService(max_concurrent)
+    if socket_path:
+        server = await asyncio.start_unix_server(service.handle, path=socket_path)
+        print(f"🚀 Scrape service listening on {socket_path}")
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+        print(f"🚀 Scrape service listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    from profiling import profile_from_cli
+    profile_from_cli()
+
+    parser = argparse.ArgumentParser(description="Async scrape job service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--max-concurrent", type=int, default=MAX_CONCURRENT_JOBS)
+    args = parser.parse_args()
+
+    asyncio.run(serve(args.host, args.port, args.socket, args.max_concurrent))
@@ -1,10 +1,12 @@
 import sys
 import json
 import os
-from playwright.sync_api import sync_playwright
 from urllib.parse import quote
 from dotenv import load_dotenv
-import google.generativeai as genai
+
+from deps import sync_playwright
+from page_loading import block_resources, wait_for_any
+from metrics import timer, timed
 
 # Load environment variables
 # Try to find .env in backend directory
@@ -15,17 +17,33 @@ load_dotenv(backend_env_path)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
     print(f"DEBUG: API Key loaded: {GEMINI_API_KEY[:5]}...", file=sys.stderr)
 else:
     print("DEBUG: GEMINI_API_KEY not found.", file=sys.stderr)
 
+_genai = None
+
 
+def gemini_model():
+    """The Gemini model, importing and configuring the client on first use.
+
+    google.generativeai takes longer to import than the rest of this script
+    together and is only needed once a thread has been scraped (or none was).
+    """
+    global _genai
+    if _genai is None:
+        import google.generativeai as genai
+        genai.configure(api_key=GEMINI_API_KEY)
+        _genai = genai
+    return _genai.GenerativeModel('gemini-2.0-flash')
+
+
+@timed("llm.analyze")
 def analyze_with_gemini(query, title, comments):
     if not GEMINI_API_KEY:
         return None
 
-    model = genai.GenerativeModel('gemini-2.0-flash')
+    model = gemini_model()
     
     prompt = f"""
     Analyze the following Reddit discussion thread related to the search query: "{query}".
@@ -68,12 +86,13 @@ def analyze_with_gemini(query, title, comments):
 # import requests
 # from bs4 import BeautifulSoup
 
+@timed("llm.simulate")
 def generate_simulation(query):
     if not GEMINI_API_KEY:
         return []
     
     try:
-        model = genai.GenerativeModel('gemini-2.0-flash')
+        model = gemini_model()
         prompt = f"""
         The user is searching for real estate discussions about "{query}" but none were found.
         Generate 2 ULTRA REALISTIC, simulated Reddit-style discussion threads about this specific property or locality.
@@ -118,6 +137,8 @@ def search_and_scrape_reddit(query):
             context = browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             )
+            # Threads are read as text only, so skip images as well
+            block_resources(context, block_images=True)
             page = context.new_page()
 
             # 1. Search Reddit directly
@@ -127,7 +148,8 @@ def search_and_scrape_reddit(query):
                 search_url = f"https://www.reddit.com/search/?q={search_query}&type=link"
                 print(f"DEBUG: Navigating to search: {search_url}", file=sys.stderr)
                 
-                page.goto(search_url, timeout=20000)
+                with timer("page.load_search", url=search_url):
+                    page.goto(search_url, wait_until="domcontentloaded", timeout=20000)
                 
                 # Wait for results - try to wait for something that looks like a post
                 try:
@@ -174,7 +196,9 @@ def search_and_scrape_reddit(query):
                     # Use old.reddit.com for easier scraping
                     scrape_link = link.replace("www.reddit.com", "old.reddit.com")
                     print(f"DEBUG: Scraping {scrape_link}", file=sys.stderr)
-                    page.goto(scrape_link, timeout=15000)
+                    with timer("page.load", url=scrape_link):
+                        page.goto(scrape_link, wait_until="domcontentloaded", timeout=15000)
+                        wait_for_any(page, ["div.commentarea", "a.title"], timeout=5000)
                     
                     # Extract Title
                     title = "Reddit Discussion"
@@ -248,6 +272,9 @@ def search_and_scrape_reddit(query):
     return results
 
 if __name__ == "__main__":
+    from profiling import profile_from_cli
+    profile_from_cli()
+
     query = sys.argv[1] if len(sys.argv) > 1 else "Greater Noida"
     data = search_and_scrape_reddit(query)
     print(json.dumps(data))
@@ -0,0 +1,130 @@
+import os
+import json
+from datetime import date, datetime, time
+
+from atomic_io import atomic_open, write_atomic
+
+# Every Scrapper file (property records, indexes, state, the NDJSON export) is
+# read and written through this module. orjson is used when it is installed,
+# then msgspec, then the standard library; all three produce the same bytes
+# (apart from how float exponents are spelled, 1e-07 vs 1e-7): UTF-8 without
+# \u escapes, two-space indentation, or no whitespace at all in compact mode. SCRAPER_JSON_COMPACT=1 makes compact the default for files;
+# SCRAPER_JSON_BACKEND=json|orjson|msgspec pins a backend (e.g. to compare them).
+COMPACT_ENV = "SCRAPER_JSON_COMPACT"
+BACKEND_ENV = "SCRAPER_JSON_BACKEND"
+BACKENDS = ("orjson", "msgspec", "json")
+INDENT = 2  # the only indentation orjson supports
+
+
+def _load_backend():
+    wanted = os.getenv(BACKEND_ENV, "").strip().lower()
+    for name in ([wanted] if wanted in BACKENDS else BACKENDS):
+        if name == "json":
+            return "json", None
+        try:
+            return name, __import__(name)
+        except ImportError:
+            continue
+    return "json", None
+
+
+BACKEND, _module = _load_backend()
+COMPACT = os.getenv(COMPACT_ENV, "").strip().lower() in ("1", "true", "yes")
+
+if BACKEND == "msgspec":
+    _msgspec_decoder = _module.json.Decoder()
+
+
+def _stdlib_default(default):
+    # The types orjson and msgspec encode natively, encoded the way they do
+    def encode(obj):
+        if isinstance(obj, (datetime, date, time)):
+            return obj.isoformat()
+        if default is not None:
+            return default(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return encode
+
+
+def dumps_bytes(obj, compact=None, sort_keys=False, default=None):
+    """Encode obj as UTF-8 JSON bytes, pretty unless compact (COMPACT when not given).
+
+    Unencodable objects raise TypeError whatever the backend.
+    """
+    compact = COMPACT if compact is None else compact
+    if BACKEND == "orjson":
+        option = _module.OPT_NON_STR_KEYS
+        if not compact:
+            option |= _module.OPT_INDENT_2
+        if sort_keys:
+            option |= _module.OPT_SORT_KEYS
+        return _module.dumps(obj, default=default, option=option)
+    if BACKEND == "msgspec":
+        try:
+            encoded = _module.json.encode(obj, enc_hook=default, order="sorted" if sort_keys else None)
+        except _module.EncodeError as e:
+            raise TypeError(str(e)) from e
+        return encoded if compact else _module.json.format(encoded, indent=INDENT)
+    text = json.dumps(
+        obj,
+        ensure_ascii=False,
+        indent=None if compact else INDENT,
+        separators=(",", ":") if compact else None,
+        sort_keys=sort_keys,
+        default=_stdlib_default(default)
+    )
+    return text.encode("utf-8")
+
+
+def dumps(obj, compact=None, sort_keys=False, default=None):
+    """dumps_bytes() as a str."""
+    return dumps_bytes(obj, compact, sort_keys, default).decode("utf-8")
+
+
+def loads(data):
+    """Decode JSON from str or bytes; malformed input raises ValueError whatever the backend."""
+    if BACKEND == "orjson":
+        return _module.loads(data)
+    if BACKEND == "msgspec":
+        try:
+            return _msgspec_decoder.decode(data)
+        except _module.DecodeError as e:
+            raise ValueError(str(e)) from e
+    return json.loads(data)
+
+
+def load(path):
+    """Read a JSON file."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def dump(obj, path, compact=None, sort_keys=False):
+    """Write obj to a JSON file, atomically (see atomic_io)."""
+    write_atomic(path, dumps_bytes(obj, compact, sort_keys))
+
+
+def dump_array(items, path, compact=None):
+    """Write items as a JSON array one element at a time.
+
+    The output is byte-for-byte what dump(list(items), path) writes, but
+    neither the list nor its full text is ever held in memory. Like dump(),
+    the file is replaced atomically. Returns the number of items written.
+    """
+    compact = COMPACT if compact is None else compact
+    pad = b" " * INDENT
+    count = 0
+    with atomic_open(path) as f:
+        for item in items:
+            encoded = dumps_bytes(item, compact)
+            if compact:
+                f.write((b"[" if count == 0 else b",") + encoded)
+            else:
+                # Newlines only occur between tokens (strings escape theirs), so this re-indents one level
+                f.write((b"[\n" if count == 0 else b",\n") + pad + encoded.replace(b"\n", b"\n" + pad))
+            count += 1
+        if count == 0:
+            f.write(b"[]")
+        else:
+            f.write(b"]" if compact else b"\n]")
+    return count
@@ -0,0 +1,80 @@
+import os
+import gzip
+from datetime import datetime
+
+from serialization import dump, load
+
+# Use absolute paths
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "scraped_data")
+SNAPSHOTS_DIR = os.path.join(DATA_DIR, "snapshots")
+
+# Set SCRAPER_SAVE_SNAPSHOTS=1 to keep the rendered HTML of every scraped page
+SNAPSHOTS_ENV = "SCRAPER_SAVE_SNAPSHOTS"
+
+
+def snapshots_enabled():
+    return os.getenv(SNAPSHOTS_ENV, "").lower() in ("1", "true", "yes")
+
+
+def save_snapshot(source, property_id, url, html):
+    """Store gzipped page HTML under snapshots/<source>/<property_id>/<timestamp>.html.gz."""
+    folder = os.path.join(SNAPSHOTS_DIR, source, str(property_id))
+    os.makedirs(folder, exist_ok=True)
+
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    html_path = os.path.join(folder, f"{stamp}.html.gz")
+    with gzip.open(html_path, "wt", encoding="utf-8") as f:
+        f.write(html)
+
+    # Sidecar with what replay needs besides the HTML itself
+    meta = {
+        "source": source,
+        "property_id": property_id,
+        "url": url,
+        "saved_at": datetime.now().isoformat()
+    }
+    dump(meta, os.path.join(folder, f"{stamp}.json"))
+
+    print(f"🗄 Snapshot saved → {html_path}")
+    return html_path
+
+
+def load_snapshot(html_path):
+    """Return (html, meta) for a snapshot written by save_snapshot."""
+    with gzip.open(html_path, "rt", encoding="utf-8") as f:
+        html = f.read()
+    meta_path = html_path[:-len(".html.gz")] + ".json"
+    meta = load(meta_path)
+    return html, meta
+
+
+def latest_snapshots(source=None):
+    """List the newest snapshot path of every property, optionally for one source."""
+    if not os.path.isdir(SNAPSHOTS_DIR):
+        return []
+
+    sources = [source] if source else sorted(os.listdir(SNAPSHOTS_DIR))
+    paths = []
+    for src in sources:
+        src_dir = os.path.join(SNAPSHOTS_DIR, src)
+        if not os.path.isdir(src_dir):
+            continue
+        for property_id in sorted(os.listdir(src_dir)):
+            prop_dir = os.path.join(src_dir, property_id)
+            snaps = sorted(f for f in os.listdir(prop_dir) if f.endswith(".html.gz"))
+            if snaps:
+                # Timestamps sort lexicographically, so the last one is the newest
+                paths.append(os.path.join(prop_dir, snaps[-1]))
+    return paths
+
+
+def existing_images(property_id):
+    """Images already downloaded for a property, as the scrapers record them."""
+    folder = os.path.join(DATA_DIR, "images", str(property_id))
+    if not os.path.isdir(folder):
+        return []
+    return [
+        f"scraped_data/images/{property_id}/{name}" for name in sorted(os.listdir(folder))
+        if os.path.isfile(os.path.join(folder, name))
+    ]
@@ -0,0 +1,72 @@
+import os
+import unittest
+
+from fact_extractor import extract_facts
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "page_text")
+
+# What extract_facts reads from each page in fixtures/page_text
+EXPECTED = {
+    "acres_ats_rhapsody.txt": {
+        "Super Area": "2,450 sq.ft.",
+        "Carpet Area": "1,900 sqft",
+        "Floor": "12",
+        "Transaction Type": "Resale Status",
+        "Status": "Ready to Move Available from Immediately Property located in ATS Rhapsody Heights",
+        "Facing": "North East Furnishing",
+        "Furnishing": "Semi Furnished Transaction Type",
+        "Bathrooms": "4",
+        "Balcony": "3",
+        "Price": "32,000",
+        "BHK": "4",
+        "Society": "ATS Rhapsody Heights",
+    },
+    "magicbricks_minimal.txt": {
+        "Floor": "Ground",
+        "Bathrooms": "1",
+        "Price": "9,500",
+        "BHK": "1",
+    },
+    "magicbricks_supertech.txt": {
+        "Super Area": "1,125 sqft",
+        "Carpet Area": "890 sqft",
+        "Floor": "7",
+        "Status": "Ready to Move More Details Rental Value",
+        "Facing": "East Status Ready to Move More Details Rental Value",
+        "Furnishing": "Furnished Available For Family Available From Immediately Floor",
+        "Bathrooms": "2",
+        "Balcony": "1",
+        "Price": "18,000",
+        "BHK": "2",
+        "Society": "at Supertech Eco Village Park",
+    },
+}
+
+
+def read_page(name):
+    with open(os.path.join(CORPUS_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class ExtractFactsTest(unittest.TestCase):
+    def test_page_text_corpus(self):
+        for name, expected in EXPECTED.items():
+            with self.subTest(page=name):
+                self.assertEqual(extract_facts(read_page(name)), expected)
+
+    def test_requested_labels_only(self):
+        facts = extract_facts(read_page("acres_ats_rhapsody.txt"), ["Society", "Floor"])
+        self.assertEqual(facts, {"Society": "ATS Rhapsody Heights", "Floor": "12"})
+
+    def test_first_occurrence_with_a_value_wins(self):
+        # "floor" in "Floor plan" has no value after it; the next occurrence does
+        self.assertEqual(extract_facts("Floor plan. Floor: 3 out of 10", ["Floor"]), {"Floor": "3 out of 10"})
+
+    def test_overlapping_keywords(self):
+        # Page text often runs labels together; "heights" and "status" share the "s"
+        facts = extract_facts("Flat in Gaur Heightstatus: Ready to Move", ["Society", "Status"])
+        self.assertEqual(facts, {"Society": "in Gaur Heights", "Status": "Ready to Move"})
+
+
+if __name__ == "__main__":
+    unittest.main()
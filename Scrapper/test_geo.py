@@ -0,0 +1,65 @@
+import unittest
+
+from geo import GridIndex, canonical_locality, distance_km, locate
+
+
+class LocateTest(unittest.TestCase):
+    def test_zone_in_text_wins_over_single_zone_names(self):
+        # Names that exist in one zone only must not be picked when the text names another zone
+        self.assertEqual(canonical_locality("Sector 3 Noida"), "noida")
+        self.assertEqual(canonical_locality("Sector 16B, Noida"), "noida")
+        self.assertEqual(canonical_locality("Sector 36 Noida"), "noida")
+        self.assertEqual(canonical_locality("Sector 62, Greater Noida West"), "greater-noida-west")
+
+    def test_zone_centroid_has_no_coordinates(self):
+        place = locate("Sector 3 Noida")
+        self.assertIsNone(place[2])
+        self.assertIsNone(place[3])
+
+    def test_names_in_their_own_zone(self):
+        self.assertEqual(canonical_locality("Sector 16B, Noida Extension"), "greater-noida-west/sector-16b")
+        self.assertEqual(canonical_locality("Sector 36 Greater Noida"), "greater-noida/sector-36")
+        self.assertEqual(canonical_locality("Sector 62, Noida"), "noida/sector-62")
+        self.assertEqual(canonical_locality("Sector 1 Greater Noida West"), "greater-noida-west/sector-1")
+
+    def test_shared_name_without_zone_is_unresolved(self):
+        self.assertIsNone(canonical_locality("Sector 1"))
+
+    def test_single_zone_name_without_zone(self):
+        self.assertEqual(canonical_locality("Sector 62"), "noida/sector-62")
+
+    def test_locality_before_title(self):
+        place = locate("Sector 16B", None, "3 BHK Flat for Rent in Supertech Ecovillage 2, Sector 16B Greater Noida West")
+        self.assertEqual(place[4], "greater-noida-west/sector-16b")
+
+
+class FuzzyMatchTest(unittest.TestCase):
+    def test_misspellings_resolve(self):
+        self.assertEqual(canonical_locality("Sectr 62 Noida"), "noida/sector-62")
+        self.assertEqual(canonical_locality("Knowldge Park 3"), "greater-noida/knowledge-park-3")
+        self.assertEqual(canonical_locality("Omikron 1"), "greater-noida/omicron-1")
+
+    def test_short_name_is_not_a_neighbour(self):
+        # "Eta 2" is not in the gazetteer and is not a misspelling of Beta 2
+        self.assertEqual(canonical_locality("Eta 2 Greater Noida"), "greater-noida")
+
+    def test_name_missing_a_word_is_unresolved(self):
+        # Gaur City spans Sector 4 and 16C; it is not Gaur City Mall
+        self.assertIsNone(canonical_locality("Gaur City"))
+        self.assertEqual(canonical_locality("Gaur City 2, Greater Noida West"), "greater-noida-west/sector-16c")
+
+
+class GridIndexTest(unittest.TestCase):
+    def test_within_matches_brute_force(self):
+        grid = GridIndex()
+        points = [(28.60, 77.43), (28.59, 77.45), (28.4665, 77.5125), (28.57, 77.323)]
+        for position, (lat, lon) in enumerate(points):
+            grid.add(position, lat, lon)
+        found = [position for _, position in grid.within(28.6050, 77.4290, 3)]
+        expected = [p for p, (lat, lon) in enumerate(points) if distance_km(28.6050, 77.4290, lat, lon) <= 3]
+        self.assertEqual(sorted(found), sorted(expected))
+        self.assertEqual(sorted(found), [0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
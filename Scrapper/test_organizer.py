@@ -0,0 +1,49 @@
+import unittest
+
+from organizer import normalize_property
+from property_schema import validate_property
+
+RAW_MAGICBRICKS = {
+    "property_id": "4d1f0c2a9b8e7f6a5d4c3b2a",
+    "property_name": "3 BHK Flat for Rent in ATS Rhapsody, Sector 1 Greater Noida West",
+    "link": "https://www.magicbricks.com/propertyDetails/3-BHK-1450-Sq-ft-Multistorey-Apartment-FOR-Rent-Greater-Noida-West&id=4d1f0c2a9b8e7f6a5d4c3b2a",
+    "price": "₹ 22,000",
+    "locality": "Sector 1",
+    "address": "ATS Rhapsody, Greater Noida West",
+    "description": "Spacious 1,450 sq ft flat with 2 Bathrooms near Gaur Chowk. Flats near Sector 1",
+    "features": {"property": ["Power Back Up", "Lift"], "society": ["Swimming Pool", "Gymnasium"]},
+    "dynamic_facts": {"Furnishing": "Semi-Furnished", "Popular Localities": "junk"},
+    "local_images": [],
+    "scraped_at": "2026-10-01T10:00:00"
+}
+
+RAW_99ACRES = {
+    "property_id": "R81234567",
+    "title": "2 BHK Apartment for Sale in Sector 62 Noida",
+    "bhk": "2",
+    "price": "₹ 85 Lac",
+    "description": "",
+    "features": {"property": ["Park"]},
+    "local_images": [],
+    "scraped_at": "2026-10-02T10:00:00"
+}
+
+
+class NormalizePropertyTest(unittest.TestCase):
+    def test_normalized_record_is_a_fixed_point(self):
+        # A SCHEMA_VERSION bump re-normalizes existing records; that must not lose anything
+        for raw in (RAW_MAGICBRICKS, RAW_99ACRES):
+            with self.subTest(raw["property_id"]):
+                once = normalize_property(raw, f"{raw['property_id']}.json")
+                self.assertEqual(validate_property(once), [])
+                self.assertEqual(normalize_property(once, f"{raw['property_id']}.json"), once)
+
+    def test_location_survives_renormalizing(self):
+        twice = normalize_property(normalize_property(RAW_MAGICBRICKS, "x.json"), "x.json")
+        self.assertEqual(twice["location"]["locality"], "Sector 1")
+        self.assertEqual(twice["location"]["address"], "Sector 1, ATS Rhapsody, Greater Noida West")
+        self.assertEqual(twice["location"]["locality_id"], "greater-noida-west/sector-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
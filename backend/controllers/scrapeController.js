@@ -3,12 +3,24 @@ const { exec } = require("child_process");
 const path = require("path");
 const fs = require("fs");
 const Property = require("../models/propertyModel");
+const { runOrganizer, organizeFiles, bulkUpsert } = require("../utils/propertyImport");
+
+const scrapperDir = path.join(__dirname, "../../Scrapper");
+const propertiesDir = path.join(scrapperDir, "scraped_data/properties");
+// Lines the scrapers print after writing a property file, or after finding it unchanged
+// (as in Scrapper/scrape_service.py)
+const SAVED_PATTERN = /(?:Saved →|Saved:|Unchanged:)\s*(\S+\.json)/g;
 
 const logFile = path.join(__dirname, "../backend_debug.log");
 const log = (msg) => {
   fs.appendFileSync(logFile, new Date().toISOString() + ": " + msg + "\n");
 };
 
+// Names of the property files a scraper run reported saving
+const savedFiles = (stdout) => {
+  return [...(stdout || "").matchAll(SAVED_PATTERN)].map((match) => path.basename(match[1]));
+};
+
 // @desc    Scrape properties from 99acres and MagicBricks
 // @route   POST /api/scrape
 // @access  Public
@@ -52,8 +64,7 @@ const scrapeProperties = asyncHandler(async (req, res) => {
 
   console.log(`Starting scrape for: ${keyword}`);
 
-  const scrapperDir = path.join(__dirname, "../../Scrapper");
-  const dataDir = path.join(scrapperDir, "scraped_data/properties");
+  const dataDir = propertiesDir;
 
   // CLEANUP: If force refresh, clear old JSON files first to avoid importing stale data
   /*
@@ -78,7 +89,8 @@ const scrapeProperties = asyncHandler(async (req, res) => {
   // Helper to run python script
   const runScript = (scriptPath, arg) => {
     return new Promise((resolve, reject) => {
-      exec(`python3 "${scriptPath}" "${arg}"`, { cwd: scrapperDir }, (error, stdout, stderr) => {
+      // stdout names the saved files, so it must not be cut off by the default 1 MB buffer
+      exec(`python3 "${scriptPath}" "${arg}"`, { cwd: scrapperDir, maxBuffer: 64 * 1024 * 1024 }, (error, stdout, stderr) => {
         if (error) {
           console.error(`Error executing ${scriptPath}:`, error);
           resolve(null);
@@ -96,8 +108,9 @@ const scrapeProperties = asyncHandler(async (req, res) => {
 
   console.log(`Triggering scrapers for keyword: ${keyword}`);
 
+  let outputs = [];
   try {
-    await Promise.all([
+    outputs = await Promise.all([
       // runScript(script99, keyword), // Disabled as per user request
       runScript(scriptMB, keyword)
     ]);
@@ -107,89 +120,28 @@ const scrapeProperties = asyncHandler(async (req, res) => {
 
   console.log("Scraping finished, importing data...");
 
-  // Read scraped JSON files
-  // dataDir is already defined above
-  console.log("Reading data from:", dataDir);
-  if (!fs.existsSync(dataDir)) {
-    // If directory doesn't exist, maybe scrapers failed or didn't find anything
-    // But we should try to read what we have
-    console.log("Data directory not found, creating it...");
-    fs.mkdirSync(dataDir, { recursive: true });
-  }
-
-  // We need to read from both directories potentially, or just the main one if scrapers output there
-  // 99Acers outputs to `scraped_data`, MagicBricks to `scraped_data/properties`
-  // Let's check both
-  const dirsToCheck = [
-    path.join(scrapperDir, "scraped_data"),
-    path.join(scrapperDir, "scraped_data/properties")
-  ];
-
-  const scrapedProperties = [];
-  const seenProperties = new Set();
-  const { normalizeProperty } = require("../utils/propertyNormalizer");
-
-  const FIVE_MINUTES_AGO = Date.now() - 5 * 60 * 1000;
-
-  for (const dir of dirsToCheck) {
-    if (!fs.existsSync(dir)) continue;
-
-    const files = fs.readdirSync(dir);
-    for (const file of files) {
-      if (path.extname(file) === ".json" && file !== "index.json" && file !== "properties_index.json") {
-        const filePath = path.join(dir, file);
-
-        // CHECK: Only process files modified recently (in this scrape session)
-        const stats = fs.statSync(filePath);
-        if (stats.mtimeMs < FIVE_MINUTES_AGO) {
-          continue;
-        }
-
-        try {
-          const rawData = JSON.parse(fs.readFileSync(filePath, "utf-8"));
-
-          // Use the smart normalizer
-          const propertyData = normalizeProperty(rawData, "scraper");
-
-          // Add the keyword to the property data so we can find it later
-          propertyData.keywords = [keyword];
-
-          // Deduplication check
-          const uniqueKey = `${propertyData.title}-${propertyData.address}-${propertyData.price}`;
-
-          if (seenProperties.has(uniqueKey)) {
-            continue;
-          }
-          seenProperties.add(uniqueKey);
-
-          scrapedProperties.push(propertyData);
-        } catch (err) {
-          console.error(`Error parsing file ${file}:`, err);
-        }
-      }
-    }
-  }
-
-  // 2. SAVE TO DB (Cache for next time)
-  if (scrapedProperties.length > 0) {
-    // We might want to update existing properties with the new keyword if they already exist
-    // But for simplicity, we'll just insert new ones or ignore duplicates (handled by unique constraints if any)
-    // Mongoose insertMany with ordered: false continues on error (duplicate key)
+  // 3. NORMALIZE & SAVE TO DB (Cache for next time)
+  // Only the listings this scrape saved are normalized and upserted, tagged with the keyword
+  // they were found for; the full organizer pass (duplicates, index, aggregates) runs afterwards
+  const documents = await organizeFiles([...new Set(outputs.flatMap(savedFiles))]);
+  if (documents.length > 0) {
     try {
-      await Property.insertMany(scrapedProperties, { ordered: false });
+      const { upserted, modified } = await bulkUpsert(documents, [keyword]);
+      console.log(`Saved scraped properties to DB: ${upserted} new, ${modified} updated.`);
     } catch (e) {
-      // Ignore duplicate key errors
-      console.log("Some properties were duplicates and skipped.");
+      // Listings imported before stable ids keep their url; the rest of the batch still goes through
+      console.log("Some properties clashed with existing URLs and were skipped.");
     }
-    console.log(`Saved ${scrapedProperties.length} scraped properties to DB.`);
   }
+  runOrganizer();
 
   // Fetch the fresh data from DB to return (including ID)
   const freshData = await Property.find({
     $or: [
       { city: { $regex: keyword, $options: "i" } },
       { address: { $regex: keyword, $options: "i" } },
-      { title: { $regex: keyword, $options: "i" } }
+      { title: { $regex: keyword, $options: "i" } },
+      { keywords: keyword }
     ]
   });
 
@@ -226,7 +178,6 @@ const scrapeUrl = asyncHandler(async (req, res) => {
     throw new Error("Please provide a URL");
   }
 
-  const scrapperDir = path.join(__dirname, "../../Scrapper");
   const scriptMB = path.join(scrapperDir, "Magic_bricks.py");
 
   console.log(`Triggering scraper for URL: ${url}`);
@@ -234,7 +185,7 @@ const scrapeUrl = asyncHandler(async (req, res) => {
   // Run python script with --url argument
   const runScript = (scriptPath, urlArg) => {
     return new Promise((resolve, reject) => {
-      exec(`python3 "${scriptPath}" --url "${urlArg}"`, { cwd: scrapperDir }, (error, stdout, stderr) => {
+      exec(`python3 "${scriptPath}" --url "${urlArg}"`, { cwd: scrapperDir, maxBuffer: 64 * 1024 * 1024 }, (error, stdout, stderr) => {
         if (error) {
           console.error(`Error executing ${scriptPath}:`, error);
           // Don't reject, just resolve null so we can return what we have
@@ -251,10 +202,6 @@ const scrapeUrl = asyncHandler(async (req, res) => {
 
   console.log("URL Scraping finished, importing data...");
 
-  // Import the scraped data (similar logic to scrapeProperties)
-  const dataDir = path.join(scrapperDir, "scraped_data/properties");
-  const { normalizeProperty } = require("../utils/propertyNormalizer");
-
   // Extract ID from URL to find the specific file
   let propId = "";
   const match = url.match(/id=([0-9a-zA-Z]+)/);
@@ -271,36 +218,38 @@ const scrapeUrl = asyncHandler(async (req, res) => {
     }
   }
 
-  const filePath = path.join(dataDir, `${propId}.json`);
+  const filePath = path.join(propertiesDir, `${propId}.json`);
 
   if (fs.existsSync(filePath)) {
+    let propertyData;
     try {
-      const rawData = JSON.parse(fs.readFileSync(filePath, "utf-8"));
-      const propertyData = normalizeProperty(rawData, "scraper");
-
-      // Save to DB
-      try {
-        // Upsert
-        await Property.findOneAndUpdate(
-          { url: propertyData.url },
-          propertyData,
-          { upsert: true, new: true }
-        );
-        console.log("Saved scraped URL property to DB.");
-      } catch (e) {
-        console.error("Error saving to DB:", e);
-      }
-
-      return res.json({
-        message: "Property scraped successfully",
-        property: propertyData
-      });
-
+      // Normalize and export just this listing; the full organizer pass follows in the background
+      [propertyData] = await organizeFiles([`${propId}.json`]);
+      runOrganizer();
     } catch (err) {
       console.error("Error reading scraped file:", err);
       res.status(500);
       throw new Error("Failed to process scraped data");
     }
+
+    if (!propertyData) {
+      // Dropped from the export: a duplicate of another listing, or no usable photos
+      res.status(404);
+      throw new Error("Scraped property was not exported");
+    }
+
+    // Save to DB
+    try {
+      await bulkUpsert([propertyData]);
+      console.log("Saved scraped URL property to DB.");
+    } catch (e) {
+      console.error("Error saving to DB:", e);
+    }
+
+    return res.json({
+      message: "Property scraped successfully",
+      property: propertyData
+    });
   } else {
     res.status(404);
     throw new Error("Scraping failed or file not found");
@@ -38,6 +38,11 @@ const propertySchema = mongoose.Schema(
       type: [String],
       default: [],
     },
+    image_variants: {
+      // Parallel to images: resized WebP copies of each photo (see Scrapper/derivatives.py), {} if none
+      type: [{ _id: false, thumb: String, medium: String }],
+      default: [],
+    },
     owner: {
       type: mongoose.Schema.Types.ObjectId,
       ref: "User",
@@ -47,6 +52,11 @@ const propertySchema = mongoose.Schema(
       type: Boolean,
       default: false,
     },
+    schema_version: {
+      type: Number,
+      default: null, // version of Scrapper/property_schema.py that produced a scraped listing
+      index: true,
+    },
     safety_score: {
       type: Number,
       default: null, // fetched later from safety AI
@@ -1,15 +1,22 @@
 import sys
 import json
-import fitz  # PyMuPDF
-import spacy
-import pytesseract
-from pdf2image import convert_from_path
 import os
 
-# Load SpaCy model
-nlp = spacy.load("en_core_web_sm")
+# spaCy, PyMuPDF and the OCR libraries are imported where they are used: the
+# backend spawns this script per upload, and loading the spaCy model alone
+# takes longer than reading a typical agreement
+_nlp = None
+
+def load_nlp():
+    global _nlp
+    if _nlp is None:
+        import spacy
+        _nlp = spacy.load("en_core_web_sm")
+    return _nlp
 
 def extract_text_from_pdf(pdf_path):
+    import fitz  # PyMuPDF
+
     text = ""
     try:
         # 1. Try PyMuPDF (Text based)
@@ -21,6 +28,9 @@ def extract_text_from_pdf(pdf_path):
         if len(text.strip()) < 50:
             # Check if tesseract is available
             try:
+                import pytesseract
+                from pdf2image import convert_from_path
+
                 images = convert_from_path(pdf_path)
                 for img in images:
                     text += pytesseract.image_to_string(img)
@@ -34,7 +44,9 @@ def extract_text_from_pdf(pdf_path):
     return text
 
 def analyze_text(text):
-    doc = nlp(text)
+    if not text.strip():
+        return {}
+    doc = load_nlp()(text)
     
     entities = {}
     for ent in doc.ents:
@@ -0,0 +1,110 @@
+const fs = require("fs");
+const os = require("os");
+const path = require("path");
+const { spawn } = require("child_process");
+const mongoose = require("mongoose");
+const Property = require("../models/propertyModel");
+
+/**
+ * Ingests the corpus normalized by Scrapper/organizer.py.
+ * organizer.py is the only normalizer: its NDJSON export already matches the
+ * Property model (Extended JSON, stable _id, schema_version), so documents are
+ * upserted as-is.
+ */
+
+const scrapperDir = path.join(__dirname, "../../Scrapper");
+const exportFile = path.join(scrapperDir, "scraped_data/export/properties.ndjson");
+const BATCH_SIZE = 1000;
+
+let organizerRun = null;
+let organizerQueued = null;
+let quickRuns = 0;
+
+// Run organizer.py with its output passed straight through, so a long run never hits a buffer limit
+const spawnOrganizer = (args = []) => {
+    return new Promise((resolve) => {
+        const child = spawn("python3", [path.join(scrapperDir, "organizer.py"), ...args], {
+            cwd: scrapperDir,
+            stdio: ["ignore", "inherit", "inherit"],
+        });
+        child.on("error", (error) => {
+            console.error("Error running organizer:", error);
+            resolve(false);
+        });
+        child.on("close", (code) => {
+            if (code !== 0) console.error(`organizer.py exited with code ${code}`);
+            resolve(code === 0);
+        });
+    });
+};
+
+// Full organizer pass: normalizes everything pending, then refreshes duplicates, the index,
+// the aggregates and the full export. Its cost grows with the corpus, so request handlers
+// start it without waiting. Runs never overlap: callers arriving during a run share one
+// follow-up run, which picks up everything scraped meanwhile.
+const runOrganizer = () => {
+    if (!organizerRun) {
+        organizerRun = spawnOrganizer().finally(() => { organizerRun = null; });
+        return organizerRun;
+    }
+    if (!organizerQueued) {
+        organizerQueued = organizerRun.then(() => {
+            organizerQueued = null;
+            return runOrganizer();
+        });
+    }
+    return organizerQueued;
+};
+
+// Normalize just these property files (names in scraped_data/properties) and resolve to
+// their export documents; see organizer.organize_files
+const organizeFiles = async (files) => {
+    if (!files.length) return [];
+    quickRuns += 1;
+    const exportPath = path.join(os.tmpdir(), `organizer-${process.pid}-${quickRuns}.ndjson`);
+    try {
+        const ok = await spawnOrganizer(["--export-to", exportPath, ...files]);
+        return ok ? readExport(exportPath) : [];
+    } finally {
+        fs.rmSync(exportPath, { force: true });
+    }
+};
+
+const readExport = (file = exportFile) => {
+    if (!fs.existsSync(file)) return [];
+    const { EJSON } = mongoose.mongo.BSON;
+    return fs.readFileSync(file, "utf-8")
+        .split("\n")
+        .filter((line) => line.trim())
+        .map((line) => EJSON.parse(line));
+};
+
+const bulkUpsert = async (documents, tags = []) => {
+    let upserted = 0;
+    let modified = 0;
+    for (let i = 0; i < documents.length; i += BATCH_SIZE) {
+        // keywords accumulate, so search tags added by the scrape endpoint survive re-imports
+        const ops = documents.slice(i, i + BATCH_SIZE).map(({ _id, keywords = [], ...doc }) => ({
+            updateOne: {
+                filter: { _id },
+                update: { $set: doc, $addToSet: { keywords: { $each: [...keywords, ...tags] } } },
+                upsert: true,
+            },
+        }));
+        const result = await Property.bulkWrite(ops, { ordered: false });
+        upserted += result.upsertedCount;
+        modified += result.modifiedCount;
+    }
+    return { upserted, modified };
+};
+
+// Scraped listings that are no longer in the export (removed or merged as duplicates)
+const removeStale = async (documents) => {
+    const ids = documents.map((doc) => doc._id);
+    const result = await Property.deleteMany({ isScraped: true, _id: { $nin: ids } });
+    return result.deletedCount;
+};
+
+module.exports = {
+    exportFile, runOrganizer, organizeFiles, readExport, bulkUpsert, removeStale,
+};